@@ -9,14 +9,18 @@ import sys
 # access to the values within the .ini file in use.
 config = context.config
 
-# Set the database URL from environment variables
-config.set_main_option('sqlalchemy.url', os.environ['DATABASE_URL'])
-
 # Add the project's root directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from app.core.config import settings
+from app.db import partitions
 from app.db.base import Base
 
+# Set the database URL from DATABASE_URL, falling back to the app settings
+# (POSTGRES_* variables). '%' is escaped for configparser interpolation.
+database_url = os.environ.get('DATABASE_URL') or settings.SQLALCHEMY_DATABASE_URI
+config.set_main_option('sqlalchemy.url', database_url.replace('%', '%%'))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 fileConfig(config.config_file_name)
@@ -32,6 +36,17 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# On partitioned Postgres, tracking_number uniqueness is kept by a lookup
+# table instead of the model's unique index (migration 0a5c7e3d9b14)
+PARTITIONED_ONLY = {('table', 'transaction_tracking_numbers'), ('index', 'ix_transactions_tracking_number')}
+
+
+def include_object_for(partitioned):
+    def include_object(object, name, type_, reflected, compare_to):
+        return not (partitioned and (type_, name) in PARTITIONED_ONLY)
+    return include_object
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -71,7 +86,9 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object_for(partitions.is_partitioned(connection)),
         )
 
         with context.begin_transaction():
@@ -0,0 +1,203 @@
+"""Partition transactions by month on created_at
+
+Postgres: transactions is rebuilt as a range-partitioned table with one
+partition per month, from the oldest row to three months ahead, plus a
+default partition. Rows are copied over while writes are blocked (reads
+continue). The primary key becomes (id, created_at). A unique index on a
+partitioned table must include created_at, so tracking_number uniqueness
+moves to transaction_tracking_numbers, kept by a trigger on transactions;
+its entries outlive archived months, so numbers are never reused. From
+then on app.jobs.manage_partitions creates the coming months. Downgrading
+copies the attached partitions back into one table; months already
+archived are not restored.
+
+All dialects: created_at is backfilled and made NOT NULL, and the list
+indexes now end in (created_at DESC, id DESC), the keyset order of the
+transaction lists.
+
+Revision ID: 0a5c7e3d9b14
+Revises: f3b8d2c71e64
+Create Date: 2026-10-17 18:05:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a5c7e3d9b14'
+down_revision = 'f3b8d2c71e64'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+INDEXES = [
+    ('ix_transactions_user_id_created_at', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_transactions_status_created_at', ['status', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_transactions_corridor_created_at', ['currency_from', 'currency_to', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_transactions_created_at', [sa.text('created_at DESC'), sa.text('id DESC')]),
+]
+OLD_INDEXES = [
+    ('ix_transactions_user_id_id', ['user_id', sa.text('id DESC')]),
+    ('ix_transactions_status_created_at', ['status', 'created_at']),
+    ('ix_transactions_status_id', ['status', sa.text('id DESC')]),
+    ('ix_transactions_corridor_id', ['currency_from', 'currency_to', sa.text('id DESC')]),
+    ('ix_transactions_created_at', ['created_at']),
+]
+# Unchanged, but rebuilt with the table on Postgres
+COMMON_INDEXES = [
+    ('ix_transactions_id', ['id']),
+    ('ix_transactions_recipient_id', ['recipient_id']),
+]
+TRACKING_INDEX = 'ix_transactions_tracking_number'
+TRIGRAM_INDEX = 'ix_transactions_tracking_number_trgm'
+FOREIGN_KEYS = [('user_id', 'users'), ('recipient_id', 'recipients')]
+
+# Entries are only removed when a row's number changes: deleted and archived
+# rows keep theirs, and rows moved between partitions (DELETE + INSERT)
+# find their own entry already there.
+TRACKING_FUNCTION = """
+CREATE OR REPLACE FUNCTION transactions_tracking_number_unique() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.tracking_number IS NOT DISTINCT FROM OLD.tracking_number THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'UPDATE' AND OLD.tracking_number IS NOT NULL THEN
+        DELETE FROM transaction_tracking_numbers WHERE tracking_number = OLD.tracking_number;
+    END IF;
+    IF NEW.tracking_number IS NOT NULL THEN
+        INSERT INTO transaction_tracking_numbers (tracking_number, transaction_id)
+        VALUES (NEW.tracking_number, NEW.id)
+        ON CONFLICT (tracking_number) DO NOTHING;
+        IF NOT FOUND AND NOT EXISTS (
+            SELECT 1 FROM transaction_tracking_numbers
+            WHERE tracking_number = NEW.tracking_number AND transaction_id = NEW.id
+        ) THEN
+            RAISE unique_violation USING MESSAGE = format('tracking_number %s already exists', NEW.tracking_number);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+TRACKING_TRIGGER = """
+CREATE TRIGGER transactions_tracking_number_unique
+AFTER INSERT OR UPDATE OF tracking_number ON transactions
+FOR EACH ROW EXECUTE FUNCTION transactions_tracking_number_unique()
+"""
+
+
+def _month_start(value):
+    value = value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def _create_indexes(indexes):
+    for name, columns in indexes:
+        op.create_index(name, 'transactions', columns, unique=False)
+
+
+def _drop_indexes(indexes):
+    for name, _ in indexes:
+        op.drop_index(name, table_name='transactions', if_exists=True)
+
+
+def _backfill_created_at():
+    op.execute('UPDATE transactions SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL')
+
+
+def _rebuild(new_table):
+    """
+    Copy transactions into ``new_table`` (created by the caller with the
+    same columns) and swap it in; the id sequence moves with it.
+    """
+    bind = op.get_bind()
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('transactions', 'id')")).scalar()
+    for column, table in FOREIGN_KEYS:
+        op.create_foreign_key(f'transactions_{column}_fkey', new_table, table, [column], ['id'])
+    op.execute(f'INSERT INTO {new_table} SELECT * FROM transactions')
+    op.execute(f'ALTER SEQUENCE {sequence} OWNED BY NONE')
+    op.execute('DROP TABLE transactions')
+    op.execute(f'ALTER TABLE {new_table} RENAME TO transactions')
+    op.execute(f'ALTER TABLE transactions RENAME CONSTRAINT {new_table}_pkey TO transactions_pkey')
+    op.execute(f'ALTER SEQUENCE {sequence} OWNED BY transactions.id')
+
+
+def _rebuild_indexes(indexes, tracking_unique):
+    _create_indexes(COMMON_INDEXES + indexes)
+    op.create_index(TRACKING_INDEX, 'transactions', ['tracking_number'], unique=tracking_unique)
+    op.create_index(TRIGRAM_INDEX, 'transactions', ['tracking_number'], unique=False, postgresql_using='gin', postgresql_ops={'tracking_number': 'gin_trgm_ops'})
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        _backfill_created_at()
+        _drop_indexes(OLD_INDEXES)
+        with op.batch_alter_table('transactions') as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+        _create_indexes(INDEXES)
+        return
+    op.execute('LOCK TABLE transactions IN EXCLUSIVE MODE')
+    _backfill_created_at()
+    op.execute('CREATE TABLE transactions_partitioned (LIKE transactions INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+    op.execute('ALTER TABLE transactions_partitioned ALTER COLUMN created_at SET NOT NULL')
+    op.execute('ALTER TABLE transactions_partitioned ADD CONSTRAINT transactions_partitioned_pkey PRIMARY KEY (id, created_at)')
+
+    oldest, newest = bind.execute(sa.text('SELECT min(created_at), max(created_at) FROM transactions')).first()
+    now = datetime.now(timezone.utc)
+    month = _month_start(oldest or now)
+    last = _month_start(max(newest or now, now))
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        end = _next_month(month)
+        op.execute(
+            f"CREATE TABLE transactions_y{month.year:04d}m{month.month:02d} PARTITION OF transactions_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute('CREATE TABLE transactions_default PARTITION OF transactions_partitioned DEFAULT')
+
+    op.create_table(
+        'transaction_tracking_numbers',
+        sa.Column('tracking_number', sa.String(length=50), primary_key=True),
+        sa.Column('transaction_id', sa.Integer(), nullable=False),
+    )
+    op.execute(
+        'INSERT INTO transaction_tracking_numbers (tracking_number, transaction_id) '
+        'SELECT tracking_number, id FROM transactions WHERE tracking_number IS NOT NULL'
+    )
+
+    _rebuild('transactions_partitioned')
+    op.execute(TRACKING_FUNCTION)
+    op.execute(TRACKING_TRIGGER)
+    # Built after the copy; CONCURRENTLY is not available on a partitioned table
+    _rebuild_indexes(INDEXES, tracking_unique=False)
+    op.execute('ANALYZE transactions')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        _drop_indexes(INDEXES)
+        with op.batch_alter_table('transactions') as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(timezone=True), nullable=True)
+        _create_indexes(OLD_INDEXES)
+        return
+    op.execute('LOCK TABLE transactions IN EXCLUSIVE MODE')
+    op.execute('CREATE TABLE transactions_plain (LIKE transactions INCLUDING DEFAULTS)')
+    op.execute('ALTER TABLE transactions_plain ALTER COLUMN created_at DROP NOT NULL')
+    op.execute('ALTER TABLE transactions_plain ADD CONSTRAINT transactions_plain_pkey PRIMARY KEY (id)')
+    _rebuild('transactions_plain')
+    op.execute('DROP FUNCTION transactions_tracking_number_unique()')
+    op.drop_table('transaction_tracking_numbers')
+    _rebuild_indexes(OLD_INDEXES, tracking_unique=True)
+    op.execute('ANALYZE transactions')
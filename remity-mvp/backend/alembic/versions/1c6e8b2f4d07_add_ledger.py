@@ -0,0 +1,68 @@
+"""Add ledger_entries and ledger_balances
+
+Existing transactions get one "opening" posting each for where their total
+sits now, and the user balances are summed from those entries.
+
+Revision ID: 1c6e8b2f4d07
+Revises: 0a5c7e3d9b14
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c6e8b2f4d07'
+down_revision = '0a5c7e3d9b14'
+branch_labels = None
+depends_on = None
+
+HELD = "COALESCE(status, 'pending') NOT IN ('failed', 'cancelled')"
+
+
+def upgrade():
+    op.create_table('ledger_entries',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('event', sa.String(length=20), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('account', sa.String(length=20), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ledger_entries_transaction_id', 'ledger_entries', ['transaction_id'], unique=False)
+    op.create_index('ix_ledger_entries_account', 'ledger_entries', ['user_id', 'account', 'currency', 'id'], unique=False)
+    op.create_table('ledger_balances',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('account', sa.String(length=20), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'account', 'currency')
+    )
+
+    op.execute(
+        "INSERT INTO ledger_entries (transaction_id, event, user_id, account, currency, amount, created_at) "
+        "SELECT id, 'opening', user_id, CASE WHEN status = 'completed' THEN 'sent' ELSE 'pending' END, "
+        f"currency_from, total_amount, created_at FROM transactions WHERE {HELD} "
+        "UNION ALL "
+        "SELECT id, 'opening', NULL, 'clearing', currency_from, -total_amount, created_at "
+        f"FROM transactions WHERE {HELD}"
+    )
+    op.execute(
+        "INSERT INTO ledger_balances (user_id, account, currency, balance) "
+        "SELECT user_id, account, currency, SUM(amount) FROM ledger_entries "
+        "WHERE user_id IS NOT NULL GROUP BY user_id, account, currency"
+    )
+
+
+def downgrade():
+    op.drop_table('ledger_balances')
+    op.drop_index('ix_ledger_entries_account', table_name='ledger_entries')
+    op.drop_index('ix_ledger_entries_transaction_id', table_name='ledger_entries')
+    op.drop_table('ledger_entries')
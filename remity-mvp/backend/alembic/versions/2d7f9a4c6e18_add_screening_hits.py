@@ -0,0 +1,46 @@
+"""Add screening_hits
+
+Existing recipients and users are not screened here: run
+app.jobs.rescreen once after upgrading.
+
+Revision ID: 2d7f9a4c6e18
+Revises: 1c6e8b2f4d07
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7f9a4c6e18'
+down_revision = '1c6e8b2f4d07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('screening_hits',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('subject_type', sa.String(length=20), nullable=False),
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('list_version', sa.String(length=64), nullable=False),
+    sa.Column('entry_id', sa.String(length=50), nullable=False),
+    sa.Column('entry_name', sa.String(length=200), nullable=False),
+    sa.Column('program', sa.String(length=50), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default='open', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('reviewed_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('subject_type', 'subject_id', 'entry_id', 'name', name='uq_screening_hits_subject_entry')
+    )
+    op.create_index('ix_screening_hits_open', 'screening_hits', ['id'], unique=False, postgresql_where=sa.text("status = 'open'"), sqlite_where=sa.text("status = 'open'"))
+
+
+def downgrade():
+    op.drop_index('ix_screening_hits_open', table_name='screening_hits')
+    op.drop_table('screening_hits')
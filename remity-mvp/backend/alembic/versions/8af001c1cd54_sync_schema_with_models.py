@@ -0,0 +1,175 @@
+"""Sync schema with models
+
+Replaces the stale ``user`` table from the initial revision with the tables
+the application actually uses. Databases that were bootstrapped with
+``Base.metadata.create_all`` already have these tables; they are left in
+place and only missing tables/columns are added.
+
+Revision ID: 8af001c1cd54
+Revises: 46fb9568f33c
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8af001c1cd54'
+down_revision = '46fb9568f33c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if 'user' in tables:
+        op.drop_index(op.f('ix_user_id'), table_name='user')
+        op.drop_index(op.f('ix_user_full_name'), table_name='user')
+        op.drop_index(op.f('ix_user_email'), table_name='user')
+        op.drop_table('user')
+
+    if 'users' not in tables:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_superuser', sa.Boolean(), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('date_of_birth', sa.DateTime(), nullable=True),
+        sa.Column('nationality', sa.String(length=100), nullable=True),
+        sa.Column('address_line1', sa.String(length=255), nullable=True),
+        sa.Column('address_line2', sa.String(length=255), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('state_province', sa.String(length=100), nullable=True),
+        sa.Column('postal_code', sa.String(length=20), nullable=True),
+        sa.Column('country', sa.String(length=100), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('verification_document', sa.String(length=255), nullable=True),
+        sa.Column('kyc_status', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+        op.create_index(op.f('ix_users_full_name'), 'users', ['full_name'], unique=False)
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+
+    if 'recipients' not in tables:
+        op.create_table('recipients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('full_name', sa.String(length=200), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('address_line1', sa.String(length=255), nullable=True),
+        sa.Column('address_line2', sa.String(length=255), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('state_province', sa.String(length=100), nullable=True),
+        sa.Column('postal_code', sa.String(length=20), nullable=True),
+        sa.Column('country', sa.String(length=100), nullable=False),
+        sa.Column('bank_name', sa.String(length=200), nullable=True),
+        sa.Column('account_number', sa.String(length=100), nullable=True),
+        sa.Column('routing_number', sa.String(length=50), nullable=True),
+        sa.Column('swift_code', sa.String(length=50), nullable=True),
+        sa.Column('iban', sa.String(length=50), nullable=True),
+        sa.Column('account_type', sa.String(length=50), nullable=True),
+        sa.Column('bank_branch', sa.String(length=200), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('preferred_payment_method', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('verification_document', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_recipients_id'), 'recipients', ['id'], unique=False)
+
+    if 'transactions' not in tables:
+        op.create_table('transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('recipient_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('currency_from', sa.String(length=3), nullable=False),
+        sa.Column('currency_to', sa.String(length=3), nullable=False),
+        sa.Column('exchange_rate', sa.Numeric(precision=10, scale=6), nullable=False),
+        sa.Column('fee_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('tracking_number', sa.String(length=50), nullable=True),
+        sa.Column('payment_method', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('purpose', sa.String(length=200), nullable=True),
+        sa.Column('source_of_funds', sa.String(length=100), nullable=True),
+        sa.Column('compliance_notes', sa.Text(), nullable=True),
+        sa.Column('proof_of_payment_url', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['recipient_id'], ['recipients.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+        op.create_index(op.f('ix_transactions_tracking_number'), 'transactions', ['tracking_number'], unique=True)
+    else:
+        columns = {c['name'] for c in inspector.get_columns('transactions')}
+        if 'proof_of_payment_url' not in columns:
+            op.add_column('transactions', sa.Column('proof_of_payment_url', sa.String(length=255), nullable=True))
+
+    if 'transaction_stats_hourly' not in tables:
+        op.create_table('transaction_stats_hourly',
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('currency_from', sa.String(length=3), nullable=False),
+        sa.Column('currency_to', sa.String(length=3), nullable=False),
+        sa.Column('tx_count', sa.BigInteger(), nullable=False),
+        sa.Column('amount_total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('fee_total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('hour', 'status', 'currency_from', 'currency_to')
+        )
+
+    if 'transaction_stats_daily' not in tables:
+        op.create_table('transaction_stats_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('currency_from', sa.String(length=3), nullable=False),
+        sa.Column('currency_to', sa.String(length=3), nullable=False),
+        sa.Column('tx_count', sa.BigInteger(), nullable=False),
+        sa.Column('amount_total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('fee_total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'status', 'currency_from', 'currency_to')
+        )
+
+
+def downgrade():
+    op.drop_table('transaction_stats_daily')
+    op.drop_table('transaction_stats_hourly')
+    op.drop_index(op.f('ix_transactions_tracking_number'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_id'), table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index(op.f('ix_recipients_id'), table_name='recipients')
+    op.drop_table('recipients')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_full_name'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_superuser', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_email'), 'user', ['email'], unique=True)
+    op.create_index(op.f('ix_user_full_name'), 'user', ['full_name'], unique=False)
+    op.create_index(op.f('ix_user_id'), 'user', ['id'], unique=False)
@@ -0,0 +1,34 @@
+"""Add indexes for the hot query paths
+
+Built with CREATE INDEX CONCURRENTLY so existing tables stay writable.
+
+Revision ID: 9cf5e6999df3
+Revises: 8af001c1cd54
+Create Date: 2026-10-16 12:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9cf5e6999df3'
+down_revision = '8af001c1cd54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transactions_user_id_id', 'transactions', ['user_id', sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transactions_status_created_at', 'transactions', ['status', 'created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_transactions_recipient_id'), 'transactions', ['recipient_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_recipients_user_id'), 'recipients', ['user_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_recipients_user_id'), table_name='recipients', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_transactions_recipient_id'), table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_status_created_at', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_user_id_id', table_name='transactions', postgresql_concurrently=True, if_exists=True)
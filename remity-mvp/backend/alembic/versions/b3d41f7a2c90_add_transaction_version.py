@@ -0,0 +1,25 @@
+"""Add transactions.version for optimistic concurrency
+
+Revision ID: b3d41f7a2c90
+Revises: 9cf5e6999df3
+Create Date: 2026-10-16 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d41f7a2c90'
+down_revision = '9cf5e6999df3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A constant server default is a metadata-only change on Postgres 11+
+    op.add_column('transactions', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('transactions', 'version')
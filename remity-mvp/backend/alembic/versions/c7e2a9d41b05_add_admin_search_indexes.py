@@ -0,0 +1,50 @@
+"""Add indexes for admin console filters and search
+
+Filter columns get composite indexes ending in id DESC, matching the keyset
+order of the admin lists; free-text search gets pg_trgm GIN indexes. All
+are built with CREATE INDEX CONCURRENTLY.
+
+Revision ID: c7e2a9d41b05
+Revises: b3d41f7a2c90
+Create Date: 2026-10-16 23:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a9d41b05'
+down_revision = 'b3d41f7a2c90'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = [
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_users_full_name_trgm', 'users', 'full_name'),
+    ('ix_recipients_full_name_trgm', 'recipients', 'full_name'),
+    ('ix_transactions_tracking_number_trgm', 'transactions', 'tracking_number'),
+]
+
+
+def upgrade():
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    if is_postgres:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transactions_status_id', 'transactions', ['status', sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transactions_corridor_id', 'transactions', ['currency_from', 'currency_to', sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transactions_created_at', 'transactions', ['created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        if is_postgres:
+            for name, table, column in TRIGRAM_INDEXES:
+                op.create_index(name, table, [column], unique=False, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        if op.get_bind().dialect.name == 'postgresql':
+            for name, table, column in reversed(TRIGRAM_INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_created_at', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_corridor_id', table_name='transactions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_status_id', table_name='transactions', postgresql_concurrently=True, if_exists=True)
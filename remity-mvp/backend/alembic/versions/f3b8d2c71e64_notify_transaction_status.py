@@ -0,0 +1,44 @@
+"""NOTIFY transaction status changes from outbox_events
+
+A trigger on outbox_events sends each transaction.status_changed row on the
+transaction_status channel when its transaction commits; API workers LISTEN
+and push the change to connected clients. Postgres only.
+
+Revision ID: f3b8d2c71e64
+Revises: e91b6c3f5a27
+Create Date: 2026-10-17 15:20:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2c71e64'
+down_revision = 'e91b6c3f5a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("""
+        CREATE OR REPLACE FUNCTION outbox_events_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('transaction_status', json_build_object('id', NEW.id, 'payload', NEW.payload)::text);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER outbox_events_notify AFTER INSERT ON outbox_events
+        FOR EACH ROW WHEN (NEW.topic = 'transaction.status_changed')
+        EXECUTE FUNCTION outbox_events_notify()
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP TRIGGER IF EXISTS outbox_events_notify ON outbox_events')
+    op.execute('DROP FUNCTION IF EXISTS outbox_events_notify()')
@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Sequence, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from app.api.responses import ORJSONResponse
+
+Errors = Dict[int, str]
+
+
+def _format(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'item'}: {err['msg']}" for err in exc.errors()
+    )
+
+
+def validate_items(schema: Type[BaseModel], items: Sequence[Dict[str, Any]]) -> Tuple[List[Tuple[int, Any]], Errors]:
+    """
+    Validate each raw item against ``schema``. Returns the valid
+    ``(index, model)`` pairs and an index -> message map of failures.
+    """
+    valid: List[Tuple[int, Any]] = []
+    errors: Errors = {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as exc:
+            errors[index] = _format(exc)
+    return valid, errors
+
+
+def bulk_response(total: int, created: Dict[int, int], errors: Errors) -> ORJSONResponse:
+    # Built by hand: validating 10k result rows through pydantic is wasted work
+    results = [
+        {"index": i, "id": created.get(i), "error": errors.get(i)}
+        for i in range(total)
+    ]
+    status_code = 200 if created else 422
+    return ORJSONResponse(
+        {"created": len(created), "failed": len(errors), "results": results},
+        status_code=status_code,
+    )
+
+
+def reject_batch(total: int, errors: Errors) -> ORJSONResponse:
+    # all-or-nothing: valid items are reported as skipped
+    skipped = "Not created: the batch contains invalid items"
+    return bulk_response(total, {}, {i: errors.get(i, skipped) for i in range(total)})
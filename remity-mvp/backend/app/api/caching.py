@@ -0,0 +1,61 @@
+import hashlib
+from typing import Any, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Per-user data: browsers may keep a copy but must revalidate every poll
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+async def collection_version(db: AsyncSession, model: Any, *criteria: Any) -> Tuple[Any, ...]:
+    """
+    One aggregate over the filtered rows: count plus the newest change time.
+    Any insert, update or delete within the filter moves one of the two.
+    """
+    stmt = select(
+        func.count(model.id),
+        func.max(model.id),
+        func.max(func.coalesce(model.updated_at, model.created_at)),
+    ).where(*criteria)
+    return tuple((await db.execute(stmt)).one())
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    # Weak: the representation varies with content-encoding (gzip)
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(t) for t in header.split(",")}
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return set_cache_headers(Response(status_code=304), etag, cache_control)
+
+
+def precondition(request: Request, etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Optional[Response]:
+    """
+    Return a 304 response when the client already holds ``etag``, so the
+    caller can skip loading and serializing rows entirely.
+    """
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control)
+    return None
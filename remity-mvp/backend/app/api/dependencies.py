@@ -1,28 +1,39 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+from typing import AsyncGenerator, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
-from app import crud, models, schemas
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, schemas
 from app.core import security
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.routing import read_router
+from app.db.session import AsyncSessionLocal
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token"
 )
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+class PaginationParams:
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+# For endpoints that also take the token as a query parameter
+optional_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token", auto_error=False
+)
+
+async def _authenticate(db: AsyncSession, token: str) -> schemas.UserPrincipal:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -33,22 +44,81 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get(db, id=token_data.sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
-
-def get_current_active_user(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
-    if not crud.user.is_active(current_user):
+    cached = await principal_cache.get(token_data.sub)
+    if cached is not None:
+        principal = schemas.UserPrincipal(**cached)
+    else:
+        user = await crud.async_user.get(db, id=token_data.sub)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = crud.async_user.to_principal(user)
+        await principal_cache.put(user.id, principal.model_dump())
+    db.info["user_id"] = principal.id
+    return principal
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> schemas.UserPrincipal:
+    return await _authenticate(db, token)
+
+async def get_optional_user(
+    db: AsyncSession = Depends(get_db), token: Optional[str] = Depends(optional_oauth2)
+) -> Optional[schemas.UserPrincipal]:
+    """
+    The caller if they sent a token, None for anonymous requests.
+    """
+    return await _authenticate(db, token) if token else None
+
+async def get_stream_user(
+    db: AsyncSession = Depends(get_db),
+    token: Optional[str] = Depends(optional_oauth2),
+    access_token: Optional[str] = Query(None, description="For clients that cannot set headers (EventSource)"),
+) -> schemas.UserPrincipal:
+    """
+    Active user from the Authorization header or the ``access_token``
+    query parameter.
+    """
+    token = token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    principal = await _authenticate(db, token)
+    if not crud.async_user.is_active(principal):
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    current_user: schemas.UserPrincipal = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints: a healthy replica when one is
+    configured, otherwise (or right after the user's own write) the
+    request's primary session.
+    """
+    engine = await read_router.engine_for(current_user.id)
+    if engine is None:
+        # Reuse the primary session: a second one would hold a second pooled
+        # connection per request and can deadlock an exhausted pool
+        yield db
+        return
+    async with AsyncSessionLocal(bind=engine) as replica_db:
+        yield replica_db
+
+async def get_current_active_user(
+    current_user: schemas.UserPrincipal = Depends(get_current_user),
+) -> schemas.UserPrincipal:
+    if not crud.async_user.is_active(current_user):
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def get_current_active_superuser(
-    current_user: models.User = Depends(get_current_active_user),
-) -> models.User:
-    if not crud.user.is_superuser(current_user):
+async def get_current_active_superuser(
+    current_user: schemas.UserPrincipal = Depends(get_current_active_user),
+) -> schemas.UserPrincipal:
+    if not crud.async_user.is_superuser(current_user):
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
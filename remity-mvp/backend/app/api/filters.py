@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import HTTPException, Query
+from sqlalchemy import or_, select
+from app import models
+from app.crud.crud_transaction import created_between
+from app.models.transaction import STATUSES
+
+# Shorter search terms cannot use the trigram indexes
+SEARCH_MIN_LENGTH = 3
+
+
+def _split(raw: Optional[str]) -> List[str]:
+    return [part.strip() for part in (raw or "").split(",") if part.strip()]
+
+
+def contains(column: Any, term: str) -> Any:
+    """
+    Case-insensitive substring match. ILIKE '%term%' is served by the
+    pg_trgm GIN indexes on Postgres; elsewhere it is a plain scan.
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+@dataclass
+class TransactionFilters:
+    statuses: List[str]
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    currency_from: Optional[str] = None
+    currency_to: Optional[str] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    payment_method: Optional[str] = None
+    q: Optional[str] = None
+
+    def criteria(self) -> List[Any]:
+        """
+        WHERE clauses. Equality filters combined with the (created_at, id)
+        keyset walk ix_transactions_status_created_at /
+        ix_transactions_corridor_created_at; date ranges also prune the
+        monthly partitions.
+        """
+        tx = models.Transaction
+        where: List[Any] = created_between(self.start, self.end)
+        if self.statuses:
+            where.append(tx.status.in_(self.statuses))
+        if self.currency_from:
+            where.append(tx.currency_from == self.currency_from)
+        if self.currency_to:
+            where.append(tx.currency_to == self.currency_to)
+        if self.min_amount is not None:
+            where.append(tx.amount >= self.min_amount)
+        if self.max_amount is not None:
+            where.append(tx.amount <= self.max_amount)
+        if self.payment_method:
+            where.append(tx.payment_method == self.payment_method)
+        if self.q:
+            users = select(models.User.id).where(
+                or_(contains(models.User.email, self.q), contains(models.User.full_name, self.q))
+            )
+            recipients = select(models.Recipient.id).where(contains(models.Recipient.full_name, self.q))
+            where.append(or_(
+                contains(tx.tracking_number, self.q),
+                tx.user_id.in_(users),
+                tx.recipient_id.in_(recipients),
+            ))
+        return where
+
+
+def transaction_filters(
+    status: Optional[str] = Query(None, description="Comma-separated statuses"),
+    start: Optional[datetime] = Query(None, description="Created at or after"),
+    end: Optional[datetime] = Query(None, description="Created before"),
+    currency_from: Optional[str] = Query(None, min_length=3, max_length=3),
+    currency_to: Optional[str] = Query(None, min_length=3, max_length=3),
+    min_amount: Optional[float] = Query(None, ge=0),
+    max_amount: Optional[float] = Query(None, ge=0),
+    payment_method: Optional[str] = None,
+    q: Optional[str] = Query(
+        None,
+        min_length=SEARCH_MIN_LENGTH,
+        description="Search user email or name, recipient name and tracking number",
+    ),
+) -> TransactionFilters:
+    statuses = [s.lower() for s in _split(status)]
+    unknown = [s for s in statuses if s not in STATUSES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown statuses: {', '.join(unknown)}")
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise HTTPException(status_code=400, detail="min_amount must not exceed max_amount")
+    return TransactionFilters(
+        statuses=statuses,
+        start=start,
+        end=end,
+        currency_from=currency_from.upper() if currency_from else None,
+        currency_to=currency_to.upper() if currency_to else None,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        payment_method=payment_method,
+        q=q,
+    )
+
+
+@dataclass
+class UserFilters:
+    q: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+    kyc_status: Optional[str] = None
+
+    def criteria(self) -> List[Any]:
+        user = models.User
+        where: List[Any] = []
+        if self.q:
+            where.append(or_(contains(user.email, self.q), contains(user.full_name, self.q)))
+        if self.is_active is not None:
+            where.append(user.is_active == self.is_active)
+        if self.is_superuser is not None:
+            where.append(user.is_superuser == self.is_superuser)
+        if self.kyc_status:
+            where.append(user.kyc_status == self.kyc_status)
+        return where
+
+
+def user_filters(
+    q: Optional[str] = Query(None, min_length=SEARCH_MIN_LENGTH, description="Search email or name"),
+    is_active: Optional[bool] = None,
+    is_superuser: Optional[bool] = None,
+    kyc_status: Optional[str] = None,
+) -> UserFilters:
+    return UserFilters(q=q, is_active=is_active, is_superuser=is_superuser, kyc_status=kyc_status)
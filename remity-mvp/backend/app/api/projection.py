@@ -0,0 +1,87 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, Query
+from sqlalchemy.orm import joinedload, load_only
+from app import models, schemas
+
+# Fields that may be requested, per entity, and the model they map to
+TRANSACTION_FIELDS = list(schemas.TransactionInDBBase.model_fields)
+# Always loaded, requested or not: the list endpoints' keyset columns
+KEYSET_FIELDS = ["created_at", "id"]
+RELATIONS = {
+    "user": (models.User, list(schemas.User.model_fields)),
+    "recipient": (models.Recipient, list(schemas.Recipient.model_fields)),
+}
+
+
+@dataclass
+class Projection:
+    fields: List[str]
+    relations: Dict[str, List[str]] = field(default_factory=dict)
+
+    def options(self) -> List[Any]:
+        """
+        Loader options so that unrequested columns are never fetched.
+        """
+        loaded = dict.fromkeys(self.fields + KEYSET_FIELDS)
+        opts = [load_only(*[getattr(models.Transaction, f) for f in loaded])]
+        for name, cols in self.relations.items():
+            model = RELATIONS[name][0]
+            opts.append(
+                joinedload(getattr(models.Transaction, name)).load_only(*[getattr(model, c) for c in cols])
+            )
+        return opts
+
+    def serialize(self, obj: Any) -> Dict[str, Any]:
+        data = {f: _plain(getattr(obj, f)) for f in self.fields}
+        for name, cols in self.relations.items():
+            related = getattr(obj, name)
+            data[name] = None if related is None else {c: _plain(getattr(related, c)) for c in cols}
+        return data
+
+
+def _plain(value: Any) -> Any:
+    # Match the float-typed API schemas
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _split(raw: Optional[str]) -> List[str]:
+    return [part.strip() for part in (raw or "").split(",") if part.strip()]
+
+
+def transaction_projection(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated columns, e.g. id,amount,status,recipient.full_name. "
+        "Dotted names select columns of an expanded relation.",
+    ),
+    expand: Optional[str] = Query(None, description="Relations to embed: user, recipient"),
+) -> Projection:
+    own: List[str] = []
+    relations: Dict[str, List[str]] = {name: [] for name in _split(expand)}
+    for name in _split(fields):
+        rel, _, col = name.partition(".")
+        if col:
+            relations.setdefault(rel, []).append(col)
+        else:
+            own.append(name)
+    for name in relations:
+        if name not in RELATIONS:
+            raise HTTPException(status_code=400, detail=f"Unknown relation: {name}")
+    own = own or list(TRANSACTION_FIELDS)
+    unknown = [f for f in own if f not in TRANSACTION_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if "id" not in own:
+        # Rows are addressed by id (PATCH, status events)
+        own.insert(0, "id")
+    for name, cols in relations.items():
+        allowed = RELATIONS[name][1]
+        unknown = [c for c in cols if c not in allowed]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown {name} fields: {', '.join(unknown)}")
+        relations[name] = cols or list(allowed)
+    return Projection(fields=own, relations=relations)
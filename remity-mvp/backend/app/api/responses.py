@@ -0,0 +1,24 @@
+import time
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from app.core.instrumentation import observe_serialization
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, which handles datetimes natively and
+    is several times faster than the stdlib encoder on large lists.
+    """
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        observe_serialization(time.perf_counter() - started)
+        return body
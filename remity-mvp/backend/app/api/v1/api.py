@@ -1,8 +1,12 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, auth, recipients, transactions
+from app.api.responses import ORJSONResponse
+from app.api.v1.endpoints import users, auth, recipients, transactions, internal, quotes, admin
 
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(recipients.router, prefix="/recipients", tags=["recipients"])
 api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
+api_router.include_router(quotes.router, prefix="/quotes", tags=["quotes"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"])
@@ -0,0 +1,67 @@
+from typing import Any, Literal, Optional
+from datetime import date, datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import crud, models, schemas
+from app.api import dependencies
+from app.services import stats
+
+router = APIRouter()
+
+@router.get("/stats", response_model=schemas.AdminStats)
+async def read_stats(
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: Literal["day", "hour"] = "day",
+) -> Any:
+    """
+    System statistics for [start, end) (UTC days, default: the last 30 days),
+    answered from the daily rollups instead of scanning transactions, plus
+    the current user counts. ``granularity=hour`` reads the hourly rollups
+    instead and adds an hourly series.
+    """
+    end = end or datetime.now(timezone.utc).date() + timedelta(days=1)
+    start = start or end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if granularity == "hour":
+        summary = stats.summarize(await stats.hourly_rollups(db, start, end), hourly=True)
+    else:
+        summary = stats.summarize(await stats.daily_rollups(db, start, end))
+    return {"start": start, "end": end, **summary, **await stats.user_counts(db)}
+
+@router.get("/screening/hits", response_model=schemas.Page[schemas.ScreeningHit])
+async def list_screening_hits(
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+    page: dependencies.PaginationParams = Depends(),
+    status: Literal["open", "cleared", "confirmed"] = "open",
+) -> Any:
+    """
+    The watchlist screening review queue, newest first.
+    """
+    stmt = select(models.ScreeningHit).where(models.ScreeningHit.status == status)
+    items, next_cursor = await crud.async_screening_hit.get_page(db, stmt=stmt, cursor=page.cursor, limit=page.limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.patch("/screening/hits/{hit_id}", response_model=schemas.ScreeningHit)
+async def review_screening_hit(
+    *,
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+    hit_id: int,
+    review_in: schemas.ScreeningReview,
+) -> Any:
+    """
+    Clear (false positive) or confirm an open hit. Reviewed hits are final:
+    a second review returns 409.
+    """
+    hit = await crud.async_screening_hit.review(db, hit_id=hit_id, status=review_in.status, reviewer_id=current_user.id)
+    if hit:
+        return hit
+    if not await crud.async_screening_hit.get(db, hit_id):
+        raise HTTPException(status_code=404, detail="Screening hit not found")
+    raise HTTPException(status_code=409, detail="Screening hit was already reviewed")
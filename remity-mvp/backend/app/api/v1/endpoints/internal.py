@@ -0,0 +1,50 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas
+from app.api import dependencies
+from app.core.cache import principal_cache
+from app.db import pool
+from app.db.routing import read_router
+from app.services import outbox
+
+router = APIRouter()
+
+@router.get("/auth-cache")
+async def auth_cache_stats(
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+) -> Any:
+    """
+    Hit/miss counters of the authenticated-principal cache for this worker.
+    """
+    return principal_cache.stats()
+
+@router.get("/replicas")
+async def replica_status(
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+) -> Any:
+    """
+    Read-replica health and replay lag as of the last check on this worker.
+    """
+    return read_router.replicas.stats()
+
+@router.get("/pool")
+async def pool_stats(
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+) -> Any:
+    """
+    Connection pool usage of this worker, per engine: size, in-use and
+    overflow connections plus checkout wait times and timeouts.
+    """
+    return [stats.snapshot() for stats in pool.pools.values()]
+
+@router.get("/outbox")
+async def outbox_backlog(
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+) -> Any:
+    """
+    Outbox events per status and the age of the oldest pending one, i.e.
+    how far the notification worker is behind.
+    """
+    return await outbox.backlog(db)
@@ -0,0 +1,40 @@
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from app import crud, schemas
+from app.api import dependencies
+from app.services.fx import UnknownCurrency
+from app.services.quotes import quote_engine
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.Quote)
+async def create_quote(
+    quote_in: schemas.QuoteRequest,
+    current_user: Optional[schemas.UserPrincipal] = Depends(dependencies.get_optional_user),
+) -> Any:
+    """
+    Price a transfer. Signed-in active users get the rate locked under a
+    short-lived quote id; anonymous callers get an indicative price without
+    one, so they cannot fill the shared quote store.
+    """
+    lock = current_user is not None and crud.async_user.is_active(current_user)
+    try:
+        return await quote_engine.quote(quote_in.amount, quote_in.currency_from, quote_in.currency_to, lock=lock)
+    except UnknownCurrency as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.post("/batch", response_model=schemas.QuoteBatch)
+async def create_quotes_batch(
+    batch_in: schemas.QuoteBatchRequest,
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
+) -> Any:
+    """
+    Price many amount/corridor combinations in one vectorized pass. Signed
+    in only: every quote takes a slot in the shared quote store, and an
+    anonymous caller could push live quotes out of it.
+    """
+    try:
+        items = await quote_engine.quote_many([q.model_dump() for q in batch_in.items])
+    except UnknownCurrency as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"items": items}
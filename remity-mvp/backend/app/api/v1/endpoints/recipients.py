@@ -1,50 +1,82 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
-from app.api import dependencies
+from app.api import bulk, caching, dependencies
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Recipient])
-def list_recipients(
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+@router.get("/", response_model=schemas.Page[schemas.Recipient])
+async def list_recipients(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
+    page: dependencies.PaginationParams = Depends(),
 ):
-    return db.query(models.Recipient).filter(models.Recipient.user_id == current_user.id).all()
+    owned = models.Recipient.user_id == current_user.id
+    version = await caching.collection_version(db, models.Recipient, owned)
+    etag = caching.make_etag("recipients", current_user.id, version, request.url.query)
+    if (cached := caching.precondition(request, etag)) is not None:
+        return cached
+    stmt = select(models.Recipient).where(owned)
+    items, next_cursor = await crud.async_recipient.get_page(db, stmt=stmt, cursor=page.cursor, limit=page.limit)
+    caching.set_cache_headers(response, etag)
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.post("/", response_model=schemas.Recipient)
-def create_recipient(
+async def create_recipient(
     *,
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
     recipient_in: schemas.RecipientCreate,
 ):
-    return crud.recipient.create_with_owner(db, user_id=current_user.id, obj_in=recipient_in)
+    return await crud.async_recipient.create_with_owner(db, user_id=current_user.id, obj_in=recipient_in)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult)
+async def create_recipients_bulk(
+    *,
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
+    batch_in: schemas.BulkCreateRequest,
+    all_or_nothing: bool = False,
+):
+    """
+    Create many recipients with multi-row INSERTs in a single commit.
+    Results are reported per item index.
+    """
+    valid, errors = bulk.validate_items(schemas.RecipientCreate, batch_in.items)
+    if all_or_nothing and errors:
+        return bulk.reject_batch(len(batch_in.items), errors)
+    rows = await crud.async_recipient.bulk_create_with_owner(
+        db, user_id=current_user.id, objs_in=[r for _, r in valid]
+    )
+    created = {index: row.id for (index, _), row in zip(valid, rows)}
+    return bulk.bulk_response(len(batch_in.items), created, errors)
 
 @router.patch("/{recipient_id}", response_model=schemas.Recipient)
-def update_recipient(
+async def update_recipient(
     *,
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
     recipient_id: int,
     recipient_in: schemas.RecipientUpdate,
 ):
-    db_obj = crud.recipient.get_user_recipient(db, user_id=current_user.id, recipient_id=recipient_id)
+    db_obj = await crud.async_recipient.get_user_recipient(db, user_id=current_user.id, recipient_id=recipient_id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Recipient not found")
-    return crud.recipient.update(db, db_obj=db_obj, obj_in=recipient_in)
+    return await crud.async_recipient.update(db, db_obj=db_obj, obj_in=recipient_in)
 
 @router.delete("/{recipient_id}")
-def delete_recipient(
+async def delete_recipient(
     *,
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
     recipient_id: int,
 ):
-    db_obj = crud.recipient.get_user_recipient(db, user_id=current_user.id, recipient_id=recipient_id)
-    if not db_obj:
+    deleted = await crud.async_recipient.delete_where(
+        db, models.Recipient.id == recipient_id, models.Recipient.user_id == current_user.id
+    )
+    if not deleted:
         raise HTTPException(status_code=404, detail="Recipient not found")
-    db.delete(db_obj)
-    db.commit()
     return {"ok": True}
@@ -1,88 +1,291 @@
-from typing import List
-from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
-from app.api import dependencies
+from app.api import bulk, caching, dependencies
+from app.api.filters import TransactionFilters, transaction_filters
+from app.api.projection import Projection, transaction_projection
+from app.api.responses import ORJSONResponse
+from app.core.config import settings
+from app.services import export, idempotency, screening, status_stream
+from app.services.quotes import quote_engine
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.TransactionWithRelations])
-def list_transactions(
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+@router.get("/", response_model=schemas.Page[schemas.TransactionWithRelations])
+async def list_transactions(
+    request: Request,
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
+    page: dependencies.PaginationParams = Depends(),
+    projection: Projection = Depends(transaction_projection),
 ):
-    return (
-        db.query(models.Transaction)
-        .options(joinedload(models.Transaction.recipient), joinedload(models.Transaction.user))
-        .filter(models.Transaction.user_id == current_user.id)
-        .order_by(models.Transaction.id.desc())
-        .all()
+    """
+    List the current user's transactions. Use ``fields``/``expand`` to load
+    and return only what the client renders. Polls carrying a matching
+    ``If-None-Match`` get a 304 after a single aggregate query.
+    """
+    owned = models.Transaction.user_id == current_user.id
+    version = await caching.collection_version(db, models.Transaction, owned)
+    etag = caching.make_etag("transactions", current_user.id, version, request.url.query)
+    if (cached := caching.precondition(request, etag)) is not None:
+        return cached
+    stmt = (
+        select(models.Transaction)
+        .options(*projection.options())
+        .where(owned)
     )
+    items, next_cursor = await crud.async_transaction.get_page(db, stmt=stmt, cursor=page.cursor, limit=page.limit)
+    response = ORJSONResponse({"items": [projection.serialize(t) for t in items], "next_cursor": next_cursor})
+    return caching.set_cache_headers(response, etag)
 
-@router.get("/admin", response_model=List[schemas.TransactionWithRelations])
-def list_transactions_admin(
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+@router.get("/admin", response_model=schemas.Page[schemas.TransactionWithRelations])
+async def list_transactions_admin(
+    request: Request,
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+    page: dependencies.PaginationParams = Depends(),
+    projection: Projection = Depends(transaction_projection),
+    filters: TransactionFilters = Depends(transaction_filters),
 ):
-    return (
-        db.query(models.Transaction)
-        .options(joinedload(models.Transaction.user), joinedload(models.Transaction.recipient))
-        .order_by(models.Transaction.id.desc())
-        .all()
+    """
+    List all transactions, newest first, optionally filtered by status,
+    creation date, corridor, amount and payment method, or searched by
+    ``q`` across user email/name, recipient name and tracking number.
+    """
+    version = await caching.collection_version(db, models.Transaction)
+    etag = caching.make_etag("transactions-admin", version, request.url.query)
+    if (cached := caching.precondition(request, etag)) is not None:
+        return cached
+    stmt = select(models.Transaction).options(*projection.options()).where(*filters.criteria())
+    items, next_cursor = await crud.async_transaction.get_page(db, stmt=stmt, cursor=page.cursor, limit=page.limit)
+    response = ORJSONResponse({"items": [projection.serialize(t) for t in items], "next_cursor": next_cursor})
+    return caching.set_cache_headers(response, etag)
+
+@router.get("/admin/export")
+async def export_transactions_admin(
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+    format: Literal["csv", "ndjson", "arrow"] = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[str] = None,
+):
+    """
+    Stream transactions as CSV, NDJSON or Arrow IPC using a server-side
+    cursor, so memory use does not grow with the size of the export.
+    """
+    if format == "arrow" and not export.arrow_available():
+        raise HTTPException(status_code=501, detail="Arrow export requires pyarrow")
+    stmt = export.export_statement(start=start, end=end, status=status)
+    batches = export.iter_batches(stmt, settings.EXPORT_BATCH_SIZE)
+    writers = {"csv": export.csv_stream, "ndjson": export.ndjson_stream, "arrow": export.arrow_stream}
+    return StreamingResponse(
+        writers[format](batches),
+        media_type=export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'},
+    )
+
+@router.get("/events")
+async def transaction_events(
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_stream_user),
+    last_event_id: Optional[int] = Header(None, ge=0),
+):
+    """
+    Server-Sent Events stream of status changes to the caller's
+    transactions (every transaction for superusers), in place of polling
+    the lists. Reconnects send ``Last-Event-ID`` and are replayed what they
+    missed; a ``reset`` event means too much was missed and the list
+    should be reloaded.
+    """
+    user_id = None if crud.async_user.is_superuser(current_user) else current_user.id
+    subscription = status_stream.hub.subscribe(user_id)
+    backlog, reset = [], False
+    if last_event_id is not None:
+        limit = settings.STATUS_STREAM_REPLAY_MAX
+        backlog = await status_stream.replay(db, last_event_id, user_id, limit + 1)
+        if len(backlog) > limit:
+            backlog, reset = [], True
+    # The stream itself needs no connection; hand this one back to the pool
+    await db.close()
+    return StreamingResponse(
+        status_stream.stream(status_stream.hub, subscription, backlog, reset),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+async def _check_quote(tx_in: schemas.TransactionCreate) -> Optional[Dict[str, Any]]:
+    # Read the server-side quote, if any, without consuming it: a quote sent
+    # with the wrong transaction stays usable for the right one
+    if not tx_in.quote_id:
+        return None
+    quote = await quote_engine.peek(tx_in.quote_id)
+    if not quote:
+        raise HTTPException(status_code=400, detail="Quote expired or not found")
+    if (
+        quote["amount"] != tx_in.amount
+        or quote["currency_from"] != tx_in.currency_from.upper()
+        or quote["currency_to"] != tx_in.currency_to.upper()
+    ):
+        raise HTTPException(status_code=400, detail="Quote does not match the transaction")
+    return quote
+
+async def _consume_quote(tx_in: schemas.TransactionCreate) -> None:
+    # Once the transaction is accepted; a concurrent request may have used it
+    if tx_in.quote_id and await quote_engine.consume(tx_in.quote_id) is None:
+        raise HTTPException(status_code=400, detail="Quote expired or not found")
+
+def _priced(tx_in: schemas.TransactionCreate, quote: Optional[Dict[str, Any]]) -> schemas.TransactionCreate:
+    # Take the quote's pricing
+    if quote is None:
+        return tx_in
+    return tx_in.model_copy(update={
+        "currency_from": quote["currency_from"],
+        "currency_to": quote["currency_to"],
+        "exchange_rate": quote["exchange_rate"],
+        "fee_amount": quote["fee_amount"],
+        "total_amount": quote["total_amount"],
+    })
+
 @router.post("/", response_model=schemas.Transaction)
-def create_transaction(
+async def create_transaction(
     *,
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+    request: Request,
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
     tx_in: schemas.TransactionCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
 ):
+    """
+    Create a transaction. Clients that retry should send an
+    ``Idempotency-Key`` header: a repeat with the same key and body replays
+    the first response instead of creating another transfer, and a
+    concurrent duplicate waits for the first request to finish. Sender and
+    recipient names are screened against the watchlist; matches are queued
+    for compliance review and do not fail the request.
+    """
+    if idempotency_key:
+        digest = idempotency.fingerprint(request.method, request.url.path, tx_in.model_dump(mode="json"))
+        replay = await idempotency.begin(db, current_user.id, idempotency_key, digest)
+        if replay is not None:
+            return replay
     # Validate recipient ownership
-    rcpt = db.query(models.Recipient).filter(models.Recipient.id == tx_in.recipient_id, models.Recipient.user_id == current_user.id).first()
+    rcpt = await crud.async_recipient.get_user_recipient(db, user_id=current_user.id, recipient_id=tx_in.recipient_id)
     if not rcpt:
         raise HTTPException(status_code=400, detail="Invalid recipient")
-    return crud.transaction.create_with_owner(db, user_id=current_user.id, obj_in=tx_in)
+    quote = await _check_quote(tx_in)
+    await _consume_quote(tx_in)
+    tx_in = _priced(tx_in, quote)
+    tx = await crud.async_transaction.create_with_owner(db, user_id=current_user.id, obj_in=tx_in, commit=False)
+    await screening.record(db, "transaction", [(tx.id, current_user.full_name), (tx.id, rcpt.full_name)])
+    if not idempotency_key:
+        await db.commit()
+        return tx
+    # Failures above roll back the claim, so the key can be retried
+    body = schemas.Transaction.model_validate(tx).model_dump(mode="json")
+    return await idempotency.complete(db, current_user.id, idempotency_key, body)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult)
+async def create_transactions_bulk(
+    *,
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
+    batch_in: schemas.BulkCreateRequest,
+    all_or_nothing: bool = False,
+):
+    """
+    Create many transactions at once. Recipient ownership is checked for the
+    whole batch in one query and valid items are inserted with multi-row
+    INSERTs in a single commit. Results are reported per item index; with
+    ``all_or_nothing`` any invalid item rejects the whole batch.
+    """
+    valid, errors = bulk.validate_items(schemas.TransactionCreate, batch_in.items)
+    owned = await crud.async_recipient.owned_names(
+        db, user_id=current_user.id, recipient_ids=[tx_in.recipient_id for _, tx_in in valid]
+    )
+    checked = []
+    for index, tx_in in valid:
+        if tx_in.recipient_id in owned:
+            checked.append((index, tx_in))
+        else:
+            errors[index] = "Invalid recipient"
+    quoted = []
+    if not (all_or_nothing and errors):
+        for index, tx_in in checked:
+            try:
+                quoted.append((index, tx_in, await _check_quote(tx_in)))
+            except HTTPException as exc:
+                errors[index] = exc.detail
+    if all_or_nothing and errors:
+        return bulk.reject_batch(len(batch_in.items), errors)
+    # Quotes are consumed only for a batch that is going ahead
+    accepted, consumed = [], []
+    for index, tx_in, quote in quoted:
+        try:
+            await _consume_quote(tx_in)
+        except HTTPException as exc:
+            errors[index] = exc.detail
+            continue
+        if quote is not None:
+            consumed.append(quote)
+        accepted.append((index, _priced(tx_in, quote)))
+    if all_or_nothing and errors:
+        await quote_engine.release(consumed)
+        return bulk.reject_batch(len(batch_in.items), errors)
+    rows = await crud.async_transaction.bulk_create_with_owner(
+        db, user_id=current_user.id, objs_in=[tx_in for _, tx_in in accepted], commit=False
+    )
+    await screening.record(db, "transaction", [
+        (row.id, name) for row in rows for name in (current_user.full_name, owned[row.recipient_id])
+    ])
+    await db.commit()
+    created = {index: row.id for (index, _), row in zip(accepted, rows)}
+    return bulk.bulk_response(len(batch_in.items), created, errors)
+
+async def _update_checked(
+    db: AsyncSession, tx_id: int, tx_in: schemas.TransactionUpdate, user_id: Optional[int] = None
+) -> models.Transaction:
+    updated = await crud.async_transaction.update_checked(db, tx_id=tx_id, obj_in=tx_in, user_id=user_id)
+    if updated:
+        return updated
+    # Nothing matched: work out why (only on the failure path)
+    current = await crud.async_transaction.get(db, id=tx_id)
+    if not current or (user_id is not None and current.user_id != user_id):
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    if tx_in.version is not None and current.version != tx_in.version:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Transaction was modified (version {current.version}); reload and retry",
+        )
+    raise HTTPException(
+        status_code=409,
+        detail=f"Cannot change status from {current.status} to {tx_in.status}",
+    )
 
 @router.patch("/{tx_id}", response_model=schemas.Transaction)
-def update_transaction(
+async def update_transaction(
     *,
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
     tx_id: int,
     tx_in: schemas.TransactionUpdate,
 ):
-    q = db.query(models.Transaction).filter(models.Transaction.id == tx_id)
-    if not current_user.is_superuser:
-        q = q.filter(models.Transaction.user_id == current_user.id)
-    tx = q.first()
-    if not tx:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-    updated = crud.transaction.update(db, db_obj=tx, obj_in=tx_in)
-    # Set completed timestamp if status becomes completed
-    if tx_in.status and tx_in.status.lower() == "completed" and not updated.completed_at:
-        updated.completed_at = datetime.now(timezone.utc)
-        db.add(updated)
-        db.commit()
-        db.refresh(updated)
-    return updated
+    """
+    Update a transaction. Send the ``version`` you last read to guard against
+    concurrent edits; a stale version or illegal status change returns 409.
+    """
+    user_id = None if current_user.is_superuser else current_user.id
+    return await _update_checked(db, tx_id, tx_in, user_id=user_id)
 
 @router.patch("/{tx_id}/admin", response_model=schemas.Transaction)
-def update_transaction_admin(
+async def update_transaction_admin(
     *,
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
     tx_id: int,
     tx_in: schemas.TransactionUpdate,
 ):
-    tx = db.query(models.Transaction).filter(models.Transaction.id == tx_id).first()
-    if not tx:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-    updated = crud.transaction.update(db, db_obj=tx, obj_in=tx_in)
-    if tx_in.status and tx_in.status.lower() == "completed" and not updated.completed_at:
-        updated.completed_at = datetime.now(timezone.utc)
-        db.add(updated)
-        db.commit()
-        db.refresh(updated)
-    return updated
+    return await _update_checked(db, tx_id, tx_in)
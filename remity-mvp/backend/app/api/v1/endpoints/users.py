@@ -1,57 +1,104 @@
 from typing import Any, List
-from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, models, schemas
-from app.api import dependencies
-from app.core.config import settings
+from app.api import caching, dependencies
+from app.api.filters import UserFilters, user_filters
+from app.services import ledger
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.User)
-def create_user(
+async def create_user(
     *,
-    db: Session = Depends(dependencies.get_db),
+    db: AsyncSession = Depends(dependencies.get_db),
     user_in: schemas.UserCreate,
 ) -> Any:
     """
     Create new user.
     """
-    user = crud.user.get_by_email(db, email=user_in.email)
+    user = await crud.async_user.get_by_email(db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
-    user = crud.user.create(db, obj_in=user_in)
+    user = await crud.async_user.create(db, obj_in=user_in)
     return user
 
-@router.get("/", response_model=List[schemas.User])
-def list_users(
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+@router.get("/", response_model=schemas.Page[schemas.User])
+async def list_users(
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+    page: dependencies.PaginationParams = Depends(),
+    filters: UserFilters = Depends(user_filters),
 ) -> Any:
-    return db.query(models.User).all()
+    """
+    List users, newest first. ``q`` searches email and name.
+    """
+    stmt = select(models.User).where(*filters.criteria())
+    items, next_cursor = await crud.async_user.get_page(db, stmt=stmt, cursor=page.cursor, limit=page.limit)
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/me", response_model=schemas.User)
-def read_user_me(
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_user),
+async def read_user_me(
+    request: Request,
+    response: Response,
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
 ) -> Any:
     """
-    Get current user.
+    Get current user. The ETag is derived from the cached principal, so a
+    revalidation usually costs no database work at all.
     """
+    etag = caching.make_etag("me", current_user)
+    if (cached := caching.precondition(request, etag)) is not None:
+        return cached
+    caching.set_cache_headers(response, etag)
     return current_user
 
+@router.get("/me/balances", response_model=List[schemas.Balance])
+async def read_my_balances(
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_user),
+) -> Any:
+    """
+    The current user's ledger balances, one per account and currency. They
+    are maintained as transactions change, so this reads only those rows.
+    """
+    return await ledger.balances(db, current_user.id)
+
 @router.get("/{user_id}", response_model=schemas.User)
-def read_user_by_id(
+async def read_user_by_id(
     user_id: int,
-    db: Session = Depends(dependencies.get_db),
-    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(dependencies.get_read_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
 ) -> Any:
     """
     Get a specific user by id.
     """
-    user = crud.user.get(db, id=user_id)
+    user = await crud.async_user.get(db, id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    etag = caching.make_etag("user", user.id, user.updated_at or user.created_at)
+    if (cached := caching.precondition(request, etag)) is not None:
+        return cached
+    caching.set_cache_headers(response, etag)
     return user
+
+@router.post("/{user_id}/deactivate", response_model=schemas.User)
+async def deactivate_user(
+    user_id: int,
+    db: AsyncSession = Depends(dependencies.get_db),
+    current_user: schemas.UserPrincipal = Depends(dependencies.get_current_active_superuser),
+) -> Any:
+    """
+    Deactivate a user. Their cached principal is dropped so the change takes
+    effect on their next request.
+    """
+    user = await crud.async_user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return await crud.async_user.deactivate(db, db_obj=user)
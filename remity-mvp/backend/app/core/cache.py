@@ -0,0 +1,183 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+
+
+class CacheBackend:
+    """
+    Minimal async key/value interface with per-key TTL. Values are strings.
+    """
+    async def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        raise NotImplementedError
+
+    async def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        """
+        Set every key in ``items`` with the same TTL, in one round trip
+        where the backend allows it.
+        """
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete_sync(self, key: str) -> None:
+        """
+        Blocking delete, for synchronous callers (jobs, commit hooks).
+        """
+        raise NotImplementedError
+
+    async def pop(self, key: str) -> Optional[str]:
+        """
+        Atomically read and remove a key.
+        """
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class MemoryCache(CacheBackend):
+    """
+    Bounded in-process LRU cache. Only safe to share within one event loop.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def delete_sync(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def pop(self, key: str) -> Optional[str]:
+        value = await self.get(key)
+        self._data.pop(key, None)
+        return value
+
+    def size(self) -> Optional[int]:
+        return len(self._data)
+
+
+class RedisCache(CacheBackend):
+    """
+    Shared backend so that invalidations reach every worker and replica.
+    Requires the optional ``redis`` package.
+    """
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("The redis package is required for a redis:// cache URL") from exc
+        self._client = redis.from_url(url, decode_responses=True)
+        self._url = url
+        self._sync_client: Any = None
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+    async def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, ex=ttl)
+            await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    def delete_sync(self, key: str) -> None:
+        if self._sync_client is None:
+            import redis
+
+            self._sync_client = redis.Redis.from_url(self._url, decode_responses=True)
+        self._sync_client.delete(key)
+
+    async def pop(self, key: str) -> Optional[str]:
+        return await self._client.getdel(key)
+
+
+def create_cache_backend(url: str = "", max_entries: int = 10000) -> CacheBackend:
+    if url.startswith(("redis://", "rediss://")):
+        return RedisCache(url)
+    return MemoryCache(max_entries=max_entries)
+
+
+class PrincipalCache:
+    """
+    Caches the snapshot of the user behind a validated access token so that
+    authenticated requests do not need to load the user row every time.
+    """
+    prefix = "principal:"
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        if self.ttl <= 0:
+            self.misses += 1
+            return None
+        raw = await self.backend.get(f"{self.prefix}{user_id}")
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def put(self, user_id: int, snapshot: Dict[str, Any]) -> None:
+        if self.ttl > 0:
+            await self.backend.set(f"{self.prefix}{user_id}", json.dumps(snapshot, default=str), self.ttl)
+
+    async def invalidate(self, user_id: int) -> None:
+        self.invalidations += 1
+        await self.backend.delete(f"{self.prefix}{user_id}")
+
+    def invalidate_sync(self, user_id: int) -> None:
+        self.invalidations += 1
+        self.backend.delete_sync(f"{self.prefix}{user_id}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": self.backend.size(),
+            "ttl_seconds": self.ttl,
+        }
+
+
+principal_cache = PrincipalCache(
+    create_cache_backend(settings.AUTH_CACHE_URL, settings.AUTH_CACHE_MAX_ENTRIES),
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
@@ -8,12 +8,150 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key"  # Change this in production
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
 
+    # Password hashing. Work runs in a pool of PASSWORD_HASH_WORKERS processes
+    # (0 uses threads); requests beyond PASSWORD_HASH_MAX_PENDING get a 429.
+    # Changing the bcrypt cost rehashes passwords on their next login.
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Authenticated-principal cache. AUTH_CACHE_URL may point at redis://
+    # to share entries (and invalidations) between workers; a TTL of 0
+    # disables caching. Set it whenever more than one worker or pod serves
+    # traffic: with the in-process default, deactivating a user or changing
+    # a password only evicts the principal on the worker that handled it,
+    # and the others accept the old one for up to AUTH_CACHE_TTL_SECONDS.
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_URL: str = ""
+
+    # FX quotes. Rates are read from FX_RATES_FILE (a local stand-in for a
+    # market data feed); FX_QUOTE_STORE_URL may point at redis:// so quotes
+    # issued by one replica can be consumed on another.
+    FX_RATES_FILE: str = os.path.join(os.path.dirname(__file__), "..", "services", "fx_rates.json")
+    FX_RATES_REFRESH_SECONDS: int = 60
+    FX_QUOTE_TTL_SECONDS: int = 60
+    FX_QUOTE_STORE_URL: str = ""
+    FX_QUOTE_STORE_MAX_ENTRIES: int = 100000
+    FX_FEE_FIXED: float = 1.0
+    FX_FEE_PERCENT: float = 0.005
+    FX_MARGIN: float = 0.004
+    FX_QUOTE_BATCH_MAX: int = 1000
+
+    # Rows fetched per server-side cursor round trip by streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Idempotency-Key: how long a key (and its stored response) is replayed
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 60 * 60 * 24
+
+    # Outbox worker (app.jobs.outbox_worker): events claimed per batch, idle
+    # poll interval, and exponential retry backoff until an event is dead
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_SECONDS: float = 5.0
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 3600.0
+    # Processed events are deleted after this many hours
+    OUTBOX_RETENTION_HOURS: int = 72
+
+    # Notifications. MAIL_URL is smtp://[user:password@]host[:port] or
+    # file:///dir, which writes each message as an .eml file (dev/tests).
+    MAIL_URL: str = "file:///tmp/remity/mail"
+    MAIL_FROM: str = "no-reply@remity.io"
+    RECEIPTS_DIR: str = "/tmp/remity/receipts"
+
+    # Status push (GET /transactions/events). Each worker holds one LISTEN
+    # connection outside the pool; behind PgBouncer in transaction mode point
+    # STATUS_STREAM_LISTEN_URL (async URL) straight at Postgres.
+    STATUS_STREAM_LISTEN_URL: str = ""
+    # Events buffered per client; a client further behind is disconnected
+    # and resumes with Last-Event-ID
+    STATUS_STREAM_QUEUE_SIZE: int = 256
+    STATUS_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    # Streams are closed after this long and the client reconnects, which
+    # spreads long-lived connections over new workers
+    STATUS_STREAM_MAX_SECONDS: float = 300.0
+    # Missed events replayed on reconnect; beyond this the client reloads
+    STATUS_STREAM_REPLAY_MAX: int = 500
+    # Outbox ids are taken at insert but become visible at commit, so an
+    # event can commit after one with a higher id was sent. Replays re-read
+    # events up to STATUS_STREAM_REORDER_WINDOW ids below the cursor whose
+    # transaction started in the last STATUS_STREAM_REORDER_SECONDS, and
+    # receivers drop the ids they already have.
+    STATUS_STREAM_REORDER_WINDOW: int = 1000
+    STATUS_STREAM_REORDER_SECONDS: float = 10.0
+    # Without LISTEN/NOTIFY (SQLite) new events are polled for this often
+    STATUS_STREAM_POLL_SECONDS: float = 1.0
+
+    # Monthly partitions of transactions (Postgres, app.jobs.manage_partitions):
+    # months created ahead of time, and months kept attached; older ones are
+    # written to TRANSACTIONS_ARCHIVE_DIR as Parquet and dropped. 0 keeps
+    # everything; point the archive at durable storage before enabling it.
+    TRANSACTIONS_PARTITIONS_AHEAD: int = 3
+    TRANSACTIONS_RETENTION_MONTHS: int = 0
+    TRANSACTIONS_ARCHIVE_DIR: str = "/tmp/remity/archive"
+
+    # Watchlist screening (app.services.screening). The file is a local
+    # stand-in for sanctions lists and is reloaded when it changes; names
+    # scoring at least SCREENING_THRESHOLD (0..1) are queued for review.
+    SCREENING_WATCHLIST_FILE: str = os.path.join(os.path.dirname(__file__), "..", "services", "watchlist.json")
+    SCREENING_THRESHOLD: float = 0.85
+    SCREENING_RELOAD_SECONDS: float = 60.0
+
+    # Bulk create endpoints: items per request
+    BULK_MAX_ITEMS: int = 10000
+
+    # Responses larger than this many bytes are gzip-compressed
+    GZIP_MINIMUM_SIZE: int = 1024
+
+    # Observability: statements slower than this are logged and counted,
+    # and Server-Timing (db / serialize / app) is added to responses if enabled
+    SLOW_QUERY_MS: int = 200
+    SERVER_TIMING_ENABLED: bool = False
+    # Prometheus metrics are served at /metrics on this port, apart from
+    # the API, so they are only reachable from inside the cluster (0 = off)
+    METRICS_PORT: int = 9100
+
+    # Pagination
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
     # Database
     POSTGRES_SERVER: str = os.getenv("POSTGRES_SERVER", "db")
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "remity")
     SQLALCHEMY_DATABASE_URI: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
+    # Used by the API request path (asyncpg driver)
+    SQLALCHEMY_ASYNC_DATABASE_URI: str = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
+    # Connection pool, per engine and per worker process. Size it so that
+    # pods x (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays under max_connections.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    # "always" pings on every checkout (one extra round trip); "none" relies
+    # on DB_POOL_RECYCLE and disconnect handling instead
+    DB_POOL_PRE_PING: str = "always"
+    # "queue" keeps connections open; "null" opens one per checkout, for use
+    # behind an external pooler such as PgBouncer
+    DB_POOL_CLASS: str = "queue"
+    # PgBouncer in transaction mode: disable asyncpg's server-side prepared
+    # statement caches, which do not survive switching server connections
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = False
+    # Read replicas for read-only endpoints: comma-separated async URLs.
+    # Empty means every read goes to the primary.
+    SQLALCHEMY_REPLICA_URIS: str = ""
+    REPLICA_HEALTH_CHECK_SECONDS: int = 10
+    # Replicas lagging further behind than this are taken out of rotation
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    # After a user's own write their reads stay on the primary this long.
+    # The marks live in the AUTH_CACHE_URL backend, which must be shared
+    # when more than one worker serves traffic.
+    READ_YOUR_WRITES_SECONDS: int = 5
+    # Schema is managed by Alembic ("none"). "create_all" creates missing
+    # tables on startup, for throwaway local databases only.
+    DB_STARTUP_DDL: str = "none"
 
     # CORS
     # Allow override via env var BACKEND_CORS_ORIGINS (comma-separated)
@@ -0,0 +1,193 @@
+import contextvars
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql.slow")
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+
+# Set by MetricsMiddleware for the duration of a request. SQLAlchemy's async
+# greenlets inherit the caller's context, so cursor hooks see it too.
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+def _verb(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    return head[0].upper() if head else ""
+
+
+def _params_shape(parameters: Any, executemany: bool) -> str:
+    # Types only: parameter values may hold personal data
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} rows x {_params_shape(rows[0], False) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    engine = getattr(conn.engine.pool, "metrics_name", "default")
+    verb = _verb(statement)
+    metrics.db_query_duration.observe(elapsed, engine, verb)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        metrics.db_slow_queries.inc(engine, verb)
+        logger.warning(
+            "slow query %.1fms engine=%s params=%s sql=%s",
+            elapsed * 1000,
+            engine,
+            _params_shape(parameters, executemany),
+            " ".join(statement.split())[:2000],
+        )
+
+
+def install_sql_hooks() -> None:
+    # On the Engine class, so the sync, primary and replica engines (and
+    # the sync engines behind the async ones) are all covered
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def observe_serialization(seconds: float) -> None:
+    stats = current_request.get()
+    if stats is not None:
+        stats.serialize_seconds += seconds
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware, so streaming responses and
+    contextvars behave): per-route latency and SQL counts, plus an optional
+    Server-Timing header.
+    """
+    def __init__(self, app: Any, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message: Any) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                if self.server_timing:
+                    total = time.perf_counter() - started
+                    headers: List[Any] = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(stats, total).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            elapsed = time.perf_counter() - started
+            path = _route_template(scope)
+            method = scope["method"]
+            metrics.http_request_duration.observe(elapsed, method, path, str(status[0]))
+            metrics.http_request_db_queries.observe(stats.queries, method, path)
+            metrics.http_request_db_seconds.observe(stats.db_seconds, method, path)
+
+
+def _route_template(scope: Any) -> str:
+    """
+    The matched route's template, e.g. /api/v1/transactions/{tx_id}/admin.
+    Templates rather than raw paths keep label cardinality bounded.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "<unmatched>"
+    template = getattr(route, "path_format", route.path)
+    # Routes of included routers may carry only their own part of the path
+    # (recent FastAPI); the segments before it are the routers' prefixes,
+    # which are static here
+    return scope["path"].rsplit("/", template.count("/"))[0] + template
+
+
+def _server_timing(stats: RequestStats, total: float) -> str:
+    app = max(total - stats.db_seconds - stats.serialize_seconds, 0.0)
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries", '
+        f"serialize;dur={stats.serialize_seconds * 1000:.2f}, "
+        f"app;dur={app * 1000:.2f}"
+    )
+
+
+def render_metrics() -> str:
+    """
+    Prometheus text exposition of the request/SQL metrics plus gauges read
+    at scrape time from the connection pools, caches and replicas.
+    """
+    # Imported here: these modules create engines and caches at import time
+    from app.core.cache import principal_cache
+    from app.db import pool
+    from app.db.routing import read_router
+    from app.services.status_stream import hub as status_hub
+
+    lines = metrics.registry.render()
+    snapshots = [stats.snapshot() for stats in pool.pools.values()]
+    for key, help in (
+        ("in_use", "Connections checked out"),
+        ("idle", "Connections idle in the pool"),
+        ("overflow", "Overflow connections open"),
+        ("size", "Configured pool size"),
+    ):
+        lines += metrics.gauge_lines(
+            f"db_pool_{key}", help, (({"pool": s["pool"]}, s[key]) for s in snapshots if key in s)
+        )
+    for key, help in (
+        ("checkouts", "Connection checkouts"),
+        ("timeouts", "Checkouts that timed out waiting for a connection"),
+        ("wait_seconds_total", "Time spent waiting for connections"),
+    ):
+        name = f"db_pool_{key}" if key.endswith("_total") else f"db_pool_{key}_total"
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+        lines += [f'{name}{{pool="{s["pool"]}"}} {s[key]}' for s in snapshots]
+    cache = principal_cache.stats()
+    lines += metrics.gauge_lines("auth_cache_hits", "Principal cache hits", [({}, cache["hits"])])
+    lines += metrics.gauge_lines("auth_cache_misses", "Principal cache misses", [({}, cache["misses"])])
+    lines += metrics.gauge_lines(
+        "db_replica_healthy",
+        "1 if the read replica passed its last health check",
+        (({"replica": str(r["replica"])}, int(r["healthy"])) for r in read_router.replicas.stats()),
+    )
+    lines += metrics.gauge_lines(
+        "status_stream_subscribers", "Status event streams connected to this worker",
+        [({}, len(status_hub.subscriptions))],
+    )
+    return "\n".join(lines) + "\n"
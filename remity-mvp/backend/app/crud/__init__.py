@@ -1,3 +1,4 @@
-from .crud_user import user
-from .crud_recipient import recipient
-from .crud_transaction import transaction
+from .crud_user import user, async_user
+from .crud_recipient import recipient, async_recipient
+from .crud_transaction import async_transaction
+from .crud_screening import async_screening_hit
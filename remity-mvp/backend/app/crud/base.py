@@ -1,12 +1,109 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, Select, delete, insert, inspect, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm.exc import StaleDataError
 from app.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _cursor_value(column: Any, value: Any) -> Any:
+    # Cursors come back from clients: a value of the wrong type would
+    # otherwise reach the database and fail there
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, bool) and python_type is not bool:
+        raise TypeError(value)
+    if python_type in (float, Decimal) and isinstance(value, (int, float)):
+        return python_type(str(value))
+    if not isinstance(value, python_type):
+        raise TypeError(value)
+    return value
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [_cursor_value(col, v) for col, v in zip(columns, values)]
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def _keyset(query: Any, columns: Sequence[Any], cursor: Optional[str], limit: int) -> Any:
+    # Works for both legacy Query objects and 2.0-style Select statements
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if len(columns) == 1:
+            query = query.filter(columns[0] < values[0])
+        else:
+            query = query.filter(tuple_(*columns) < tuple_(*values))
+    return query.order_by(*[c.desc() for c in columns]).limit(limit + 1)
+
+
+def _split_page(rows: List[Any], columns: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows, next_cursor
+
+
+# Write statements use RETURNING so objects come back populated from the
+# statement itself instead of a refresh SELECT after the commit.
+
+def _values(model: Any, obj_in: Union[BaseModel, Dict[str, Any]], exclude_unset: bool = False) -> Dict[str, Any]:
+    data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=exclude_unset)
+    columns = inspect(model).column_attrs.keys()
+    return {k: v for k, v in data.items() if k in columns}
+
+
+def _insert_stmt(model: Any) -> Any:
+    # Executed with a list of parameter dicts: multi-row INSERT ... RETURNING
+    # in batches, rows returned in input order
+    return insert(model).returning(model, sort_by_parameter_order=True)
+
+
+def _update_stmt(model: Any, db_obj: Any, values: Dict[str, Any]) -> Any:
+    stmt = update(model).where(model.id == db_obj.id)
+    version_col = inspect(model).version_id_col
+    if version_col is not None:
+        stmt = stmt.where(version_col == getattr(db_obj, version_col.key))
+        values = {**values, version_col.key: version_col + 1}
+    return stmt.values(**values).returning(model).execution_options(populate_existing=True)
+
+
+def _stale(model: Any, db_obj: Any) -> StaleDataError:
+    return StaleDataError(f"{model.__name__} {db_obj.id} was modified or deleted concurrently")
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -14,41 +111,165 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
-    ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+    def get_page(
+        self,
+        db: Session,
+        *,
+        query: Optional[Query] = None,
+        order_by: Optional[Sequence[Any]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Keyset pagination, newest first. Rows are ordered by ``order_by``
+        (defaults to ``id``) descending and the page after ``cursor`` is
+        returned together with the cursor of the following page, if any.
+        """
+        if query is None:
+            query = db.query(self.model)
+        columns = list(order_by) if order_by else [self.model.id]
+        rows = _keyset(query, columns, cursor, limit).all()
+        return _split_page(rows, columns, limit)
 
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = obj_in.dict()
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+    def create(self, db: Session, *, obj_in: CreateSchemaType, commit: bool = True) -> ModelType:
+        return self.bulk_create(db, objs_in=[obj_in], commit=commit)[0]
 
     def update(
         self,
         db: Session,
         *,
         db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True,
     ) -> ModelType:
-        obj_data = db_obj.__dict__
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
-
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
-        db.delete(obj)
-        db.commit()
+        update_data = _values(self.model, obj_in, exclude_unset=True)
+        if not update_data:
+            return db_obj
+        updated = db.scalars(_update_stmt(self.model, db_obj, update_data)).one_or_none()
+        if updated is None:
+            raise _stale(self.model, db_obj)
+        if commit:
+            db.commit()
+        return updated
+
+    def remove(self, db: Session, *, id: int, commit: bool = True) -> Optional[ModelType]:
+        stmt = delete(self.model).where(self.model.id == id).returning(self.model)
+        obj = db.scalars(stmt).one_or_none()
+        if commit:
+            db.commit()
         return obj
+
+    def bulk_create(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True,
+    ) -> List[ModelType]:
+        """
+        Insert many rows with multi-row INSERT ... RETURNING statements and
+        return the new objects in input order.
+        """
+        if not objs_in:
+            return []
+        rows = db.scalars(_insert_stmt(self.model), [_values(self.model, o) for o in objs_in]).all()
+        if commit:
+            db.commit()
+        return list(rows)
+
+    def bulk_update(self, db: Session, *, rows: Sequence[Dict[str, Any]], commit: bool = True) -> None:
+        """
+        Update many rows by primary key (executemany); each dict must
+        include ``id``. Nothing is returned or loaded.
+        """
+        if rows:
+            db.execute(update(self.model), [_values(self.model, r) for r in rows])
+        if commit:
+            db.commit()
+
+    def delete_where(self, db: Session, *criteria: Any, commit: bool = True) -> int:
+        result = db.execute(delete(self.model).where(*criteria))
+        if commit:
+            db.commit()
+        return result.rowcount
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    asyncio counterpart of CRUDBase, used by the API endpoints.
+    """
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        stmt: Optional[Select] = None,
+        order_by: Optional[Sequence[Any]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        if stmt is None:
+            stmt = select(self.model)
+        columns = list(order_by) if order_by else [self.model.id]
+        result = await db.execute(_keyset(stmt, columns, cursor, limit))
+        return _split_page(list(result.scalars().all()), columns, limit)
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType, commit: bool = True) -> ModelType:
+        return (await self.bulk_create(db, objs_in=[obj_in], commit=commit))[0]
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True,
+    ) -> ModelType:
+        update_data = _values(self.model, obj_in, exclude_unset=True)
+        if not update_data:
+            return db_obj
+        updated = (await db.scalars(_update_stmt(self.model, db_obj, update_data))).one_or_none()
+        if updated is None:
+            raise _stale(self.model, db_obj)
+        if commit:
+            await db.commit()
+        return updated
+
+    async def remove(self, db: AsyncSession, *, id: int, commit: bool = True) -> Optional[ModelType]:
+        stmt = delete(self.model).where(self.model.id == id).returning(self.model)
+        obj = (await db.scalars(stmt)).one_or_none()
+        if commit:
+            await db.commit()
+        return obj
+
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True,
+    ) -> List[ModelType]:
+        if not objs_in:
+            return []
+        result = await db.scalars(_insert_stmt(self.model), [_values(self.model, o) for o in objs_in])
+        rows = result.all()
+        if commit:
+            await db.commit()
+        return list(rows)
+
+    async def bulk_update(self, db: AsyncSession, *, rows: Sequence[Dict[str, Any]], commit: bool = True) -> None:
+        if rows:
+            await db.execute(update(self.model), [_values(self.model, r) for r in rows])
+        if commit:
+            await db.commit()
+
+    async def delete_where(self, db: AsyncSession, *criteria: Any, commit: bool = True) -> int:
+        result = await db.execute(delete(self.model).where(*criteria))
+        if commit:
+            await db.commit()
+        return result.rowcount
@@ -1,21 +1,90 @@
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Iterable, List, Sequence, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
 from app.models.recipient import Recipient
 from app.schemas.recipient import RecipientCreate, RecipientUpdate
+from app.services import screening
+
+def _renamed(obj_in: Union[RecipientUpdate, Dict[str, Any]]) -> Optional[str]:
+    values = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+    return values.get("full_name")
 
 class CRUDRecipient(CRUDBase[Recipient, RecipientCreate, RecipientUpdate]):
     def get_user_recipient(self, db: Session, *, user_id: int, recipient_id: int) -> Optional[Recipient]:
         return db.query(Recipient).filter(Recipient.id == recipient_id, Recipient.user_id == user_id).first()
 
-    def create_with_owner(self, db: Session, *, user_id: int, obj_in: RecipientCreate) -> Recipient:
-        db_obj = Recipient(user_id=user_id, **obj_in.dict())
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+    def create_with_owner(
+        self, db: Session, *, user_id: int, obj_in: RecipientCreate, commit: bool = True
+    ) -> Recipient:
+        db_obj = self.bulk_create(db, objs_in=[{"user_id": user_id, **obj_in.dict()}], commit=False)[0]
+        screening.record_sync(db, "recipient", [(db_obj.id, db_obj.full_name)])
+        if commit:
+            db.commit()
         return db_obj
 
-    def update(self, db: Session, *, db_obj: Recipient, obj_in: Union[RecipientUpdate, Dict[str, Any]]):
-        return super().update(db, db_obj=db_obj, obj_in=obj_in)
+    def update(
+        self, db: Session, *, db_obj: Recipient, obj_in: Union[RecipientUpdate, Dict[str, Any]], commit: bool = True
+    ):
+        updated = super().update(db, db_obj=db_obj, obj_in=obj_in, commit=False)
+        if _renamed(obj_in):
+            screening.record_sync(db, "recipient", [(updated.id, updated.full_name)])
+        if commit:
+            db.commit()
+        return updated
+
+class AsyncCRUDRecipient(AsyncCRUDBase[Recipient, RecipientCreate, RecipientUpdate]):
+    async def get_user_recipient(self, db: AsyncSession, *, user_id: int, recipient_id: int) -> Optional[Recipient]:
+        result = await db.execute(
+            select(Recipient).where(Recipient.id == recipient_id, Recipient.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def create_with_owner(
+        self, db: AsyncSession, *, user_id: int, obj_in: RecipientCreate, commit: bool = True
+    ) -> Recipient:
+        rows = await self.bulk_create_with_owner(db, user_id=user_id, objs_in=[obj_in], commit=commit)
+        return rows[0]
+
+    async def owned_names(
+        self, db: AsyncSession, *, user_id: int, recipient_ids: Iterable[int]
+    ) -> Dict[int, str]:
+        """
+        ``{id: full_name}`` for the subset of ``recipient_ids`` owned by
+        ``user_id``, in one query.
+        """
+        ids = set(recipient_ids)
+        if not ids:
+            return {}
+        result = await db.execute(
+            select(Recipient.id, Recipient.full_name).where(Recipient.user_id == user_id, Recipient.id.in_(ids))
+        )
+        return dict(result.all())
+
+    async def bulk_create_with_owner(
+        self, db: AsyncSession, *, user_id: int, objs_in: Sequence[RecipientCreate], commit: bool = True
+    ) -> List[Recipient]:
+        rows = await self.bulk_create(db, objs_in=[{"user_id": user_id, **o.dict()} for o in objs_in], commit=False)
+        await screening.record(db, "recipient", [(row.id, row.full_name) for row in rows])
+        if commit:
+            await db.commit()
+        return rows
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Recipient,
+        obj_in: Union[RecipientUpdate, Dict[str, Any]],
+        commit: bool = True,
+    ):
+        updated = await super().update(db, db_obj=db_obj, obj_in=obj_in, commit=False)
+        if _renamed(obj_in):
+            await screening.record(db, "recipient", [(updated.id, updated.full_name)])
+        if commit:
+            await db.commit()
+        return updated
 
 recipient = CRUDRecipient(Recipient)
+async_recipient = AsyncCRUDRecipient(Recipient)
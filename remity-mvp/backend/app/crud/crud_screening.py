@@ -0,0 +1,28 @@
+from typing import Optional
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.base import AsyncCRUDBase
+from app.models.screening import ScreeningHit
+from app.schemas.screening import ScreeningHit as ScreeningHitSchema, ScreeningReview
+
+class AsyncCRUDScreeningHit(AsyncCRUDBase[ScreeningHit, ScreeningHitSchema, ScreeningReview]):
+    async def review(
+        self, db: AsyncSession, *, hit_id: int, status: str, reviewer_id: int, commit: bool = True
+    ) -> Optional[ScreeningHit]:
+        """
+        Resolve an open hit in one UPDATE ... RETURNING; None if the hit
+        does not exist or was already reviewed.
+        """
+        stmt = (
+            update(ScreeningHit)
+            .where(ScreeningHit.id == hit_id, ScreeningHit.status == "open")
+            .values(status=status, reviewed_at=func.now(), reviewed_by=reviewer_id)
+            .returning(ScreeningHit)
+            .execution_options(populate_existing=True)
+        )
+        hit = (await db.scalars(stmt)).one_or_none()
+        if commit:
+            await db.commit()
+        return hit
+
+async_screening_hit = AsyncCRUDScreeningHit(ScreeningHit)
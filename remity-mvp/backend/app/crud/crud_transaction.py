@@ -1,18 +1,140 @@
-from typing import Optional, Dict, Any, Union
-from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
-from app.models.transaction import Transaction
+from datetime import datetime
+from typing import Optional, Any, List, Sequence, Tuple
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.base import AsyncCRUDBase, decode_cursor
+from app.models.transaction import Transaction, allowed_sources
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services import ledger, notifications, outbox, stats
 
-class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate]):
-    def create_with_owner(self, db: Session, *, user_id: int, obj_in: TransactionCreate) -> Transaction:
-        db_obj = Transaction(user_id=user_id, **obj_in.dict())
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+# Transactions are range-partitioned by month on created_at in Postgres
+# (app.db.partitions). Queries prune partitions only on plain comparisons
+# of created_at itself, so date bounds go through created_between and the
+# lists page newest first on (created_at, id). SQLite (dev/tests) keeps
+# paging on id: it stores server-default timestamps without the fractional
+# seconds a bound cursor value carries, so created_at does not compare
+# reliably against a cursor there.
+KEYSET = (Transaction.created_at, Transaction.id)
+
+
+def created_between(start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Any]:
+    """
+    Half-open ``[start, end)`` bounds on created_at.
+    """
+    where = []
+    if start is not None:
+        where.append(Transaction.created_at >= start)
+    if end is not None:
+        where.append(Transaction.created_at < end)
+    return where
+
+
+class AsyncCRUDTransaction(AsyncCRUDBase[Transaction, TransactionCreate, TransactionUpdate]):
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        stmt: Optional[Select] = None,
+        order_by: Optional[Sequence[Any]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Keyset page, newest first by (created_at, id) on Postgres. Pages
+        after the first also get a plain ``created_at <=`` bound: the row
+        comparison alone does not prune partitions, this does, and the
+        remaining partitions are read newest first until the page is full.
+        """
+        if order_by is None and db.get_bind().dialect.name == "postgresql":
+            order_by = KEYSET
+            if cursor:
+                newest = decode_cursor(cursor, KEYSET)[0]
+                stmt = (stmt if stmt is not None else select(Transaction)).where(Transaction.created_at <= newest)
+        return await super().get_page(db, stmt=stmt, order_by=order_by, cursor=cursor, limit=limit)
+
+    # Stats rollups, ledger postings and outbox events are written in the
+    # same DB transaction as the row change
+    async def create_with_owner(
+        self, db: AsyncSession, *, user_id: int, obj_in: TransactionCreate, commit: bool = True
+    ) -> Transaction:
+        values = {"user_id": user_id, **obj_in.dict(exclude={"quote_id"})}
+        db_obj = (await self.bulk_create(db, objs_in=[values], commit=False))[0]
+        await stats.apply_deltas(db, stats.created_deltas([db_obj]))
+        await ledger.post(db, ledger.created_entries([db_obj]))
+        if commit:
+            await db.commit()
         return db_obj
 
-    def update(self, db: Session, *, db_obj: Transaction, obj_in: Union[TransactionUpdate, Dict[str, Any]]):
-        return super().update(db, db_obj=db_obj, obj_in=obj_in)
+    async def bulk_create_with_owner(
+        self, db: AsyncSession, *, user_id: int, objs_in: Sequence[TransactionCreate], commit: bool = True
+    ) -> List[Transaction]:
+        values = [{"user_id": user_id, **o.dict(exclude={"quote_id"})} for o in objs_in]
+        rows = await self.bulk_create(db, objs_in=values, commit=False)
+        await stats.apply_deltas(db, stats.created_deltas(rows))
+        await ledger.post(db, ledger.created_entries(rows))
+        if commit:
+            await db.commit()
+        return rows
+
+    # The only write path for existing rows: the inherited update() would
+    # skip the rollups, the ledger and the outbox
+    async def update_checked(
+        self,
+        db: AsyncSession,
+        *,
+        tx_id: int,
+        obj_in: TransactionUpdate,
+        user_id: Optional[int] = None,
+        commit: bool = True,
+    ) -> Optional[Transaction]:
+        """
+        Apply ``obj_in`` as one UPDATE ... RETURNING. Ownership, the expected
+        version and the status transition are all part of the WHERE clause,
+        so a stale or illegal write matches no row and None is returned.
+        """
+        values = obj_in.model_dump(mode="json", exclude_unset=True, exclude={"version"})
+        old = select(Transaction.id, func.coalesce(Transaction.status, "pending").label("status")).where(
+            Transaction.id == tx_id
+        )
+        if user_id is not None:
+            old = old.where(Transaction.user_id == user_id)
+        old = old.with_for_update().cte("old")
+
+        stmt = update(Transaction).where(Transaction.id == old.c.id)
+        if obj_in.version is not None:
+            stmt = stmt.where(Transaction.version == obj_in.version)
+        new_status = values.get("status")
+        if new_status:
+            stmt = stmt.where(old.c.status.in_(allowed_sources(new_status)))
+            if new_status == "completed":
+                values["completed_at"] = func.coalesce(Transaction.completed_at, func.now())
+        values["version"] = Transaction.version + 1
+        returning = [Transaction]
+        prior_status = None
+        if db.get_bind().dialect.name == "postgresql":
+            # RETURNING sees the locked pre-update row through the CTE
+            returning.append(old.c.status)
+        else:
+            # SQLite (dev/tests) can only return columns of the updated table
+            prior_status = (await db.execute(select(old.c.status))).scalar()
+        stmt = stmt.values(**values).returning(*returning).execution_options(populate_existing=True)
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            return None
+        db_obj = row[0]
+        old_status = row[1] if len(row) > 1 else prior_status
+        if new_status and new_status != old_status:
+            await stats.apply_deltas(db, stats.status_change_deltas(db_obj, old_status, new_status))
+            await ledger.post(db, ledger.status_change_entries(db_obj, old_status, new_status))
+            # Notifications and receipts go out from the outbox worker
+            await outbox.enqueue(
+                db,
+                notifications.STATUS_CHANGED,
+                notifications.transaction_payload(db_obj, old_status, new_status),
+                aggregate_id=db_obj.id,
+            )
+        if commit:
+            await db.commit()
+        return db_obj
 
-transaction = CRUDTransaction(Transaction)
+async_transaction = AsyncCRUDTransaction(Transaction)
@@ -1,28 +1,44 @@
 from typing import Any, Dict, Optional, Union
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
+from app.db.session import TrackedAsyncSession
+from app.crud.base import AsyncCRUDBase, CRUDBase
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.schemas.user import UserCreate, UserPrincipal, UserUpdate
+from app.core.cache import principal_cache
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    verify_and_update_password_async,
+    verify_password,
+)
+
+# With the default in-process cache backend an invalidation only reaches
+# the worker that made it: other workers keep the old principal for up to
+# AUTH_CACHE_TTL_SECONDS unless AUTH_CACHE_URL points at a shared Redis.
+
+def _invalidate_on_commit(db: Session, user_id: int) -> None:
+    # For commit=False: the cached principal stays valid until the caller's
+    # commit, and a rollback keeps it valid. Sync sessions only (jobs):
+    # invalidate_sync blocks
+    event.listen(db, "after_commit", lambda session: principal_cache.invalidate_sync(user_id), once=True)
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
-        db_obj = User(
-            email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
-            full_name=obj_in.full_name,
-            is_superuser=obj_in.is_superuser,
-        )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+    def create(self, db: Session, *, obj_in: UserCreate, commit: bool = True) -> User:
+        values = {
+            "email": obj_in.email,
+            "hashed_password": get_password_hash(obj_in.password),
+            "full_name": obj_in.full_name,
+            "is_superuser": obj_in.is_superuser,
+        }
+        return self.bulk_create(db, objs_in=[values], commit=commit)[0]
 
     def update(
-        self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+        self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]], commit: bool = True
     ) -> User:
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -32,7 +48,12 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data, commit=commit)
+        if commit:
+            principal_cache.invalidate_sync(db_obj.id)
+        else:
+            _invalidate_on_commit(db, db_obj.id)
+        return db_obj
 
     def authenticate(
         self, db: Session, *, email: str, password: str
@@ -50,4 +71,73 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def is_superuser(self, user: User) -> bool:
         return bool(user.is_superuser)
 
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    # bcrypt is CPU bound, so hashing is delegated to the hashing executor
+    # instead of blocking the event loop
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate, commit: bool = True) -> User:
+        values = {
+            "email": obj_in.email,
+            "hashed_password": await get_password_hash_async(obj_in.password),
+            "full_name": obj_in.full_name,
+            "is_superuser": obj_in.is_superuser,
+        }
+        return (await self.bulk_create(db, objs_in=[values], commit=commit))[0]
+
+    async def update(
+        self, db: TrackedAsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]], commit: bool = True
+    ) -> User:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        if update_data.get("password"):
+            hashed_password = await get_password_hash_async(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=update_data, commit=commit)
+        if commit:
+            await principal_cache.invalidate(db_obj.id)
+        else:
+            user_id = db_obj.id
+            db.after_commit(lambda: principal_cache.invalidate(user_id))
+        return db_obj
+
+    async def deactivate(self, db: TrackedAsyncSession, *, db_obj: User) -> User:
+        return await self.update(db, db_obj=db_obj, obj_in={"is_active": False})
+
+    async def authenticate(
+        self, db: AsyncSession, *, email: str, password: str
+    ) -> Optional[User]:
+        user = await self.get_by_email(db, email=email)
+        if not user:
+            return None
+        valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            user.hashed_password = new_hash
+            db.add(user)
+            await db.commit()
+        return user
+
+    def is_active(self, user: User) -> bool:
+        return user.is_active
+
+    def is_superuser(self, user: User) -> bool:
+        return bool(user.is_superuser)
+
+    def to_principal(self, user: User) -> UserPrincipal:
+        return UserPrincipal(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+        )
+
 user = CRUDUser(User)
+async_user = AsyncCRUDUser(User)
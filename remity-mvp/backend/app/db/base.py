@@ -2,3 +2,8 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.recipient import Recipient
 from app.models.transaction import Transaction
+from app.models.stats import TransactionStatsDaily, TransactionStatsHourly
+from app.models.idempotency import IdempotencyKey
+from app.models.outbox import OutboxEvent
+from app.models.ledger import LedgerBalance, LedgerEntry
+from app.models.screening import ScreeningHit
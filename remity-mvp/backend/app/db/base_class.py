@@ -1,3 +1,4 @@
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 
 @as_declarative()
@@ -9,3 +10,12 @@ class Base:
     @declared_attr
     def __tablename__(cls) -> str:
         return cls.__name__.lower()
+
+
+# Trigram search indexes need pg_trgm; Alembic creates it in migrations,
+# this covers create_all on a fresh Postgres database
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
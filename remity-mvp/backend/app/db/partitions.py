@@ -0,0 +1,159 @@
+"""
+Monthly range partitions of ``transactions`` on created_at (Postgres only;
+migration 0a5c7e3d9b14 converts the table). Partitions are named
+transactions_yYYYYmMM and cover [first of the month, first of the next)
+in UTC; transactions_default catches rows outside every partition and
+should stay empty. app.jobs.manage_partitions keeps partitions created
+ahead of time and archives the old ones.
+"""
+import re
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+PARENT = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+_NAME = re.compile(r"^transactions_y(\d{4})m(\d{2})$")
+
+# DDL waits at most this long for its lock rather than queueing every
+# request behind it
+LOCK_TIMEOUT = "5s"
+
+
+class Partition(NamedTuple):
+    name: str
+    start: datetime
+    end: datetime
+
+
+def month_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, n: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + n
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_for(month: datetime) -> Partition:
+    start = month_start(month)
+    return Partition(f"{PARENT}_y{start.year:04d}m{start.month:02d}", start, add_months(start, 1))
+
+
+def parse_name(name: str) -> Optional[Partition]:
+    match = _NAME.match(name)
+    if match is None:
+        return None
+    return partition_for(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc))
+
+
+def months_between(start: datetime, end: datetime) -> List[Partition]:
+    """
+    Partitions covering [start, end).
+    """
+    partitions = []
+    month = month_start(start)
+    while month < end:
+        partitions.append(partition_for(month))
+        month = add_months(month, 1)
+    return partitions
+
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent)"
+    ), {"parent": PARENT}).first() is not None
+
+
+def attached(conn: Connection) -> List[Partition]:
+    """
+    Monthly partitions currently attached, oldest first.
+    """
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:parent)"
+    ), {"parent": PARENT}).scalars()
+    return sorted(p for p in map(parse_name, names) if p is not None)
+
+
+def detached(conn: Connection) -> List[Partition]:
+    """
+    Monthly partition tables that exist but are no longer attached: detached
+    for archival by a run that did not get to drop them.
+    """
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema() AND c.relkind = 'r' AND c.relname LIKE :pattern "
+        "AND NOT c.relispartition"
+    ), {"pattern": f"{PARENT}_y%"}).scalars()
+    return sorted(p for p in map(parse_name, names) if p is not None)
+
+
+def _bound(value: datetime) -> str:
+    return f"'{value.isoformat()}'"
+
+
+def create(conn: Connection, partition: Partition) -> None:
+    """
+    Create and attach one month. The table is built standalone and then
+    ATTACHed, which only needs a SHARE UPDATE EXCLUSIVE lock on the parent
+    (CREATE TABLE .. PARTITION OF would block all queries on it). Rows of
+    that month that went to the default partition are moved over.
+    """
+    conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    conn.execute(text(
+        f"CREATE TABLE {partition.name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    # Lets ATTACH skip its validation scan
+    conn.execute(text(
+        f"ALTER TABLE {partition.name} ADD CONSTRAINT {partition.name}_bounds "
+        f"CHECK (created_at >= {_bound(partition.start)} AND created_at < {_bound(partition.end)})"
+    ))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= {_bound(partition.start)} AND created_at < {_bound(partition.end)} RETURNING *) "
+        f"INSERT INTO {partition.name} SELECT * FROM moved"
+    ))
+    conn.execute(text(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {partition.name} "
+        f"FOR VALUES FROM ({_bound(partition.start)}) TO ({_bound(partition.end)})"
+    ))
+    conn.execute(text(f"ALTER TABLE {partition.name} DROP CONSTRAINT {partition.name}_bounds"))
+
+
+def ensure(conn: Connection, start: datetime, end: datetime) -> List[str]:
+    """
+    Create the missing monthly partitions covering [start, end), each
+    committed on its own. Returns the names created.
+    """
+    existing = {p.name for p in attached(conn)} | {p.name for p in detached(conn)}
+    conn.commit()
+    created = []
+    for partition in months_between(start, end):
+        if partition.name in existing:
+            continue
+        create(conn, partition)
+        conn.commit()
+        created.append(partition.name)
+    return created
+
+
+def detach(conn: Connection, partition: Partition) -> None:
+    """
+    Detach one month; afterwards it is a plain table that queries on
+    ``transactions`` no longer see. DETACH .. CONCURRENTLY is refused while
+    the table has a default partition, so this takes the brief exclusive
+    lock on the parent instead, waiting at most LOCK_TIMEOUT for it.
+    """
+    conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name}"))
+
+
+def default_rows(conn: Connection) -> int:
+    return conn.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar()
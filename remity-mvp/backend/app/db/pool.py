@@ -0,0 +1,102 @@
+import time
+import uuid
+from typing import Any, Dict, Type
+from sqlalchemy import exc, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+from app.core.config import settings
+
+
+class PoolStats:
+    """
+    Checkout counters for one engine's pool. Wait time covers the whole
+    checkout: queueing for a free connection plus opening a new one.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Any = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        data: Dict[str, Any] = {
+            "pool": self.name,
+            "class": type(pool).__mro__[1].__name__ if pool is not None else None,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+        }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+            )
+        return data
+
+
+# name -> stats, for /internal/pool and /metrics
+pools: Dict[str, PoolStats] = {}
+
+
+def instrumented(base: Type[Pool], stats: PoolStats) -> Type[Pool]:
+    class InstrumentedPool(base):  # type: ignore[valid-type, misc]
+        # Engine label for query metrics
+        metrics_name = stats.name
+
+        def __init__(self, *args: Any, **kwargs: Any):
+            # Also runs on recreate(), which re-instantiates self.__class__
+            super().__init__(*args, **kwargs)
+            stats.pool = self
+
+        def _do_get(self) -> Any:
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                stats.timeouts += 1
+                raise
+            finally:
+                stats.observe(time.perf_counter() - start)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+def engine_options(name: str, url: str, is_async: bool) -> Dict[str, Any]:
+    """
+    create_engine/create_async_engine keyword arguments from the DB_POOL_*
+    settings, with the pool class instrumented under ``name``.
+    """
+    stats = pools.setdefault(name, PoolStats(name))
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING == "always"}
+    if settings.DB_POOL_CLASS == "null":
+        options["poolclass"] = instrumented(NullPool, stats)
+    else:
+        options["poolclass"] = instrumented(AsyncAdaptedQueuePool if is_async else QueuePool, stats)
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE and make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unnamed-per-connection statements would collide across backends
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return options
@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+from app.db.pool import engine_options
+
+logger = logging.getLogger(__name__)
+
+# Seconds of replay lag; 0 when the replica has applied everything it received
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    """
+    Async engines for the read replicas, handed out round-robin among the
+    ones that passed the last health check.
+    """
+    def __init__(self, urls: List[str], max_lag: float):
+        self.urls = urls
+        self.engines = [
+            create_async_engine(url, **engine_options(f"replica-{i}", url, is_async=True))
+            for i, url in enumerate(urls)
+        ]
+        self.max_lag = max_lag
+        self.healthy: List[int] = list(range(len(self.engines)))
+        self.lag: Dict[int, Optional[float]] = {}
+        self._counter = itertools.count()
+
+    def pick(self) -> Optional[AsyncEngine]:
+        healthy = self.healthy
+        if not healthy:
+            return None
+        return self.engines[healthy[next(self._counter) % len(healthy)]]
+
+    async def _probe(self, index: int) -> Optional[float]:
+        engine = self.engines[index]
+        try:
+            async with engine.connect() as conn:
+                if engine.dialect.name == "postgresql":
+                    return float((await conn.execute(_LAG_SQL)).scalar() or 0)
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+        except Exception as exc:
+            logger.warning("Replica %s failed its health check: %s", index, exc)
+            return None
+
+    async def check(self) -> None:
+        lags = await asyncio.gather(*(self._probe(i) for i in range(len(self.engines))))
+        self.lag = dict(enumerate(lags))
+        self.healthy = [i for i, lag in enumerate(lags) if lag is not None and lag <= self.max_lag]
+
+    async def run_health_checks(self, interval: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.check()
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"replica": i, "healthy": i in self.healthy, "lag_seconds": self.lag.get(i)}
+            for i in range(len(self.engines))
+        ]
+
+
+class ReadRouter:
+    """
+    Chooses the engine for a read-only request: a healthy replica, unless the
+    user wrote recently (read-your-writes) or no replica is available, in
+    which case None is returned and the caller uses the primary.
+    """
+    prefix = "wrote:"
+
+    def __init__(self, replicas: ReplicaSet, marks: CacheBackend, window: int):
+        self.replicas = replicas
+        self.marks = marks
+        self.window = window
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas.engines)
+
+    async def note_write(self, user_id: int) -> None:
+        if self.enabled and self.window > 0:
+            await self.marks.set(f"{self.prefix}{user_id}", "1", self.window)
+
+    async def engine_for(self, user_id: Optional[int]) -> Optional[AsyncEngine]:
+        if not self.enabled:
+            return None
+        if user_id is not None and await self.marks.get(f"{self.prefix}{user_id}"):
+            return None
+        return self.replicas.pick()
+
+
+read_router = ReadRouter(
+    ReplicaSet(
+        [u.strip() for u in settings.SQLALCHEMY_REPLICA_URIS.split(",") if u.strip()],
+        max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    ),
+    # Same backend as the principal cache. With the default in-process cache
+    # a mark is only seen by the process that served the write, so once more
+    # than one pod or worker serves traffic AUTH_CACHE_URL must point at a
+    # shared Redis or the user's next read can land on a lagging replica
+    marks=create_cache_backend(settings.AUTH_CACHE_URL, settings.AUTH_CACHE_MAX_ENTRIES),
+    window=settings.READ_YOUR_WRITES_SECONDS,
+)
@@ -1,6 +1,78 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Awaitable, Callable
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.db.pool import engine_options
+from app.db.routing import read_router
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sync engine for migrations, seeding and scripts
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    **engine_options("sync", settings.SQLALCHEMY_DATABASE_URI, is_async=False),
+)
+# expire_on_commit=False keeps RETURNING-populated objects usable after commit
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+class TrackedSession(Session):
+    """
+    Session that records whether it committed any write, in
+    ``info["committed_write"]``. Read routing uses this to keep a user's
+    reads on the primary right after their own writes.
+    """
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _note_dml(state) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _note_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _note_commit(session) -> None:
+    if session.info.pop("wrote", False):
+        session.info["committed_write"] = True
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _discard(session) -> None:
+    session.info.pop("wrote", None)
+    session.info.pop("after_commit", None)
+
+
+class TrackedAsyncSession(AsyncSession):
+    """
+    Request session. A commit that wrote marks the caller (tagged in
+    ``info["user_id"]`` by get_current_user) as a recent writer before
+    returning, so the mark is in place before the handler sends its
+    response and the client's next read goes to the primary. Callbacks
+    queued with after_commit() are awaited at the same point.
+    """
+    sync_session_class = TrackedSession
+
+    def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        # Run by the next commit; a rollback drops it
+        self.info.setdefault("after_commit", []).append(callback)
+
+    async def commit(self) -> None:
+        await super().commit()
+        if self.info.pop("committed_write", False) and "user_id" in self.info:
+            await read_router.note_write(self.info["user_id"])
+        for callback in self.info.pop("after_commit", ()):
+            await callback()
+
+
+# Async engine for the API request path
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+    **engine_options("primary", settings.SQLALCHEMY_ASYNC_DATABASE_URI, is_async=True),
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=TrackedAsyncSession, autoflush=False, expire_on_commit=False
+)
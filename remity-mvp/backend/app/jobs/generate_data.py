@@ -0,0 +1,272 @@
+"""
+Bulk-generate synthetic users, recipients and transactions, e.g. to load a
+local stack for benchmarks/load.py.
+
+    python -m app.jobs.generate_data --users 10000 --transactions 2000000
+    python -m app.jobs.generate_data --transactions 100000 --seed 7 \\
+        --corridors USD:MXN=5,USD:EUR=2,GBP:INR=1 --statuses completed=8,pending=1,failed=1
+
+Users are <prefix>-<n>@loadtest.remity.io (plus a <prefix>-admin superuser),
+all sharing --password. Rows get explicit ids and are streamed with COPY on
+Postgres (multi-row INSERTs elsewhere). The same --seed produces the same
+rows, with timestamps spread over the --days before the run. The stats
+rollups for that window are rebuilt and the new transactions posted to the
+ledger at the end.
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.engine import Connection
+from app import models
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db import partitions
+from app.db.session import SessionLocal, engine
+from app.models.transaction import STATUSES
+from app.services import ledger, stats
+
+logger = logging.getLogger("app.jobs.generate_data")
+
+DEFAULT_PREFIX = "load"
+DEFAULT_PASSWORD = "LoadTest123!"
+DEFAULT_CORRIDORS = "USD:MXN=30,USD:EUR=15,USD:PHP=12,USD:INR=12,USD:COP=8,USD:GTQ=8,USD:DOP=6,GBP:INR=5,EUR:BRL=4"
+DEFAULT_STATUSES = "completed=70,pending=12,in_progress=8,failed=6,cancelled=4"
+PAYMENT_METHODS = (("bank_transfer", 60), ("debit_card", 25), ("credit_card", 10), ("cash_pickup", 5))
+# Terminal statuses carry a completed_at
+FINISHED = {"completed", "failed", "cancelled"}
+
+USER_COLUMNS = ("id", "email", "full_name", "hashed_password", "is_active", "is_superuser", "is_verified",
+                "kyc_status", "country", "created_at")
+RECIPIENT_COLUMNS = ("id", "user_id", "full_name", "email", "country", "bank_name", "account_number",
+                     "is_active", "is_verified", "created_at")
+TRANSACTION_COLUMNS = ("id", "user_id", "recipient_id", "amount", "currency_from", "currency_to", "exchange_rate",
+                       "fee_amount", "total_amount", "status", "tracking_number", "payment_method", "created_at",
+                       "updated_at", "completed_at", "version")
+
+FIRST_NAMES = ("Ana", "Luis", "Maria", "Jose", "Priya", "Rahul", "Grace", "Paolo", "Sofia", "Carlos", "Aisha",
+               "Daniel", "Lucia", "Miguel", "Rosa", "Arjun", "Joy", "Mateo", "Elena", "Samuel")
+LAST_NAMES = ("Garcia", "Santos", "Reyes", "Patel", "Sharma", "Cruz", "Lopez", "Silva", "Gomez", "Torres",
+              "Mendoza", "Kumar", "Flores", "Ramos", "Diaz", "Rivera", "Castillo", "Morales", "Nair", "Perez")
+# Destination currency -> recipient country
+COUNTRIES = {"MXN": "MX", "EUR": "ES", "PHP": "PH", "INR": "IN", "COP": "CO", "GTQ": "GT", "DOP": "DO",
+             "BRL": "BR", "GBP": "GB", "CAD": "CA", "USD": "US"}
+
+
+def user_email(prefix: str, n: int) -> str:
+    return f"{prefix}-{n}@loadtest.remity.io"
+
+
+def admin_email(prefix: str) -> str:
+    return f"{prefix}-admin@loadtest.remity.io"
+
+
+def parse_distribution(spec: str) -> Tuple[List[str], List[float]]:
+    """
+    ``"a=3,b=1"`` -> (["a", "b"], [3.0, 1.0]), as weights for random.choices.
+    """
+    keys, weights = [], []
+    for part in spec.split(","):
+        key, _, weight = part.partition("=")
+        keys.append(key.strip())
+        weights.append(float(weight or 1))
+    if not keys or min(weights) < 0 or sum(weights) <= 0:
+        raise ValueError(f"invalid distribution: {spec!r}")
+    return keys, weights
+
+
+def load_rates() -> Dict[str, float]:
+    with open(settings.FX_RATES_FILE) as f:
+        return json.load(f)["rates"]
+
+
+class Generator:
+    """
+    Produces rows in batches from one seeded RNG. Ids start after
+    ``*_start`` so a run can be added on top of existing data.
+    """
+    def __init__(self, args: argparse.Namespace, user_start: int, recipient_start: int, tx_start: int):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.user_start = user_start
+        self.recipient_start = recipient_start
+        self.tx_start = tx_start
+        self.end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        self.start = self.end - timedelta(days=args.days)
+        self.corridors, self.corridor_weights = parse_distribution(args.corridors)
+        self.statuses, self.status_weights = parse_distribution(args.statuses)
+        unknown = set(self.statuses) - set(STATUSES)
+        if unknown:
+            raise ValueError(f"unknown statuses: {', '.join(sorted(unknown))}")
+        self.methods = [m for m, _ in PAYMENT_METHODS]
+        self.method_weights = [w for _, w in PAYMENT_METHODS]
+        rates = load_rates()
+        self.pricing = {}
+        for corridor in self.corridors:
+            cur_from, _, cur_to = corridor.partition(":")
+            if cur_from not in rates or cur_to not in rates:
+                raise ValueError(f"no FX rate for corridor {corridor}")
+            rate = rates[cur_to] / rates[cur_from] * (1 - settings.FX_MARGIN)
+            self.pricing[corridor] = (cur_from, cur_to, Decimal(f"{rate:.6f}"))
+        # Each user sends along one corridor, so their recipients live there
+        self.user_corridor = self.rng.choices(self.corridors, weights=self.corridor_weights, k=args.users)
+
+    def _timestamp(self) -> datetime:
+        return self.start + timedelta(seconds=self.rng.uniform(0, (self.end - self.start).total_seconds()))
+
+    def _name(self) -> str:
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def users(self) -> Iterator[Tuple[Any, ...]]:
+        hashed = get_password_hash(self.args.password)
+        created = self.start - timedelta(days=30)
+        yield (self.user_start, admin_email(self.args.prefix), "Load Test Admin", hashed, True, True, True,
+               "approved", "US", created)
+        for n in range(1, self.args.users + 1):
+            country = COUNTRIES.get(self.user_corridor[n - 1].partition(":")[0], "US")
+            yield (self.user_start + n, user_email(self.args.prefix, n), self._name(), hashed, True, False,
+                   True, "approved", country, created)
+
+    def recipients(self) -> Iterator[Tuple[Any, ...]]:
+        created = self.start - timedelta(days=1)
+        per_user = self.args.recipients_per_user
+        for n in range(self.args.users * per_user):
+            recipient_id = self.recipient_start + n
+            user_index = n // per_user
+            country = COUNTRIES.get(self.user_corridor[user_index].partition(":")[2], "US")
+            yield (recipient_id, self.user_start + 1 + user_index, self._name(), f"recipient-{recipient_id}@example.com",
+                   country, "Demo Bank", f"{self.rng.randrange(10 ** 9, 10 ** 10)}", True, True, created)
+
+    def transactions(self) -> Iterator[Tuple[Any, ...]]:
+        args = self.args
+        per_user = args.recipients_per_user
+        for n in range(args.transactions):
+            tx_id = self.tx_start + n
+            # Skewed towards low user numbers: a few heavy senders, a long tail
+            user_index = int(args.users * self.rng.random() ** 2)
+            recipient_id = self.recipient_start + user_index * per_user + self.rng.randrange(per_user)
+            cur_from, cur_to, rate = self.pricing[self.user_corridor[user_index]]
+            amount = Decimal(f"{min(max(self.rng.lognormvariate(5.3, 0.9), 10), 9500):.2f}")
+            fee = Decimal(f"{settings.FX_FEE_FIXED + float(amount) * settings.FX_FEE_PERCENT:.2f}")
+            status = self.rng.choices(self.statuses, weights=self.status_weights)[0]
+            created_at = self._timestamp()
+            updated_at = None
+            if status != "pending":
+                updated_at = created_at + timedelta(minutes=self.rng.randint(1, 2880))
+            yield (tx_id, self.user_start + 1 + user_index, recipient_id, amount, cur_from, cur_to, rate, fee,
+                   amount + fee, status, f"LT{tx_id:012d}", self.rng.choices(self.methods, self.method_weights)[0],
+                   created_at, updated_at, updated_at if status in FINISHED else None, 1)
+
+
+def _batches(rows: Iterator[Tuple[Any, ...]], size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy(conn: Connection, table: Table, columns: Sequence[str], rows: List[Tuple[Any, ...]]) -> None:
+    if conn.dialect.name != "postgresql":
+        conn.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+        return
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        # Empty unquoted fields are NULL in COPY's CSV format
+        writer.writerow(["" if v is None else v.isoformat() if isinstance(v, datetime) else v for v in row])
+    buf.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf
+        )
+    finally:
+        cursor.close()
+
+
+def load(table: Table, columns: Sequence[str], rows: Iterator[Tuple[Any, ...]], batch_size: int) -> int:
+    """
+    Write ``rows`` into ``table``, committing every ``batch_size`` rows.
+    """
+    total = 0
+    started = time.perf_counter()
+    for batch in _batches(rows, batch_size):
+        with engine.begin() as conn:
+            _copy(conn, table, columns, batch)
+        total += len(batch)
+        logger.info("%s: %d rows (%.0f rows/s)", table.name, total, total / (time.perf_counter() - started))
+    return total
+
+
+def _next_id(conn: Connection, model: Any) -> int:
+    return (conn.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def run(args: argparse.Namespace) -> None:
+    with engine.connect() as conn:
+        existing = conn.scalar(select(func.count()).where(models.User.email == admin_email(args.prefix)))
+        if existing:
+            raise SystemExit(f"Data with prefix {args.prefix!r} already exists; pick another --prefix")
+        starts = [_next_id(conn, m) for m in (models.User, models.Recipient, models.Transaction)]
+        gen = Generator(args, *starts)
+        if partitions.is_partitioned(conn):
+            # Rows outside every monthly partition would land in the default one
+            partitions.ensure(conn, gen.start, gen.end + timedelta(hours=1))
+    load(models.User.__table__, USER_COLUMNS, gen.users(), args.batch_size)
+    load(models.Recipient.__table__, RECIPIENT_COLUMNS, gen.recipients(), args.batch_size)
+    load(models.Transaction.__table__, TRANSACTION_COLUMNS, gen.transactions(), args.batch_size)
+    if engine.dialect.name == "postgresql":
+        # Ids were explicit; move the sequences past them and refresh planner stats
+        with engine.begin() as conn:
+            for table in ("users", "recipients", "transactions"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+            conn.execute(text("ANALYZE users, recipients, transactions"))
+    # Bulk loads bypass the incremental rollup and ledger writers
+    day_start = gen.start.replace(hour=0)
+    db = SessionLocal()
+    try:
+        scanned = stats.reconcile(db, day_start, gen.end.replace(hour=0) + timedelta(days=1))
+        entries = ledger.open_transactions(db, starts[2])
+    finally:
+        db.close()
+    logger.info("Rebuilt stats rollups from %d transactions", scanned)
+    logger.info("Posted %d opening ledger entries", entries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--recipients-per-user", type=int, default=3)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=90, help="spread transactions over the last N days")
+    parser.add_argument("--corridors", default=DEFAULT_CORRIDORS, help="weighted FROM:TO currency pairs")
+    parser.add_argument("--statuses", default=DEFAULT_STATUSES, help="weighted transaction statuses")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed; same seed, same data")
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX, help="email prefix of the generated users")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password of every generated user")
+    parser.add_argument("--batch-size", type=int, default=50000, help="rows per COPY and commit")
+    args = parser.parse_args()
+    if args.users < 1 or args.recipients_per_user < 1:
+        parser.error("--users and --recipients-per-user must be at least 1")
+    logging.basicConfig(level=logging.INFO)
+    try:
+        run(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Maintain the monthly partitions of transactions: create the coming months
+ahead of time and archive the months past retention. Postgres only; an
+unpartitioned table is left alone.
+
+    python -m app.jobs.manage_partitions
+    python -m app.jobs.manage_partitions --ahead 3 --retention-months 24 --interval 86400
+
+Archived months are detached, written to --archive-dir as Parquet (needs
+pyarrow), checked against the table and dropped. A month left detached by
+an interrupted run is finished on the next one.
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timezone
+from app.core.config import settings
+from app.db import partitions
+from app.db.session import engine
+from app.services import archive
+
+logger = logging.getLogger("app.jobs.manage_partitions")
+
+
+def run_once(ahead: int, retention_months: int, archive_dir: str, batch_size: int) -> None:
+    this_month = partitions.month_start(datetime.now(timezone.utc))
+    with engine.connect() as conn:
+        if not partitions.is_partitioned(conn):
+            logger.info("transactions is not partitioned; nothing to do")
+            return
+        created = partitions.ensure(conn, this_month, partitions.add_months(this_month, ahead + 1))
+        stray = partitions.default_rows(conn)
+        cutoff = partitions.add_months(this_month, -retention_months)
+        expired = [p for p in partitions.attached(conn) + partitions.detached(conn) if p.end <= cutoff]
+    for name in created:
+        logger.info("Created partition %s", name)
+    if stray:
+        logger.warning("%d transactions are in %s, outside every monthly partition", stray, partitions.DEFAULT_PARTITION)
+    if not retention_months:
+        return
+    for partition in sorted(set(expired)):
+        archive.archive_partition(engine, partition, archive_dir, batch_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ahead", type=int, default=settings.TRANSACTIONS_PARTITIONS_AHEAD,
+                        help="months to create beyond the current one")
+    parser.add_argument("--retention-months", type=int, default=settings.TRANSACTIONS_RETENTION_MONTHS,
+                        help="archive months that ended more than N months ago (0 = never)")
+    parser.add_argument("--archive-dir", default=settings.TRANSACTIONS_ARCHIVE_DIR)
+    parser.add_argument("--batch-size", type=int, default=50000, help="rows per Parquet row group")
+    parser.add_argument("--interval", type=int, default=0, help="repeat every N seconds (0 = run once)")
+    args = parser.parse_args()
+    if args.retention_months and not archive.available():
+        parser.error("archiving requires pyarrow")
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        run_once(args.ahead, args.retention_months, args.archive_dir, args.batch_size)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
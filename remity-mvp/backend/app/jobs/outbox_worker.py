@@ -0,0 +1,79 @@
+"""
+Deliver outbox events: claim due events in batches, run their handlers and
+retry failures with exponential backoff. Run as many replicas as needed;
+FOR UPDATE SKIP LOCKED keeps them from handling the same event.
+
+    python -m app.jobs.outbox_worker
+    python -m app.jobs.outbox_worker --metrics-port 9102
+    python -m app.jobs.outbox_worker --once
+"""
+import argparse
+import logging
+import time
+from datetime import timedelta
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import notifications, outbox  # noqa: F401 - registers the handlers
+
+logger = logging.getLogger("app.jobs.outbox_worker")
+
+# How often an idle worker deletes old processed events
+PURGE_INTERVAL_SECONDS = 600
+
+
+def serve_metrics(port: int) -> None:
+    metrics.serve(port)
+    logger.info("Serving worker metrics on :%d/metrics", port)
+
+
+def drain(batch_size: int) -> int:
+    """
+    Process batches until no due event is left. Returns the number handled.
+    """
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            claimed = outbox.process_batch(db, batch_size)
+            total += claimed
+            if claimed < batch_size:
+                return total
+    finally:
+        db.close()
+
+
+def purge() -> None:
+    db = SessionLocal()
+    try:
+        removed = outbox.purge_processed(db, timedelta(hours=settings.OUTBOX_RETENTION_HOURS))
+    finally:
+        db.close()
+    if removed:
+        logger.info("Purged %d processed outbox events", removed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--poll", type=float, default=settings.OUTBOX_POLL_SECONDS, help="idle poll interval")
+    parser.add_argument("--metrics-port", type=int, default=0, help="serve Prometheus metrics (0 = off)")
+    parser.add_argument("--once", action="store_true", help="drain due events and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    last_purge = 0.0
+    while True:
+        handled = drain(args.batch_size)
+        if args.once:
+            logger.info("Handled %d outbox events", handled)
+            break
+        if time.monotonic() - last_purge > PURGE_INTERVAL_SECONDS:
+            purge()
+            last_purge = time.monotonic()
+        time.sleep(args.poll)
+
+
+if __name__ == "__main__":
+    main()
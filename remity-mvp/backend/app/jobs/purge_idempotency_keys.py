@@ -0,0 +1,39 @@
+"""
+Delete expired Idempotency-Key records.
+
+    python -m app.jobs.purge_idempotency_keys
+    python -m app.jobs.purge_idempotency_keys --interval 3600
+"""
+import argparse
+import logging
+import time
+from app.db.session import SessionLocal
+from app.services import idempotency
+
+logger = logging.getLogger("app.jobs.purge_idempotency_keys")
+
+
+def run_once(batch_size: int) -> None:
+    db = SessionLocal()
+    try:
+        removed = idempotency.purge_expired(db, batch_size=batch_size)
+    finally:
+        db.close()
+    logger.info("Purged %d expired idempotency keys", removed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows deleted per statement")
+    parser.add_argument("--interval", type=int, default=0, help="repeat every N seconds (0 = run once)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        run_once(args.batch_size)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
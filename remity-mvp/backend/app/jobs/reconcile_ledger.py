@@ -0,0 +1,58 @@
+"""
+Check the ledger: every user balance against the sum of its entries, and
+every posting for summing to zero. Exits non-zero when something is off.
+
+    python -m app.jobs.reconcile_ledger
+    python -m app.jobs.reconcile_ledger --repair
+    python -m app.jobs.reconcile_ledger --interval 3600
+
+--repair resets mismatched balances to the sum of their entries. Unbalanced
+postings are only reported: fixing those takes a correcting posting.
+"""
+import argparse
+import logging
+import sys
+import time
+from app.db.session import SessionLocal
+from app.services import ledger
+
+logger = logging.getLogger("app.jobs.reconcile_ledger")
+
+
+def run_once(batch_size: int, repair: bool) -> bool:
+    db = SessionLocal()
+    try:
+        result = ledger.reconcile(db, batch_size=batch_size)
+        # Repairs lock rows; not from inside the snapshot
+        db.rollback()
+        for mismatch in result.mismatches:
+            logger.error("Balance %s is %s, entries sum to %s", mismatch.key, mismatch.balance, mismatch.ledger)
+            if repair:
+                logger.info("Balance %s reset to %s", mismatch.key, ledger.repair(db, mismatch.key))
+        for transaction_id, event, currency, total in result.unbalanced:
+            logger.error("Posting %s of transaction %d sums to %s %s", event, transaction_id, total, currency)
+    finally:
+        db.close()
+    logger.info(
+        "Checked %d balances: %d mismatched, %d unbalanced postings",
+        result.accounts, len(result.mismatches), len(result.unbalanced),
+    )
+    return not result.unbalanced and (repair or not result.mismatches)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows fetched per round trip")
+    parser.add_argument("--repair", action="store_true", help="reset mismatched balances from the entries")
+    parser.add_argument("--interval", type=int, default=0, help="repeat every N seconds (0 = run once)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        ok = run_once(args.batch_size, args.repair)
+        if not args.interval:
+            sys.exit(0 if ok else 1)
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Rebuild the transaction stats rollups from the transactions table.
+
+    python -m app.jobs.reconcile_stats --days 2
+    python -m app.jobs.reconcile_stats --days 2 --interval 3600
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from app.db.session import SessionLocal
+from app.services import stats
+
+logger = logging.getLogger("app.jobs.reconcile_stats")
+
+
+def run_once(days: int) -> None:
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today - timedelta(days=days - 1)
+    end = today + timedelta(days=1)
+    db = SessionLocal()
+    try:
+        scanned = stats.reconcile(db, start, end)
+    finally:
+        db.close()
+    logger.info("Reconciled stats for %s..%s from %d transactions", start.date(), end.date(), scanned)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=2, help="number of most recent UTC days to rebuild")
+    parser.add_argument("--interval", type=int, default=0, help="repeat every N seconds (0 = run once)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    while True:
+        run_once(args.days)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Re-screen every recipient and user against the watchlist and queue new
+hits for review. Names are scored in a pool of worker processes, each
+with its own copy of the index, so a full rescan uses every core.
+
+    python -m app.jobs.rescreen
+    python -m app.jobs.rescreen --workers 8
+    python -m app.jobs.rescreen --watch 60
+
+--watch checks the watchlist file every N seconds and rescans whenever
+its contents change (and once at startup). Hits already queued for the
+same subject, name and entry are kept as they are, reviewed or not.
+"""
+import argparse
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.recipient import Recipient
+from app.models.user import User
+from app.services import screening
+
+logger = logging.getLogger("app.jobs.rescreen")
+
+SUBJECTS = (("recipient", Recipient), ("user", User))
+
+# Set in each worker process by _init_worker
+_index: Optional[screening.WatchlistIndex] = None
+
+
+def _init_worker(path: str) -> None:
+    global _index
+    _index = screening.WatchlistIndex.from_file(path)
+
+
+def _screen(subject_type: str, subjects: Sequence[Tuple[int, str]], threshold: float) -> List[Dict[str, Any]]:
+    return screening.hit_rows(_index, subject_type, subjects, threshold)
+
+
+def digest(path: str) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()[:16]
+
+
+def run_once(pool: ProcessPoolExecutor, workers: int, batch_size: int, threshold: float) -> int:
+    """
+    Stream (id, full_name) of every subject ``batch_size`` rows at a time,
+    screen the batches in ``pool`` and insert the hits as they come back.
+    At most two batches per worker are in flight, so memory stays flat.
+    Returns the number of hits found, queued or already there.
+    """
+    # Hits are committed as they come in, on a second session: committing
+    # would close the reading session's server-side cursor
+    reader, writer = SessionLocal(), SessionLocal()
+    dialect = writer.get_bind().dialect.name
+    found = 0
+    pending: Set[Future] = set()
+
+    def drain(return_when: str) -> None:
+        nonlocal found
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            pending.discard(future)
+            rows = future.result()
+            if rows:
+                writer.execute(screening.insert_statement(dialect, rows))
+                writer.commit()
+                found += len(rows)
+
+    try:
+        for subject_type, model in SUBJECTS:
+            result = reader.execute(
+                select(model.id, model.full_name)
+                .where(model.full_name.is_not(None))
+                .order_by(model.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for partition in result.partitions():
+                pending.add(pool.submit(_screen, subject_type, [tuple(row) for row in partition], threshold))
+                if len(pending) >= 2 * workers:
+                    drain(FIRST_COMPLETED)
+        if pending:
+            drain(ALL_COMPLETED)
+    finally:
+        reader.close()
+        writer.close()
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="screening processes")
+    parser.add_argument("--batch-size", type=int, default=5000, help="names fetched and screened per batch")
+    parser.add_argument("--watch", type=int, default=0, help="rescan when the watchlist changes, checked every N seconds")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    path = settings.SCREENING_WATCHLIST_FILE
+    seen = None
+    while True:
+        version = digest(path)
+        if version != seen:
+            started = time.monotonic()
+            # spawn: workers start clean instead of inheriting the parent's
+            # database connections; each builds the index once
+            with ProcessPoolExecutor(
+                args.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(path,),
+            ) as pool:
+                found = run_once(pool, args.workers, args.batch_size, settings.SCREENING_THRESHOLD)
+            logger.info("Watchlist %s: %d hits in %.1fs", version, found, time.monotonic() - started)
+            seen = version
+        if not args.watch:
+            return
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
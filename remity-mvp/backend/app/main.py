@@ -1,31 +1,74 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from app.api.v1.api import api_router
+from app.core import metrics
 from app.core.config import settings
-from app.db.session import engine, SessionLocal
+from app.core.instrumentation import MetricsMiddleware, install_sql_hooks, render_metrics
+from app.crud.base import InvalidCursor
+from app.db.routing import read_router
+from app.db.session import async_engine, SessionLocal
 from app.db import base  # noqa: F401
-from sqlalchemy import text
 import os
 from app import models, crud
-from app.core.security import get_password_hash
+from app.core.security import HashingPoolSaturated, get_password_hash, hashing_executor
+from app.services import ledger, stats
+from app.services.quotes import quote_engine
+from app.services.screening import screener
+from app.services.status_stream import hub as status_hub
 from sqlalchemy.orm import Session
+from datetime import timedelta
 from decimal import Decimal
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Spawn the hashing workers up front so the first logins don't pay for it
+    hashing_executor.start()
+    # Schema changes belong to Alembic (entrypoint.sh / the Helm migration
+    # job); by default a worker boots without issuing any DDL.
+    if settings.DB_STARTUP_DDL == "create_all":
+        async with async_engine.begin() as conn:
+            await conn.run_sync(base.Base.metadata.create_all)
+    if os.getenv("ENABLE_SEED", "false").lower() == "true":
+        await asyncio.to_thread(run_seed)
+    quote_engine.refresh()
+    await screener.current()
+    fx_refresh = asyncio.create_task(quote_engine.run_refresh_loop(settings.FX_RATES_REFRESH_SECONDS))
+    if read_router.enabled and not settings.AUTH_CACHE_URL:
+        logger.warning(
+            "Read replicas are configured without AUTH_CACHE_URL: read-your-writes "
+            "marks stay in this process and are not seen by other workers"
+        )
+    await read_router.replicas.check()
+    replica_checks = asyncio.create_task(
+        read_router.replicas.run_health_checks(settings.REPLICA_HEALTH_CHECK_SECONDS)
+    )
+    status_push = asyncio.create_task(status_hub.run())
+    # Not a route of this app: the API port is public
+    metrics_server = metrics.serve(settings.METRICS_PORT, render_metrics) if settings.METRICS_PORT else None
+    yield
+    if metrics_server:
+        metrics_server.shutdown()
+        metrics_server.server_close()
+    fx_refresh.cancel()
+    replica_checks.cancel()
+    status_push.cancel()
+    hashing_executor.shutdown()
+    await read_router.replicas.dispose()
+    await async_engine.dispose()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
-# Create tables if not exist
-base.Base.metadata.create_all(bind=engine)
-
-# Safe migration for new columns
-with engine.begin() as conn:
-    try:
-        conn.execute(text("ALTER TABLE transactions ADD COLUMN IF NOT EXISTS proof_of_payment_url VARCHAR(255)"))
-    except Exception:
-        pass
-
 # Optional seed data for demos
 def seed_data(db: Session) -> None:
     # Users
@@ -74,6 +117,8 @@ def seed_data(db: Session) -> None:
     r2 = ensure_recipient(user, "Bob Recipient", "bob@example.com")
 
     # Transactions
+    created = []
+
     def ensure_tx(u: models.User, rcpt: models.Recipient, amount: Decimal, status: str):
         # create a tx if not exists with same amount/status
         existing = (
@@ -103,19 +148,29 @@ def seed_data(db: Session) -> None:
         db.add(tx)
         db.commit()
         db.refresh(tx)
+        created.append(tx)
         return tx
 
     ensure_tx(user, r1, Decimal("100.00"), "pending")
     ensure_tx(user, r2, Decimal("250.00"), "in_progress")
     ensure_tx(user, r1, Decimal("500.00"), "completed")
 
-if os.getenv("ENABLE_SEED", "false").lower() == "true":
+    # Inserted without the CRUD: rebuild their days' rollups and post them
+    # to the ledger, as app.jobs.generate_data does
+    if created:
+        days = [stats.hour_bucket(tx.created_at).replace(hour=0) for tx in created]
+        stats.reconcile(db, min(days), max(days) + timedelta(days=1))
+        ledger.open_transactions(db, min(tx.id for tx in created))
+
+def run_seed() -> None:
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         seed_data(db)
     finally:
         db.close()
 
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -125,6 +180,23 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],
+    )
+
+# Outermost, so latency covers the whole stack
+install_sql_hooks()
+app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+@app.exception_handler(HashingPoolSaturated)
+async def hashing_saturated_handler(request: Request, exc: HashingPoolSaturated):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many concurrent authentication requests"},
+        headers={"Retry-After": "1"},
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,3 +1,8 @@
 from .user import User
 from .recipient import Recipient
 from .transaction import Transaction
+from .stats import TransactionStatsDaily, TransactionStatsHourly
+from .idempotency import IdempotencyKey
+from .outbox import OutboxEvent
+from .ledger import LedgerBalance, LedgerEntry
+from .screening import ScreeningHit
@@ -0,0 +1,43 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+# Double-entry ledger of the money behind transactions (app.services.ledger).
+# Every posting is a set of entries that sums to zero per currency and is
+# written in the same commit as the transaction change that causes it.
+# Entries are append-only: corrections are new postings.
+class LedgerEntry(Base):
+    __tablename__ = "ledger_entries"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    # No foreign key: transactions is partitioned on Postgres, keyed (id, created_at)
+    transaction_id = Column(Integer, nullable=False, index=True)
+    # What posted it: "created", "completed", "failed", "cancelled" or "opening"
+    event = Column(String(20), nullable=False)
+    # Owner of the account; NULL for the house (clearing) account
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    account = Column(String(20), nullable=False)
+    currency = Column(String(3), nullable=False)
+    # Signed: positive adds to the account's balance
+    amount = Column(Numeric(18, 2), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Reconciliation streams each account's entries in this order
+    __table_args__ = (
+        Index("ix_ledger_entries_account", user_id, account, currency, id),
+    )
+
+
+# Running balance of every user account, kept up to date in the same
+# commit as the entries. House accounts have none: every transfer posts to
+# them, and a single row updated by every writer would serialize them.
+class LedgerBalance(Base):
+    __tablename__ = "ledger_balances"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    account = Column(String(20), primary_key=True)
+    currency = Column(String(3), primary_key=True)
+
+    balance = Column(Numeric(18, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,59 @@
+from sqlalchemy import DDL, JSON, BigInteger, Column, DateTime, Index, Integer, String, Text, event
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+# Transactional outbox: side effects (emails, receipts) are recorded as rows
+# in the same commit as the change that causes them, and carried out later
+# by app.jobs.outbox_worker. Status: pending -> done, or dead after the
+# last retry.
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    topic = Column(String(100), nullable=False)
+    aggregate_id = Column(Integer, nullable=True)
+    payload = Column(JSON, nullable=False)
+
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # Not picked up before this time; pushed back on each failed attempt
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # The worker's claim query only ever scans pending rows
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending",
+            available_at,
+            id,
+            postgresql_where=status == "pending",
+            sqlite_where=status == "pending",
+        ),
+    )
+
+
+# Status changes are also pushed to connected clients: on Postgres each
+# transaction.status_changed row is NOTIFYed on this channel when its
+# transaction commits (app.services.status_stream listens).
+STATUS_CHANNEL = "transaction_status"
+
+NOTIFY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION outbox_events_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{STATUS_CHANNEL}', json_build_object('id', NEW.id, 'payload', NEW.payload)::text);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+NOTIFY_TRIGGER = """
+CREATE TRIGGER outbox_events_notify AFTER INSERT ON outbox_events
+FOR EACH ROW WHEN (NEW.topic = 'transaction.status_changed')
+EXECUTE FUNCTION outbox_events_notify()
+"""
+
+# Alembic creates the trigger in migrations; this covers create_all
+for _ddl in (NOTIFY_FUNCTION, NOTIFY_TRIGGER):
+    event.listen(OutboxEvent.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -7,7 +7,7 @@ class Recipient(Base):
     __tablename__ = "recipients"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     # Personal information
     full_name = Column(String(200), nullable=False)
@@ -49,3 +49,13 @@ class Recipient(Base):
     # Additional fields
     notes = Column(Text, nullable=True)
     verification_document = Column(String(255), nullable=True)
+
+    # Admin console search (ILIKE '%term%') on Postgres
+    __table_args__ = (
+        Index(
+            "ix_recipients_full_name_trgm",
+            full_name,
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+# Review queue of watchlist matches (app.services.screening). A hit names
+# the screened subject and the listed entry it resembles; a compliance
+# officer clears it (false positive) or confirms it. Status: open ->
+# cleared | confirmed.
+class ScreeningHit(Base):
+    __tablename__ = "screening_hits"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    # "recipient", "user" or "transaction"
+    subject_type = Column(String(20), nullable=False)
+    # No foreign key: transactions is partitioned on Postgres
+    subject_id = Column(Integer, nullable=False)
+    # The screened name, as it was when screened
+    name = Column(String(200), nullable=False)
+
+    # Digest of the watchlist file that produced the hit
+    list_version = Column(String(64), nullable=False)
+    entry_id = Column(String(50), nullable=False)
+    # The listed name or alias that matched
+    entry_name = Column(String(200), nullable=False)
+    program = Column(String(50), nullable=False)
+    score = Column(Float, nullable=False)
+
+    status = Column(String(20), nullable=False, default="open", server_default="open")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    reviewed_at = Column(DateTime(timezone=True), nullable=True)
+    reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    __table_args__ = (
+        # Re-screening queues a subject/name/entry combination once
+        UniqueConstraint(subject_type, subject_id, entry_id, name, name="uq_screening_hits_subject_entry"),
+        # The review queue only ever pages through open hits
+        Index("ix_screening_hits_open", id, postgresql_where=status == "open", sqlite_where=status == "open"),
+    )
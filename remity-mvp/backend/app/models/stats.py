@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, Numeric, String
+from app.db.base_class import Base
+
+class TransactionStatsMixin:
+    status = Column(String(20), primary_key=True)
+    currency_from = Column(String(3), primary_key=True)
+    currency_to = Column(String(3), primary_key=True)
+
+    tx_count = Column(BigInteger, nullable=False, default=0)
+    amount_total = Column(Numeric(18, 2), nullable=False, default=0)
+    fee_total = Column(Numeric(18, 2), nullable=False, default=0)
+
+# Rollups keyed by the UTC bucket of transactions.created_at. They are kept
+# up to date incrementally by the transaction CRUD and periodically rebuilt
+# by app.jobs.reconcile_stats.
+class TransactionStatsDaily(TransactionStatsMixin, Base):
+    __tablename__ = "transaction_stats_daily"
+
+    day = Column(Date, primary_key=True)
+
+class TransactionStatsHourly(TransactionStatsMixin, Base):
+    __tablename__ = "transaction_stats_hourly"
+
+    hour = Column(DateTime(timezone=True), primary_key=True)
@@ -1,14 +1,39 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Numeric, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Numeric, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
+# Status state machine: status -> statuses it may move to. Terminal statuses
+# (completed, failed, cancelled) have no outgoing transitions.
+STATUS_TRANSITIONS = {
+    "pending": frozenset({"in_progress", "failed", "cancelled"}),
+    "in_progress": frozenset({"completed", "failed", "cancelled"}),
+    "completed": frozenset(),
+    "failed": frozenset(),
+    "cancelled": frozenset(),
+}
+STATUSES = tuple(STATUS_TRANSITIONS)
+
+
+def allowed_sources(status: str) -> list:
+    """
+    Statuses from which ``status`` may be set. Re-setting the current status
+    is allowed so other fields can be edited without a transition.
+    """
+    return [status] + [s for s, targets in STATUS_TRANSITIONS.items() if status in targets]
+
+
+# On Postgres the table is range-partitioned by month on created_at (see
+# app.db.partitions), so its primary key there is (id, created_at). Unique
+# indexes cannot cover tracking_number alone on a partitioned table; there
+# a trigger-maintained transaction_tracking_numbers table enforces it
+# instead (migration 0a5c7e3d9b14).
 class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    recipient_id = Column(Integer, ForeignKey("recipients.id"), nullable=False)
+    recipient_id = Column(Integer, ForeignKey("recipients.id"), nullable=False, index=True)
 
     # Transaction details
     amount = Column(Numeric(10, 2), nullable=False)
@@ -19,17 +44,20 @@ class Transaction(Base):
     total_amount = Column(Numeric(10, 2), nullable=False)
 
     # Status and tracking
-    status = Column(String(20), default="pending")  # pending, approved, completed, cancelled
+    status = Column(String(20), default="pending")  # see STATUS_TRANSITIONS
     tracking_number = Column(String(50), unique=True, index=True)
 
     # Payment method
     payment_method = Column(String(50), nullable=False)  # bank_transfer, credit_card, etc.
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Optimistic concurrency: bumped on every update, checked by writers
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Relationships
     user = relationship("User", back_populates="transactions")
     recipient = relationship("Recipient", back_populates="transactions")
@@ -39,3 +67,19 @@ class Transaction(Base):
     source_of_funds = Column(String(100), nullable=True)
     compliance_notes = Column(Text, nullable=True)
     proof_of_payment_url = Column(String(255), nullable=True)
+
+    # Access paths: per-user and admin keyset listing (created_at DESC,
+    # id DESC), admin filters walked in keyset order and trigram search
+    __table_args__ = (
+        Index("ix_transactions_user_id_created_at", user_id, created_at.desc(), id.desc()),
+        Index("ix_transactions_status_created_at", status, created_at.desc(), id.desc()),
+        Index("ix_transactions_corridor_created_at", currency_from, currency_to, created_at.desc(), id.desc()),
+        Index("ix_transactions_created_at", created_at.desc(), id.desc()),
+        Index(
+            "ix_transactions_tracking_number_trgm",
+            tracking_number,
+            postgresql_using="gin",
+            postgresql_ops={"tracking_number": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+    __mapper_args__ = {"version_id_col": version}
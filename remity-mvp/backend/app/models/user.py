@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -37,3 +37,13 @@ class User(Base):
     # Relationships
     transactions = relationship("Transaction", back_populates="user")
     recipients = relationship("Recipient", back_populates="user")
+
+    # Admin console search (ILIKE '%term%') on Postgres
+    __table_args__ = (
+        Index(
+            "ix_users_email_trgm", email, postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_full_name_trgm", full_name, postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
@@ -1,4 +1,10 @@
 from .token import Token, TokenPayload
-from .user import User, UserCreate, UserInDB, UserUpdate
+from .user import User, UserCreate, UserInDB, UserPrincipal, UserUpdate
 from .recipient import Recipient, RecipientCreate, RecipientUpdate
-from .transaction import Transaction, TransactionCreate, TransactionUpdate, TransactionWithRelations
+from .transaction import Transaction, TransactionCreate, TransactionInDBBase, TransactionUpdate, TransactionWithRelations
+from .page import Page
+from .quote import Quote, QuoteBatch, QuoteBatchRequest, QuoteRequest
+from .stats import AdminStats
+from .bulk import BulkCreateRequest, BulkCreateResult, BulkItemResult
+from .ledger import Balance
+from .screening import ScreeningHit, ScreeningReview
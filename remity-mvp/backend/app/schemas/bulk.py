@@ -0,0 +1,17 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from app.core.config import settings
+
+class BulkCreateRequest(BaseModel):
+    # Items are validated one by one so a bad row is reported, not fatal
+    items: List[Dict[str, Any]] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+class Balance(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    # "pending": held for transfers in flight; "sent": delivered
+    account: str
+    currency: str
+    balance: float
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,8 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+ItemType = TypeVar("ItemType")
+
+class Page(BaseModel, Generic[ItemType]):
+    items: List[ItemType]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,32 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+from app.core.config import settings
+
+class QuoteRequest(BaseModel):
+    amount: float = Field(gt=0)
+    currency_from: str = Field(min_length=3, max_length=3)
+    currency_to: str = Field(min_length=3, max_length=3)
+
+    @field_validator("currency_from", "currency_to")
+    @classmethod
+    def upper_currency(cls, v: str) -> str:
+        return v.upper()
+
+class Quote(BaseModel):
+    # None for an unlocked (indicative) quote
+    quote_id: Optional[str] = None
+    amount: float
+    currency_from: str
+    currency_to: str
+    exchange_rate: float
+    fee_amount: float
+    total_amount: float
+    recipient_amount: float
+    expires_at: Optional[datetime] = None
+
+class QuoteBatchRequest(BaseModel):
+    items: List[QuoteRequest] = Field(min_length=1, max_length=settings.FX_QUOTE_BATCH_MAX)
+
+class QuoteBatch(BaseModel):
+    items: List[Quote]
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict
+
+class ScreeningHit(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    # "recipient", "user" or "transaction"
+    subject_type: str
+    subject_id: int
+    name: str
+    list_version: str
+    entry_id: str
+    entry_name: str
+    program: str
+    score: float
+    status: str
+    created_at: Optional[datetime] = None
+    reviewed_at: Optional[datetime] = None
+    reviewed_by: Optional[int] = None
+
+class ScreeningReview(BaseModel):
+    # "cleared": a false positive; "confirmed": a true match
+    status: Literal["cleared", "confirmed"]
@@ -0,0 +1,34 @@
+from typing import List, Optional
+from datetime import date, datetime
+from pydantic import BaseModel
+
+class StatusTotal(BaseModel):
+    status: str
+    count: int
+
+class CorridorVolume(BaseModel):
+    currency_from: str
+    currency_to: str
+    count: int
+    amount: float
+    fees: float
+
+class DailyCount(BaseModel):
+    day: date
+    count: int
+
+class HourlyCount(BaseModel):
+    hour: datetime
+    count: int
+
+class AdminStats(BaseModel):
+    start: date
+    end: date
+    totals_by_status: List[StatusTotal]
+    corridors: List[CorridorVolume]
+    daily: List[DailyCount]
+    # Only with granularity=hour
+    hourly: Optional[List[HourlyCount]] = None
+    # Current counts, not limited to [start, end)
+    users_total: int
+    users_active: int
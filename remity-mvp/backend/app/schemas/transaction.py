@@ -1,6 +1,7 @@
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, AnyUrl, ConfigDict
+from pydantic import BaseModel, AnyUrl, ConfigDict, field_validator, model_validator
+from app.models.transaction import STATUSES
 from .user import User as UserSchema
 from .recipient import Recipient as RecipientSchema
 
@@ -19,7 +20,17 @@ class TransactionBase(BaseModel):
     source_of_funds: Optional[str] = None
 
 class TransactionCreate(TransactionBase):
-    pass
+    # Either consume a server-side quote or supply the pricing explicitly
+    quote_id: Optional[str] = None
+    exchange_rate: Optional[float] = None
+    fee_amount: Optional[float] = None
+    total_amount: Optional[float] = None
+
+    @model_validator(mode="after")
+    def require_pricing(self):
+        if self.quote_id is None and None in (self.exchange_rate, self.fee_amount, self.total_amount):
+            raise ValueError("Provide quote_id or exchange_rate, fee_amount and total_amount")
+        return self
 
 class TransactionUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -27,11 +38,24 @@ class TransactionUpdate(BaseModel):
     status: Optional[str] = None
     compliance_notes: Optional[str] = None
     proof_of_payment_url: Optional[AnyUrl] = None
+    # Version the client last saw; the update is rejected if the row moved on
+    version: Optional[int] = None
+
+    @field_validator("status")
+    @classmethod
+    def known_status(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        v = v.lower()
+        if v not in STATUSES:
+            raise ValueError(f"status must be one of: {', '.join(STATUSES)}")
+        return v
 
 class TransactionInDBBase(TransactionBase):
     id: int
     user_id: int
     status: str
+    version: int = 1
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
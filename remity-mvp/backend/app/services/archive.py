@@ -0,0 +1,96 @@
+"""
+Archival of monthly transactions partitions: each is detached, written to
+``<dir>/<partition>.parquet`` (zstd-compressed columns) and dropped once
+the file has been read back with the same row count. Requires the
+optional pyarrow package.
+"""
+import logging
+import os
+from typing import Any
+from sqlalchemy import DateTime, Integer, Numeric, text
+from sqlalchemy.engine import Connection, Engine
+from app.db import partitions
+from app.models.transaction import Transaction
+from app.services.export import arrow_available
+
+logger = logging.getLogger(__name__)
+
+# Every column, so an archive can be loaded back as it was
+COLUMNS = list(Transaction.__table__.columns)
+
+
+class ArchiveError(RuntimeError):
+    pass
+
+
+def available() -> bool:
+    return arrow_available()
+
+
+def arrow_schema() -> Any:
+    import pyarrow as pa
+
+    def arrow_type(column: Any) -> Any:
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Numeric):
+            return pa.decimal128(column.type.precision, column.type.scale)
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us", tz="UTC")
+        return pa.string()
+
+    return pa.schema([(c.name, arrow_type(c)) for c in COLUMNS])
+
+
+def write_parquet(conn: Connection, table: str, path: str, batch_size: int) -> int:
+    """
+    Stream ``table`` into a Parquet file at ``path`` through a server-side
+    cursor, one row group per batch. The file only appears under its final
+    name once complete. Returns the number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema()
+    result = conn.execution_options(yield_per=batch_size).execute(
+        text(f"SELECT {', '.join(c.name for c in COLUMNS)} FROM {table} ORDER BY id")
+    )
+    rows = 0
+    tmp = f"{path}.tmp"
+    with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+        for batch in result.partitions():
+            columns = list(zip(*batch))
+            writer.write_batch(pa.record_batch(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            rows += len(batch)
+    os.replace(tmp, path)
+    return rows
+
+
+def archive_partition(engine: Engine, partition: partitions.Partition, directory: str, batch_size: int) -> int:
+    """
+    Detach (if still attached), export, verify and drop one partition.
+    Safe to re-run after a failure at any step. Returns the rows archived.
+    """
+    import pyarrow.parquet as pq
+
+    with engine.begin() as conn:
+        if partition in partitions.attached(conn):
+            partitions.detach(conn, partition)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{partition.name}.parquet")
+    with engine.connect() as conn:
+        # Detached, so nothing writes to it any more
+        expected = conn.execute(text(f"SELECT count(*) FROM {partition.name}")).scalar()
+        written = write_parquet(conn, partition.name, path, batch_size)
+        stored = pq.ParquetFile(path).metadata.num_rows
+        if not expected == written == stored:
+            raise ArchiveError(
+                f"{partition.name}: {expected} rows in the table, {written} written, {stored} in {path}"
+            )
+        conn.execute(text(f"DROP TABLE {partition.name}"))
+        conn.commit()
+    logger.info("Archived %s (%d rows) to %s", partition.name, written, path)
+    return written
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
+from sqlalchemy import Select, select
+from app.crud.crud_transaction import created_between
+from app.db.session import AsyncSessionLocal
+from app.models.transaction import Transaction
+
+# Exported columns; only these are selected, never full ORM entities
+EXPORT_COLUMNS = [
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.recipient_id,
+    Transaction.amount,
+    Transaction.currency_from,
+    Transaction.currency_to,
+    Transaction.exchange_rate,
+    Transaction.fee_amount,
+    Transaction.total_amount,
+    Transaction.status,
+    Transaction.tracking_number,
+    Transaction.payment_method,
+    Transaction.created_at,
+    Transaction.updated_at,
+    Transaction.completed_at,
+]
+FIELD_NAMES = [c.key for c in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def export_statement(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[str] = None,
+) -> Select:
+    stmt = select(*EXPORT_COLUMNS).where(*created_between(start, end))
+    if status is not None:
+        stmt = stmt.where(Transaction.status == status)
+    return stmt.order_by(Transaction.id)
+
+
+async def iter_batches(stmt: Select, batch_size: int) -> AsyncIterator[Sequence]:
+    # Uses its own session: the response body is produced after the
+    # endpoint (and its request-scoped session) has returned.
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+
+def _jsonable(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def csv_stream(batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(FIELD_NAMES)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+async def ndjson_stream(batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        lines: List[str] = [
+            json.dumps({k: _jsonable(v) for k, v in zip(FIELD_NAMES, row)}, default=str)
+            for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def arrow_stream(batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    # pyarrow is an optional dependency; callers check arrow_available() first
+    import pyarrow as pa
+
+    money = pa.decimal128(10, 2)
+    ts = pa.timestamp("us", tz="UTC")
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("recipient_id", pa.int64()),
+        ("amount", money),
+        ("currency_from", pa.string()),
+        ("currency_to", pa.string()),
+        ("exchange_rate", pa.decimal128(10, 6)),
+        ("fee_amount", money),
+        ("total_amount", money),
+        ("status", pa.string()),
+        ("tracking_number", pa.string()),
+        ("payment_method", pa.string()),
+        ("created_at", ts),
+        ("updated_at", ts),
+        ("completed_at", ts),
+    ])
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    async for rows in batches:
+        columns = list(zip(*rows))
+        writer.write_batch(pa.record_batch(
+            [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+            schema=schema,
+        ))
+        yield drain()
+    writer.close()
+    yield drain()
@@ -0,0 +1,137 @@
+"""
+FX rates and pricing.
+
+Rates come from a pluggable RateProvider as "units of currency per one unit
+of the pivot currency". RateMatrix keeps the full cross-rate matrix in memory
+and patches only the affected row and column when a rate changes, so pricing
+never has to touch the database.
+"""
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+
+class UnknownCurrency(ValueError):
+    pass
+
+
+class RateProvider:
+    def fetch(self) -> Dict[str, float]:
+        raise NotImplementedError
+
+
+class StaticRateProvider(RateProvider):
+    def __init__(self, rates: Dict[str, float]):
+        self.rates = dict(rates)
+
+    def fetch(self) -> Dict[str, float]:
+        return dict(self.rates)
+
+
+class FileRateProvider(RateProvider):
+    """
+    Reads ``{"base": "USD", "rates": {"EUR": 0.92, ...}}`` from a JSON file.
+    Local stand-in for a market data feed.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self) -> Dict[str, float]:
+        with open(self.path) as fh:
+            data = json.load(fh)
+        rates = {code.upper(): float(rate) for code, rate in data["rates"].items()}
+        rates.setdefault(data.get("base", "USD").upper(), 1.0)
+        return rates
+
+
+class RateMatrix:
+    """
+    cross[i, j] converts one unit of currency i into currency j.
+    """
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.currencies: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.pivot = np.zeros(0)
+        self.cross = np.zeros((0, 0))
+        self.version = 0
+        if rates:
+            self.update(rates)
+
+    def _grow(self, codes: Iterable[str]) -> None:
+        new = [c for c in codes if c not in self.index]
+        if not new:
+            return
+        for code in new:
+            self.index[code] = len(self.currencies)
+            self.currencies.append(code)
+        n = len(self.currencies)
+        pivot = np.full(n, np.nan)
+        pivot[: self.pivot.size] = self.pivot
+        cross = np.full((n, n), np.nan)
+        cross[: self.cross.shape[0], : self.cross.shape[1]] = self.cross
+        self.pivot, self.cross = pivot, cross
+
+    def update(self, rates: Dict[str, float]) -> List[str]:
+        """
+        Apply pivot rates and return the currencies whose rate changed. Each
+        change recomputes one row and one column: O(n) instead of O(n^2).
+        """
+        self._grow(rates)
+        changed = []
+        for code, rate in rates.items():
+            if rate <= 0:
+                raise ValueError(f"Invalid rate for {code}: {rate}")
+            i = self.index[code]
+            if self.pivot[i] == rate:
+                continue
+            self.pivot[i] = rate
+            self.cross[i, :] = self.pivot / rate
+            self.cross[:, i] = rate / self.pivot
+            changed.append(code)
+        if changed:
+            self.version += 1
+        return changed
+
+    def indices(self, codes: Sequence[str]) -> np.ndarray:
+        try:
+            idx = np.fromiter((self.index[c] for c in codes), dtype=np.intp, count=len(codes))
+        except KeyError as exc:
+            raise UnknownCurrency(f"Unsupported currency: {exc.args[0]}") from exc
+        if np.isnan(self.pivot[idx]).any():
+            raise UnknownCurrency("Currency has no rate yet")
+        return idx
+
+    def rate(self, currency_from: str, currency_to: str) -> float:
+        i, j = self.indices([currency_from, currency_to])
+        return float(self.cross[i, j])
+
+
+@dataclass(frozen=True)
+class FeeSchedule:
+    fixed: float
+    percent: float
+    margin: float
+
+
+def price_many(
+    matrix: RateMatrix,
+    fees: FeeSchedule,
+    amounts: np.ndarray,
+    from_idx: np.ndarray,
+    to_idx: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized pricing of many amount/corridor combinations at once.
+    ``amounts`` are in the source currency.
+    """
+    mid = matrix.cross[from_idx, to_idx]
+    same = from_idx == to_idx
+    rate = np.where(same, 1.0, mid * (1.0 - fees.margin))
+    fee = np.round(fees.fixed + amounts * fees.percent, 2)
+    return {
+        "exchange_rate": np.round(rate, 6),
+        "fee_amount": fee,
+        "total_amount": np.round(amounts + fee, 2),
+        "recipient_amount": np.round(amounts * rate, 2),
+    }
@@ -0,0 +1,127 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def fingerprint(method: str, path: str, body: Any) -> str:
+    raw = orjson.dumps([method, path, body], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _live(db: AsyncSession, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    stmt = select(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.expires_at > _now(),
+    )
+    return (await db.scalars(stmt)).one_or_none()
+
+
+async def _claim(db: AsyncSession, user_id: int, key: str, digest: str) -> bool:
+    """
+    Insert the key row, or take over an expired one. A concurrent request
+    holding the same key keeps its row locked until it commits or rolls
+    back, so this waits for it; False means it committed first.
+    """
+    now = _now()
+    insert = _INSERTS[db.get_bind().dialect.name]
+    stmt = insert(IdempotencyKey).values(
+        user_id=user_id,
+        key=key,
+        fingerprint=digest,
+        expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "key"],
+        set_={
+            "fingerprint": stmt.excluded.fingerprint,
+            "expires_at": stmt.excluded.expires_at,
+            "status_code": None,
+            "response_body": None,
+        },
+        where=IdempotencyKey.expires_at <= now,
+    ).returning(IdempotencyKey.key)
+    return (await db.execute(stmt)).first() is not None
+
+
+def _replay(record: IdempotencyKey, digest: str) -> Response:
+    if record.fingerprint != digest:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    if record.response_body is None:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+    return Response(
+        content=record.response_body,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def begin(db: AsyncSession, user_id: int, key: str, digest: str) -> Optional[Response]:
+    """
+    Stored response to replay for a repeated key, or None once the key has
+    been claimed for this request; finish it with ``complete``. A retry of
+    a finished request costs one primary-key lookup.
+    """
+    record = await _live(db, user_id, key)
+    if record is None:
+        if await _claim(db, user_id, key, digest):
+            return None
+        # A concurrent duplicate won the claim and has committed by now
+        record = await _live(db, user_id, key)
+        if record is None:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+    return _replay(record, digest)
+
+
+async def complete(db: AsyncSession, user_id: int, key: str, body: Any, status_code: int = 200) -> Response:
+    """
+    Store the response for a claimed key and commit it together with the
+    request's own writes.
+    """
+    content = orjson.dumps(body)
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .values(status_code=status_code, response_body=content.decode())
+    )
+    await db.commit()
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+
+def purge_expired(db: Session, batch_size: int = 10000) -> int:
+    """
+    Delete expired keys in batches of ``batch_size``, committing after
+    each. Returns the number of rows removed.
+    """
+    removed = 0
+    while True:
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= _now())
+            .limit(batch_size)
+        )
+        result = db.execute(
+            delete(IdempotencyKey).where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired))
+        )
+        db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            return removed
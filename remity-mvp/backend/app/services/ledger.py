@@ -0,0 +1,239 @@
+"""
+Double-entry ledger behind transactions. A transaction's total_amount (in
+currency_from) sits in one account at a time and moves as its status
+changes:
+
+    created                  house clearing -> user pending
+    completed                user pending   -> user sent
+    failed / cancelled       user pending   -> house clearing (refund)
+
+Each move is one posting of two entries that sum to zero. The transaction
+CRUD writes postings and the user balances they change in the same DB
+transaction as the change itself; app.jobs.reconcile_ledger checks the
+balances against the entries.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import case, func, insert, literal, null, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.ledger import LedgerBalance, LedgerEntry
+from app.models.transaction import Transaction
+
+PENDING = "pending"
+SENT = "sent"
+CLEARING = "clearing"
+
+# Status -> user account holding the transaction's total; None: the house
+ACCOUNTS: Dict[str, Optional[str]] = {
+    "pending": PENDING,
+    "in_progress": PENDING,
+    "completed": SENT,
+    "failed": None,
+    "cancelled": None,
+}
+
+# (user_id, account, currency)
+AccountKey = Tuple[int, str, str]
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _move(tx: Any, event: str, source: Optional[str], target: Optional[str]) -> List[Dict[str, Any]]:
+    if source == target:
+        return []
+    total = Decimal(str(tx.total_amount))
+    return [
+        {
+            "transaction_id": tx.id,
+            "event": event,
+            "user_id": tx.user_id if account else None,
+            "account": account or CLEARING,
+            "currency": tx.currency_from,
+            "amount": sign * total,
+        }
+        for account, sign in ((source, -1), (target, 1))
+    ]
+
+
+def created_entries(txs: Iterable[Transaction]) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    for tx in txs:
+        entries += _move(tx, "created", None, ACCOUNTS[tx.status or "pending"])
+    return entries
+
+
+def status_change_entries(tx: Transaction, old_status: str, new_status: str) -> List[Dict[str, Any]]:
+    return _move(tx, new_status, ACCOUNTS[old_status or "pending"], ACCOUNTS[new_status])
+
+
+def post_statements(dialect: str, entries: List[Dict[str, Any]]) -> List[Any]:
+    """
+    One multi-row INSERT of the entries and one INSERT ... ON CONFLICT DO
+    UPDATE adding them onto the user balances. The upsert row-locks each
+    balance until commit; rows go in key order so concurrent postings lock
+    them in the same order.
+    """
+    if not entries:
+        return []
+    deltas: Dict[AccountKey, Decimal] = defaultdict(Decimal)
+    for entry in entries:
+        if entry["user_id"] is not None:
+            deltas[(entry["user_id"], entry["account"], entry["currency"])] += entry["amount"]
+    statements = [insert(LedgerEntry).values(entries)]
+    if deltas:
+        stmt = _INSERTS[dialect](LedgerBalance).values([
+            {"user_id": key[0], "account": key[1], "currency": key[2], "balance": amount}
+            for key, amount in sorted(deltas.items())
+        ])
+        statements.append(stmt.on_conflict_do_update(
+            index_elements=["user_id", "account", "currency"],
+            set_={"balance": LedgerBalance.balance + stmt.excluded.balance, "updated_at": func.now()},
+        ))
+    return statements
+
+
+async def post(db: AsyncSession, entries: List[Dict[str, Any]]) -> None:
+    for stmt in post_statements(db.get_bind().dialect.name, entries):
+        await db.execute(stmt)
+
+
+async def balances(db: AsyncSession, user_id: int) -> List[LedgerBalance]:
+    result = await db.execute(
+        select(LedgerBalance)
+        .where(LedgerBalance.user_id == user_id)
+        .order_by(LedgerBalance.currency, LedgerBalance.account)
+    )
+    return list(result.scalars().all())
+
+
+def open_transactions(db: Session, first_id: int) -> int:
+    """
+    Post the current state of transactions with ``id >= first_id`` as one
+    "opening" posting each, for rows loaded without going through the CRUD
+    (app.jobs.generate_data). Returns the number of entries written.
+    """
+    status = func.coalesce(Transaction.status, "pending")
+    held = [Transaction.id >= first_id, status.notin_([s for s, a in ACCOUNTS.items() if a is None])]
+    user_side = select(
+        Transaction.id, literal("opening"), Transaction.user_id,
+        case((status == "completed", SENT), else_=PENDING), Transaction.currency_from, Transaction.total_amount,
+    ).where(*held)
+    house_side = select(
+        Transaction.id, literal("opening"), null(), literal(CLEARING), Transaction.currency_from,
+        -Transaction.total_amount,
+    ).where(*held)
+    columns = ["transaction_id", "event", "user_id", "account", "currency", "amount"]
+    written = db.execute(insert(LedgerEntry).from_select(columns, union_all(user_side, house_side))).rowcount
+    opened = select(
+        LedgerEntry.user_id, LedgerEntry.account, LedgerEntry.currency, func.sum(LedgerEntry.amount),
+    ).where(
+        LedgerEntry.event == "opening", LedgerEntry.transaction_id >= first_id, LedgerEntry.user_id.is_not(None),
+    ).group_by(LedgerEntry.user_id, LedgerEntry.account, LedgerEntry.currency)
+    stmt = _INSERTS[db.get_bind().dialect.name](LedgerBalance).from_select(
+        ["user_id", "account", "currency", "balance"], opened
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id", "account", "currency"],
+        set_={"balance": LedgerBalance.balance + stmt.excluded.balance, "updated_at": func.now()},
+    ))
+    db.commit()
+    return written
+
+
+class Mismatch(NamedTuple):
+    key: AccountKey
+    balance: Decimal  # stored in ledger_balances
+    ledger: Decimal  # sum of the account's entries
+
+
+class Reconciliation(NamedTuple):
+    accounts: int
+    mismatches: List[Mismatch]
+    # (transaction_id, event, currency, sum) of postings that do not sum to zero
+    unbalanced: List[Tuple[int, str, str, Decimal]]
+
+
+def _merge(ledger: Iterator[Any], stored: Iterator[Any]) -> Iterator[Tuple[AccountKey, Decimal, Decimal]]:
+    # Both sides come sorted by account key (ids and ASCII codes, so the
+    # database's order is Python's); yields (key, ledger, stored)
+    zero = Decimal("0")
+    a, b = next(ledger, None), next(stored, None)
+    while a is not None or b is not None:
+        key_a = tuple(a[:3]) if a is not None else None
+        key_b = tuple(b[:3]) if b is not None else None
+        if key_b is None or (key_a is not None and key_a < key_b):
+            yield key_a, a[3], zero
+            a = next(ledger, None)
+        elif key_a is None or key_b < key_a:
+            yield key_b, zero, b[3]
+            b = next(stored, None)
+        else:
+            yield key_a, a[3], b[3]
+            a, b = next(ledger, None), next(stored, None)
+
+
+def reconcile(db: Session, batch_size: int = 10000, limit: int = 100) -> Reconciliation:
+    """
+    Check every user balance against the sum of its entries, and every
+    posting for summing to zero. Both sides are streamed in account order
+    ``batch_size`` rows at a time from one snapshot (REPEATABLE READ on
+    Postgres), so memory stays flat however many accounts there are. At
+    most ``limit`` problems of each kind are returned. The snapshot lasts
+    until the caller ends the transaction.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    key = (LedgerEntry.user_id, LedgerEntry.account, LedgerEntry.currency)
+    ledger = db.execute(
+        select(*key, func.sum(LedgerEntry.amount))
+        .where(LedgerEntry.user_id.is_not(None))
+        .group_by(*key)
+        .order_by(*key)
+        .execution_options(yield_per=batch_size)
+    )
+    stored = db.execute(
+        select(LedgerBalance.user_id, LedgerBalance.account, LedgerBalance.currency, LedgerBalance.balance)
+        .order_by(LedgerBalance.user_id, LedgerBalance.account, LedgerBalance.currency)
+        .execution_options(yield_per=batch_size)
+    )
+    accounts = 0
+    mismatches: List[Mismatch] = []
+    for account, summed, balance in _merge(iter(ledger), iter(stored)):
+        accounts += 1
+        if summed != balance and len(mismatches) < limit:
+            mismatches.append(Mismatch(account, Decimal(balance), Decimal(summed)))
+    posting = (LedgerEntry.transaction_id, LedgerEntry.event, LedgerEntry.currency)
+    unbalanced = db.execute(
+        select(*posting, func.sum(LedgerEntry.amount))
+        .group_by(*posting)
+        .having(func.sum(LedgerEntry.amount) != 0)
+        .limit(limit)
+    ).all()
+    return Reconciliation(accounts, mismatches, [tuple(row) for row in unbalanced])
+
+
+def repair(db: Session, key: AccountKey) -> Decimal:
+    """
+    Reset one balance to the sum of its entries. The balance row is locked
+    first, so postings to the account wait and then apply on top of the
+    corrected value. Returns the new balance.
+    """
+    user_id, account, currency = key
+    db.execute(_INSERTS[db.get_bind().dialect.name](LedgerBalance).values(
+        user_id=user_id, account=account, currency=currency, balance=0
+    ).on_conflict_do_nothing())
+    row = db.execute(
+        select(LedgerBalance).where(
+            LedgerBalance.user_id == user_id, LedgerBalance.account == account, LedgerBalance.currency == currency
+        ).with_for_update()
+    ).scalar_one()
+    row.balance = db.execute(
+        select(func.coalesce(func.sum(LedgerEntry.amount), 0)).where(
+            LedgerEntry.user_id == user_id, LedgerEntry.account == account, LedgerEntry.currency == currency
+        )
+    ).scalar_one()
+    db.commit()
+    return row.balance
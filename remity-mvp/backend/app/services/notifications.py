@@ -0,0 +1,141 @@
+"""
+Outbox handlers for transaction side effects: status-change emails to the
+sender and a receipt file once a transfer completes. The API only
+enqueues STATUS_CHANGED events; app.jobs.outbox_worker runs the handlers.
+"""
+import json
+import os
+import smtplib
+from email.message import EmailMessage
+from typing import Any, Dict
+from urllib.parse import unquote, urlparse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+from app.models.user import User
+from app.services import outbox
+
+STATUS_CHANGED = "transaction.status_changed"
+
+SUBJECTS = {
+    "in_progress": "Your transfer {tracking} is on its way",
+    "completed": "Your transfer {tracking} has been delivered",
+    "failed": "Your transfer {tracking} could not be completed",
+    "cancelled": "Your transfer {tracking} was cancelled",
+}
+
+
+class Mailer:
+    def send(self, message: EmailMessage) -> None:
+        raise NotImplementedError
+
+
+class FileMailer(Mailer):
+    """
+    Writes each message to ``<dir>/<Message-ID>.eml``; a stand-in for SMTP
+    in development and tests. Re-sending the same message overwrites it.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def send(self, message: EmailMessage) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        name = message["Message-ID"].strip("<>").replace("/", "_")
+        with open(os.path.join(self.directory, f"{name}.eml"), "wb") as f:
+            f.write(bytes(message))
+
+
+class SMTPMailer(Mailer):
+    def __init__(self, host: str, port: int, username: str = "", password: str = "", starttls: bool = False):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+
+    def send(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+
+def create_mailer(url: str) -> Mailer:
+    parsed = urlparse(url)
+    if parsed.scheme in ("smtp", "smtp+starttls"):
+        return SMTPMailer(
+            parsed.hostname or "localhost",
+            parsed.port or 25,
+            unquote(parsed.username or ""),
+            unquote(parsed.password or ""),
+            starttls=parsed.scheme == "smtp+starttls",
+        )
+    if parsed.scheme == "file":
+        return FileMailer(parsed.path)
+    raise ValueError(f"Unsupported MAIL_URL: {url}")
+
+
+mailer = create_mailer(settings.MAIL_URL)
+
+
+def transaction_payload(tx: Any, old_status: str, new_status: str) -> Dict[str, Any]:
+    """
+    Event payload for a status change; carries what the handlers need so
+    they do not have to reload the transaction.
+    """
+    return {
+        "transaction_id": tx.id,
+        "user_id": tx.user_id,
+        "old_status": old_status,
+        "new_status": new_status,
+        "amount": str(tx.amount),
+        "currency_from": tx.currency_from,
+        "currency_to": tx.currency_to,
+        "exchange_rate": str(tx.exchange_rate),
+        "fee_amount": str(tx.fee_amount),
+        "total_amount": str(tx.total_amount),
+        "tracking_number": tx.tracking_number,
+        "version": tx.version,
+    }
+
+
+@outbox.handler(STATUS_CHANGED)
+def email_status_change(db: Session, event: OutboxEvent) -> None:
+    data = event.payload
+    subject = SUBJECTS.get(data["new_status"])
+    if subject is None:
+        return
+    user = db.execute(select(User.email, User.full_name).where(User.id == data["user_id"])).one_or_none()
+    if user is None:
+        return
+    tracking = data.get("tracking_number") or f"#{data['transaction_id']}"
+    message = EmailMessage()
+    # Stable per event, so a retried send is recognisable as the same message
+    message["Message-ID"] = f"<outbox-{event.id}@remity.io>"
+    message["From"] = settings.MAIL_FROM
+    message["To"] = user.email
+    message["Subject"] = subject.format(tracking=tracking)
+    message.set_content(
+        f"Hi {user.full_name or user.email},\n\n"
+        f"Your transfer of {data['amount']} {data['currency_from']} to {data['currency_to']} "
+        f"({tracking}) is now {data['new_status'].replace('_', ' ')}.\n\n"
+        "The Remity team\n"
+    )
+    mailer.send(message)
+
+
+@outbox.handler(STATUS_CHANGED)
+def write_receipt(db: Session, event: OutboxEvent) -> None:
+    data = event.payload
+    if data["new_status"] != "completed":
+        return
+    os.makedirs(settings.RECEIPTS_DIR, exist_ok=True)
+    path = os.path.join(settings.RECEIPTS_DIR, f"transaction-{data['transaction_id']}.json")
+    receipt = {**data, "completed_event_id": event.id, "issued_at": event.created_at}
+    # Write-then-rename: a retry replaces the file, never leaves half of one
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(receipt, f, indent=2, default=str)
+    os.replace(f"{path}.tmp", path)
@@ -0,0 +1,134 @@
+import logging
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core import metrics
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger("app.outbox")
+
+# topic -> handlers, run in registration order. Delivery is at-least-once:
+# a failed event is retried with all of its handlers, so they must tolerate
+# running again.
+Handler = Callable[[Session, OutboxEvent], None]
+handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+
+def handler(topic: str) -> Callable[[Handler], Handler]:
+    def register(fn: Handler) -> Handler:
+        handlers[topic].append(fn)
+        return fn
+    return register
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _row(topic: str, payload: Dict[str, Any], aggregate_id: Optional[int]) -> Dict[str, Any]:
+    return {"topic": topic, "payload": payload, "aggregate_id": aggregate_id, "available_at": _now()}
+
+
+async def enqueue(db: AsyncSession, topic: str, payload: Dict[str, Any], aggregate_id: Optional[int] = None) -> None:
+    """
+    Record an event in the caller's transaction; it becomes visible to the
+    worker only if that transaction commits.
+    """
+    await db.execute(insert(OutboxEvent).values(**_row(topic, payload, aggregate_id)))
+
+
+def backoff(attempts: int) -> float:
+    # Exponential with full jitter, capped
+    ceiling = min(settings.OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.OUTBOX_BACKOFF_MAX_SECONDS)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def _dispatch(db: Session, event: OutboxEvent) -> str:
+    registered = handlers.get(event.topic)
+    if not registered:
+        logger.warning("No handler for outbox topic %s (event %s)", event.topic, event.id)
+    started = time.perf_counter()
+    try:
+        # A savepoint, so a handler's failed SQL cannot abort the batch
+        with db.begin_nested():
+            for fn in registered or ():
+                fn(db, event)
+    except Exception as exc:
+        event.attempts += 1
+        event.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+        if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            event.status = "dead"
+            logger.exception("Outbox event %s (%s) failed for good", event.id, event.topic)
+            return "dead"
+        event.available_at = _now() + timedelta(seconds=backoff(event.attempts))
+        logger.warning("Outbox event %s (%s) failed, attempt %d: %s", event.id, event.topic, event.attempts, exc)
+        return "retry"
+    finally:
+        metrics.outbox_dispatch_duration.observe(time.perf_counter() - started, event.topic)
+    event.status = "done"
+    event.processed_at = _now()
+    if event.created_at is not None:
+        metrics.outbox_event_lag.observe((event.processed_at - _aware(event.created_at)).total_seconds(), event.topic)
+    return "done"
+
+
+def process_batch(db: Session, batch_size: int) -> int:
+    """
+    Claim up to ``batch_size`` due events, run their handlers and record
+    the outcome, all in one transaction. SKIP LOCKED lets several workers
+    share the queue without handing the same event to two of them.
+    Returns the number of events claimed.
+    """
+    stmt = (
+        select(OutboxEvent)
+        .where(OutboxEvent.status == "pending", OutboxEvent.available_at <= _now())
+        .order_by(OutboxEvent.available_at, OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    events = list(db.scalars(stmt).all())
+    for event in events:
+        metrics.outbox_events_processed.inc(event.topic, _dispatch(db, event))
+    db.commit()
+    return len(events)
+
+
+def purge_processed(db: Session, older_than: timedelta, batch_size: int = 10000) -> int:
+    cutoff = _now() - older_than
+    ids = (
+        select(OutboxEvent.id)
+        .where(OutboxEvent.status == "done", OutboxEvent.processed_at < cutoff)
+        .limit(batch_size)
+    )
+    result = db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+    db.commit()
+    return result.rowcount
+
+
+async def backlog(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Event counts per status and the age of the oldest pending event, i.e.
+    how far the worker is behind.
+    """
+    rows = (await db.execute(
+        select(OutboxEvent.status, func.count(), func.min(OutboxEvent.created_at)).group_by(OutboxEvent.status)
+    )).all()
+    counts = {status: count for status, count, _ in rows}
+    oldest = next((oldest for status, _, oldest in rows if status == "pending"), None)
+    return {
+        "pending": counts.get("pending", 0),
+        "done": counts.get("done", 0),
+        "dead": counts.get("dead", 0),
+        "lag_seconds": (_now() - _aware(oldest)).total_seconds() if oldest else 0.0,
+    }
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import logging
+import math
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+from app.services.fx import FeeSchedule, FileRateProvider, RateMatrix, RateProvider, price_many
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteEngine:
+    """
+    Prices transfers from the in-memory rate matrix and locks each quote
+    under an expiring id that create_transaction can consume exactly once.
+    Unlocked quotes (lock=False) are priced the same way but get no id and
+    take no slot in the store.
+    """
+    prefix = "quote:"
+
+    def __init__(self, provider: RateProvider, store: CacheBackend, fees: FeeSchedule, ttl: int):
+        self.provider = provider
+        self.store = store
+        self.fees = fees
+        self.ttl = ttl
+        self.matrix = RateMatrix()
+
+    def refresh(self) -> List[str]:
+        return self.matrix.update(self.provider.fetch())
+
+    async def run_refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                rates = await asyncio.to_thread(self.provider.fetch)
+                self.matrix.update(rates)
+            except Exception:
+                logger.exception("FX rate refresh failed; keeping previous rates")
+
+    async def quote_many(self, items: Sequence[Dict[str, Any]], lock: bool = True) -> List[Dict[str, Any]]:
+        amounts = np.fromiter((float(i["amount"]) for i in items), dtype=float, count=len(items))
+        from_idx = self.matrix.indices([i["currency_from"] for i in items])
+        to_idx = self.matrix.indices([i["currency_to"] for i in items])
+        priced = price_many(self.matrix, self.fees, amounts, from_idx, to_idx)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        quotes = []
+        for n, item in enumerate(items):
+            quote = {
+                "quote_id": uuid.uuid4().hex if lock else None,
+                "amount": float(amounts[n]),
+                "currency_from": item["currency_from"],
+                "currency_to": item["currency_to"],
+                "exchange_rate": float(priced["exchange_rate"][n]),
+                "fee_amount": float(priced["fee_amount"][n]),
+                "total_amount": float(priced["total_amount"][n]),
+                "recipient_amount": float(priced["recipient_amount"][n]),
+                "expires_at": expires_at.isoformat() if lock else None,
+            }
+            quotes.append(quote)
+        if lock:
+            await self.store.set_many({self.prefix + q["quote_id"]: json.dumps(q) for q in quotes}, self.ttl)
+        return quotes
+
+    async def quote(self, amount: float, currency_from: str, currency_to: str, lock: bool = True) -> Dict[str, Any]:
+        items = [{"amount": amount, "currency_from": currency_from, "currency_to": currency_to}]
+        return (await self.quote_many(items, lock=lock))[0]
+
+    async def peek(self, quote_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.store.get(self.prefix + quote_id)
+        return json.loads(raw) if raw is not None else None
+
+    async def consume(self, quote_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.store.pop(self.prefix + quote_id)
+        return json.loads(raw) if raw is not None else None
+
+    async def release(self, quotes: Sequence[Dict[str, Any]]) -> None:
+        """
+        Put consumed quotes back for the rest of their lifetime, for a batch
+        that was rejected after consuming them.
+        """
+        now = datetime.now(timezone.utc)
+        for quote in quotes:
+            remaining = math.ceil((datetime.fromisoformat(quote["expires_at"]) - now).total_seconds())
+            if remaining > 0:
+                await self.store.set(self.prefix + quote["quote_id"], json.dumps(quote), remaining)
+
+
+quote_engine = QuoteEngine(
+    provider=FileRateProvider(settings.FX_RATES_FILE),
+    store=create_cache_backend(settings.FX_QUOTE_STORE_URL, settings.FX_QUOTE_STORE_MAX_ENTRIES),
+    fees=FeeSchedule(
+        fixed=settings.FX_FEE_FIXED,
+        percent=settings.FX_FEE_PERCENT,
+        margin=settings.FX_MARGIN,
+    ),
+    ttl=settings.FX_QUOTE_TTL_SECONDS,
+)
@@ -0,0 +1,306 @@
+"""
+Sanctions / watchlist screening.
+
+The watchlist (SCREENING_WATCHLIST_FILE, a local stand-in for OFAC-style
+lists) is loaded into an in-memory index of every listed name and alias:
+
+- an inverted index of padded character trigrams per token, scored with
+  the Dice coefficient, which catches misspellings and transliterations
+  ("Drazhenko" / "Drajenko") whatever the token order;
+- an inverted index of Soundex codes per token, which catches names that
+  sound alike but share few trigrams ("Mohammed" / "Muhamad").
+
+Candidates are looked up with prefix filtering: a name can only reach the
+threshold if it shares one of the query's rarest grams, so only those
+postings are scanned and a name is screened in well under a millisecond
+whatever the size of the list.
+
+Screening never blocks the request: names scoring at or above
+SCREENING_THRESHOLD are written to screening_hits for a compliance
+officer to clear or confirm (GET /admin/screening/hits).
+app.jobs.rescreen rescans every recipient and user when the list changes.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core import metrics
+from app.core.config import settings
+from app.models.screening import ScreeningHit
+
+# Phonetic matches are capped below an exact spelling match, and only count
+# for names that also share some spelling: Soundex alone collides on many
+# short names ("Tracy Sally" / "Tarek Saleh")
+PHONETIC_WEIGHT = 0.9
+PHONETIC_MIN_DICE = 0.45
+
+logger = logging.getLogger(__name__)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_SPLIT = re.compile(r"[^a-z0-9]+")
+_SOUNDEX = {c: d for d, letters in {
+    "1": "bfpv", "2": "cgjkqsxz", "3": "dt", "4": "l", "5": "mn", "6": "r",
+}.items() for c in letters}
+
+
+class Entry(NamedTuple):
+    id: str
+    name: str
+    program: str
+    country: Optional[str]
+
+
+class Match(NamedTuple):
+    entry: Entry
+    # The listed name or alias that matched
+    matched: str
+    score: float
+
+
+def tokens(name: str) -> List[str]:
+    """
+    Lowercase ASCII tokens: accents are stripped and anything that is not a
+    letter or digit separates tokens.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_only = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return [t for t in _SPLIT.split(ascii_only.lower()) if t]
+
+
+def trigrams(words: Sequence[str]) -> FrozenSet[str]:
+    # Padded like pg_trgm: two spaces before each token, one after
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def soundex(word: str) -> str:
+    head = word[0]
+    digits = []
+    last = _SOUNDEX.get(head, "")
+    for c in word[1:]:
+        digit = _SOUNDEX.get(c, "")
+        if digit and digit != last:
+            digits.append(digit)
+        # h and w do not separate letters with the same code; vowels do
+        if c not in "hw":
+            last = digit
+    return (head + "".join(digits) + "000")[:4]
+
+
+def _candidates(postings: Dict[str, List[int]], keys: FrozenSet[str], needed: int) -> Iterable[int]:
+    """
+    Names sharing at least ``needed`` of ``keys`` must share one of the
+    ``len(keys) - needed + 1`` rarest; only their postings are scanned.
+    """
+    if needed > len(keys):
+        return ()
+    rarest = sorted(keys, key=lambda k: len(postings.get(k, ())))[: len(keys) - needed + 1]
+    seen = set()
+    for key in rarest:
+        seen.update(postings.get(key, ()))
+    return seen
+
+
+class WatchlistIndex:
+    def __init__(self, entries: Sequence[Dict[str, Any]], version: str):
+        self.version = version
+        self.entries: List[Entry] = []
+        # One row per listed name: (entry index, name, trigrams, Soundex codes)
+        self.names: List[Tuple[int, str, FrozenSet[str], FrozenSet[str]]] = []
+        self.grams: Dict[str, List[int]] = defaultdict(list)
+        self.codes: Dict[str, List[int]] = defaultdict(list)
+        for raw in entries:
+            self.entries.append(Entry(str(raw["id"]), raw["name"], raw.get("program", ""), raw.get("country")))
+            for name in [raw["name"], *raw.get("aliases", ())]:
+                words = tokens(name)
+                if not words:
+                    continue
+                n = len(self.names)
+                self.names.append((len(self.entries) - 1, name, trigrams(words), frozenset(map(soundex, words))))
+                for gram in self.names[n][2]:
+                    self.grams[gram].append(n)
+                for code in self.names[n][3]:
+                    self.codes[code].append(n)
+
+    @classmethod
+    def from_file(cls, path: str) -> "WatchlistIndex":
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        return cls(json.loads(raw)["entries"], hashlib.sha256(raw).hexdigest()[:16])
+
+    def screen(self, name: str, threshold: float) -> List[Match]:
+        """
+        Entries with a name scoring at least ``threshold`` (0..1) against
+        ``name``, best first. A name's score is the higher of its trigram
+        Dice coefficient and PHONETIC_WEIGHT x the share of tokens with the
+        same Soundex code (given a Dice of PHONETIC_MIN_DICE); an entry
+        scores as its best name.
+        """
+        words = tokens(name)
+        if not words:
+            return []
+        grams = trigrams(words)
+        codes = frozenset(map(soundex, words))
+        # Dice >= t needs an overlap of at least t|A| / (2 - t)
+        needed = max(1, math.ceil(threshold * len(grams) / (2 - threshold)))
+        candidates = set(_candidates(self.grams, grams, needed))
+        phonetic = threshold / PHONETIC_WEIGHT
+        if phonetic <= 1:
+            candidates.update(_candidates(self.codes, codes, max(1, math.ceil(phonetic * len(codes)))))
+        best: Dict[int, Match] = {}
+        for n in candidates:
+            entry, listed, listed_grams, listed_codes = self.names[n]
+            dice = 2 * len(grams & listed_grams) / (len(grams) + len(listed_grams))
+            sounds = 0.0
+            if dice >= PHONETIC_MIN_DICE:
+                sounds = PHONETIC_WEIGHT * len(codes & listed_codes) / max(len(codes), len(listed_codes))
+            score = round(max(dice, sounds), 4)
+            if score >= threshold and (entry not in best or score > best[entry].score):
+                best[entry] = Match(self.entries[entry], listed, score)
+        return sorted(best.values(), key=lambda m: (-m.score, m.entry.id))
+
+
+class Screener:
+    """
+    The process-wide index, rebuilt when the watchlist file changes. The
+    file's mtime is checked at most every ``reload_seconds``; callers
+    holding the old index keep using it while a new one is built.
+    Request handlers use current(), which builds off the event loop;
+    ``index`` builds inline, for sync callers.
+    """
+    def __init__(self, path: str, threshold: float, reload_seconds: float):
+        self.path = path
+        self.threshold = threshold
+        self.reload_seconds = reload_seconds
+        self._index: Optional[WatchlistIndex] = None
+        self._mtime = 0.0
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._reloading: Optional[asyncio.Task] = None
+
+    async def current(self) -> WatchlistIndex:
+        """
+        The index, checking for a changed watchlist at most every
+        ``reload_seconds``. A rebuild runs in a worker thread in the
+        background and the old index keeps serving until it is swapped in;
+        only the very first load is waited for.
+        """
+        due = time.monotonic() - self._checked >= self.reload_seconds
+        if self._reloading is None and (self._index is None or due):
+            self._reloading = asyncio.create_task(self._reload())
+        if self._index is None:
+            await asyncio.shield(self._reloading)
+        return self._index
+
+    async def _reload(self) -> None:
+        try:
+            self._checked = time.monotonic()
+            mtime = (await asyncio.to_thread(os.stat, self.path)).st_mtime
+            if self._index is None or mtime != self._mtime:
+                index = await asyncio.to_thread(WatchlistIndex.from_file, self.path)
+                self._index, self._mtime = index, mtime
+        except Exception:
+            if self._index is None:
+                raise
+            logger.exception("Watchlist reload failed; keeping list %s", self._index.version)
+        finally:
+            self._reloading = None
+
+    @property
+    def index(self) -> WatchlistIndex:
+        now = time.monotonic()
+        if self._index is None or now - self._checked >= self.reload_seconds:
+            with self._lock:
+                if self._index is None or now - self._checked >= self.reload_seconds:
+                    mtime = os.stat(self.path).st_mtime
+                    if self._index is None or mtime != self._mtime:
+                        self._index, self._mtime = WatchlistIndex.from_file(self.path), mtime
+                    self._checked = now
+        return self._index
+
+    def hits(self, subject_type: str, subjects: Iterable[Tuple[int, Optional[str]]]) -> List[Dict[str, Any]]:
+        """
+        Screen ``(subject_id, name)`` pairs and return the screening_hits
+        rows for every match. Repeated names are scored once.
+        """
+        return hit_rows(self.index, subject_type, subjects, self.threshold)
+
+
+def hit_rows(
+    index: WatchlistIndex, subject_type: str, subjects: Iterable[Tuple[int, Optional[str]]], threshold: float
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    scored: Dict[str, List[Match]] = {}
+    for subject_id, name in subjects:
+        if not name:
+            continue
+        if name not in scored:
+            started = time.perf_counter()
+            scored[name] = index.screen(name, threshold)
+            metrics.screening_duration.observe(time.perf_counter() - started)
+        for match in scored[name]:
+            rows.append({
+                "subject_type": subject_type,
+                "subject_id": subject_id,
+                "name": name,
+                "list_version": index.version,
+                "entry_id": match.entry.id,
+                "entry_name": match.matched,
+                "program": match.entry.program,
+                "score": match.score,
+            })
+    return rows
+
+
+def insert_statement(dialect: str, rows: List[Dict[str, Any]]) -> Any:
+    """
+    Multi-row INSERT of hits. A subject already queued for the same entry
+    under the same name is left as it is, including a reviewer's decision,
+    so re-screening does not reopen cleared hits.
+    """
+    return _INSERTS[dialect](ScreeningHit).values(rows).on_conflict_do_nothing(
+        index_elements=["subject_type", "subject_id", "entry_id", "name"]
+    )
+
+
+async def record(
+    db: AsyncSession, subject_type: str, subjects: Iterable[Tuple[int, Optional[str]]]
+) -> List[Dict[str, Any]]:
+    """
+    Screen ``(subject_id, name)`` pairs and queue any hits in the caller's
+    transaction. Costs no query unless something matched.
+    """
+    rows = hit_rows(await screener.current(), subject_type, subjects, screener.threshold)
+    if rows:
+        await db.execute(insert_statement(db.get_bind().dialect.name, rows))
+        metrics.screening_hits.inc(subject_type, amount=len(rows))
+    return rows
+
+
+def record_sync(db: Session, subject_type: str, subjects: Iterable[Tuple[int, Optional[str]]]) -> List[Dict[str, Any]]:
+    rows = screener.hits(subject_type, subjects)
+    if rows:
+        db.execute(insert_statement(db.get_bind().dialect.name, rows))
+        metrics.screening_hits.inc(subject_type, amount=len(rows))
+    return rows
+
+
+screener = Screener(
+    settings.SCREENING_WATCHLIST_FILE,
+    threshold=settings.SCREENING_THRESHOLD,
+    reload_seconds=settings.SCREENING_RELOAD_SECONDS,
+)
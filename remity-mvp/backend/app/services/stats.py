@@ -0,0 +1,197 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from sqlalchemy import and_, delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.stats import TransactionStatsDaily, TransactionStatsHourly
+from app.models.transaction import Transaction
+from app.models.user import User
+
+# (hour bucket, status, currency_from, currency_to) -> [count, amount, fee]
+Deltas = Dict[Tuple[datetime, str, str, str], List[Any]]
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def hour_bucket(created_at: Optional[datetime]) -> datetime:
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    elif created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    else:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.replace(minute=0, second=0, microsecond=0)
+
+
+def add_delta(deltas: Deltas, tx: Any, status: str, sign: int) -> None:
+    key = (hour_bucket(tx.created_at), status, tx.currency_from, tx.currency_to)
+    entry = deltas.setdefault(key, [0, Decimal("0"), Decimal("0")])
+    entry[0] += sign
+    entry[1] += sign * Decimal(str(tx.amount))
+    entry[2] += sign * Decimal(str(tx.fee_amount))
+
+
+def created_deltas(txs: Iterable[Transaction]) -> Deltas:
+    deltas: Deltas = {}
+    for tx in txs:
+        add_delta(deltas, tx, tx.status or "pending", 1)
+    return deltas
+
+
+def status_change_deltas(tx: Transaction, old_status: str, new_status: str) -> Deltas:
+    deltas: Deltas = {}
+    add_delta(deltas, tx, old_status or "pending", -1)
+    add_delta(deltas, tx, new_status, 1)
+    return deltas
+
+
+def upsert_statements(dialect: str, deltas: Deltas) -> List[Any]:
+    """
+    One multi-row INSERT ... ON CONFLICT DO UPDATE per rollup table that adds
+    the deltas onto the existing buckets.
+    """
+    if not deltas:
+        return []
+    insert = _INSERTS[dialect]
+    daily: Dict[Tuple[date, str, str, str], List[Any]] = defaultdict(lambda: [0, Decimal("0"), Decimal("0")])
+    for (hour, status, cur_from, cur_to), values in deltas.items():
+        bucket = daily[(hour.date(), status, cur_from, cur_to)]
+        for n, value in enumerate(values):
+            bucket[n] += value
+    statements = []
+    for model, bucket_col, rows in (
+        (TransactionStatsHourly, "hour", deltas),
+        (TransactionStatsDaily, "day", daily),
+    ):
+        stmt = insert(model).values([
+            {
+                bucket_col: key[0],
+                "status": key[1],
+                "currency_from": key[2],
+                "currency_to": key[3],
+                "tx_count": values[0],
+                "amount_total": values[1],
+                "fee_total": values[2],
+            }
+            for key, values in sorted(rows.items())
+        ])
+        statements.append(stmt.on_conflict_do_update(
+            index_elements=[bucket_col, "status", "currency_from", "currency_to"],
+            set_={
+                col: getattr(model, col) + getattr(stmt.excluded, col)
+                for col in ("tx_count", "amount_total", "fee_total")
+            },
+        ))
+    return statements
+
+
+async def apply_deltas(db: AsyncSession, deltas: Deltas) -> None:
+    for stmt in upsert_statements(db.get_bind().dialect.name, deltas):
+        await db.execute(stmt)
+
+
+def reconcile(db: Session, start: datetime, end: datetime, batch_size: int = 10000) -> int:
+    """
+    Rebuild the rollups for transactions created in [start, end) from the
+    source rows. ``start`` and ``end`` must be aligned to whole UTC days.
+    Returns the number of transactions scanned.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Incremental writers queue behind this lock, so no delta applied
+        # concurrently with the rebuild can be lost.
+        db.execute(text(
+            "LOCK TABLE transaction_stats_hourly, transaction_stats_daily IN SHARE ROW EXCLUSIVE MODE"
+        ))
+    deltas: Deltas = {}
+    scanned = 0
+    rows = db.execute(
+        select(
+            Transaction.created_at,
+            Transaction.status,
+            Transaction.currency_from,
+            Transaction.currency_to,
+            Transaction.amount,
+            Transaction.fee_amount,
+        )
+        .where(and_(Transaction.created_at >= start, Transaction.created_at < end))
+        .execution_options(yield_per=batch_size)
+    )
+    for row in rows:
+        add_delta(deltas, row, row.status or "pending", 1)
+        scanned += 1
+    db.execute(delete(TransactionStatsHourly).where(
+        TransactionStatsHourly.hour >= start, TransactionStatsHourly.hour < end
+    ))
+    db.execute(delete(TransactionStatsDaily).where(
+        TransactionStatsDaily.day >= start.date(), TransactionStatsDaily.day < end.date()
+    ))
+    for stmt in upsert_statements(dialect, deltas):
+        db.execute(stmt)
+    db.commit()
+    return scanned
+
+
+async def daily_rollups(db: AsyncSession, start: date, end: date) -> List[TransactionStatsDaily]:
+    result = await db.execute(
+        select(TransactionStatsDaily)
+        .where(TransactionStatsDaily.day >= start, TransactionStatsDaily.day < end)
+        .order_by(TransactionStatsDaily.day)
+    )
+    return list(result.scalars().all())
+
+
+async def hourly_rollups(db: AsyncSession, start: date, end: date) -> List[TransactionStatsHourly]:
+    result = await db.execute(
+        select(TransactionStatsHourly)
+        .where(
+            TransactionStatsHourly.hour >= datetime(start.year, start.month, start.day, tzinfo=timezone.utc),
+            TransactionStatsHourly.hour < datetime(end.year, end.month, end.day, tzinfo=timezone.utc),
+        )
+        .order_by(TransactionStatsHourly.hour)
+    )
+    return list(result.scalars().all())
+
+
+async def user_counts(db: AsyncSession) -> Dict[str, int]:
+    total, active = (
+        await db.execute(select(func.count(User.id), func.count(User.id).filter(User.is_active.is_(True))))
+    ).one()
+    return {"users_total": total, "users_active": active}
+
+
+def summarize(
+    rows: Iterable[Union[TransactionStatsDaily, TransactionStatsHourly]], hourly: bool = False
+) -> Dict[str, Any]:
+    """
+    Totals, corridors and the daily series from daily rollups, or from
+    hourly ones with ``hourly``, which also adds the hourly series.
+    """
+    by_status: Dict[str, int] = defaultdict(int)
+    corridors: Dict[Tuple[str, str], List[Any]] = defaultdict(lambda: [0, Decimal("0"), Decimal("0")])
+    daily: Dict[date, int] = defaultdict(int)
+    hours: Dict[datetime, int] = defaultdict(int)
+    for row in rows:
+        by_status[row.status] += row.tx_count
+        corridor = corridors[(row.currency_from, row.currency_to)]
+        corridor[0] += row.tx_count
+        corridor[1] += row.amount_total
+        corridor[2] += row.fee_total
+        if hourly:
+            hours[row.hour] += row.tx_count
+            daily[row.hour.date()] += row.tx_count
+        else:
+            daily[row.day] += row.tx_count
+    return {
+        "totals_by_status": [{"status": s, "count": c} for s, c in sorted(by_status.items()) if c],
+        "corridors": [
+            {"currency_from": k[0], "currency_to": k[1], "count": v[0], "amount": v[1], "fees": v[2]}
+            for k, v in sorted(corridors.items())
+            if v[0]
+        ],
+        "daily": [{"day": d, "count": c} for d, c in sorted(daily.items())],
+        "hourly": [{"hour": h, "count": c} for h, c in sorted(hours.items())] if hourly else None,
+    }
@@ -0,0 +1,229 @@
+"""
+Push of transaction status changes to connected clients as Server-Sent
+Events. Every status change already writes a STATUS_CHANGED outbox row in
+its own transaction; on Postgres a trigger NOTIFYs that row when it
+commits, and one listener per worker process fans it out to the streams
+subscribed on that worker. The outbox id doubles as the SSE event id, so a
+client reconnecting with Last-Event-ID is replayed what it missed from
+outbox_events (kept for OUTBOX_RETENTION_HOURS). Ids are not committed in
+order, so replays also re-send recent events just below the given id (see
+STATUS_STREAM_REORDER_WINDOW); events are delivered at least once and
+receivers drop ids they have already seen.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Set
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models.outbox import STATUS_CHANNEL, OutboxEvent
+from app.models.transaction import Transaction
+from app.services.notifications import STATUS_CHANGED
+
+logger = logging.getLogger(__name__)
+
+# Client reconnect delay, sent as the stream's retry: field
+RETRY_MS = 3000
+
+
+class StatusEvent(NamedTuple):
+    id: int
+    payload: Dict[str, Any]
+
+
+@dataclass(eq=False)
+class Subscription:
+    # None receives every user's events (superusers)
+    user_id: Optional[int]
+    queue: "asyncio.Queue[StatusEvent]"
+    dropped: bool = False
+
+    def wants(self, event: StatusEvent) -> bool:
+        return self.user_id is None or event.payload.get("user_id") == self.user_id
+
+
+async def replay(
+    db: AsyncSession, after_id: int, user_id: Optional[int], limit: int
+) -> List[StatusEvent]:
+    """
+    Status events after ``after_id`` in id order, only ``user_id``'s own
+    unless it is None, preceded by the recent ones below it that may have
+    committed after ``after_id`` was sent.
+    """
+    window = settings.STATUS_STREAM_REORDER_WINDOW
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.STATUS_STREAM_REORDER_SECONDS)
+    stmt = (
+        select(OutboxEvent.id, OutboxEvent.payload, OutboxEvent.created_at)
+        .where(OutboxEvent.topic == STATUS_CHANGED, OutboxEvent.id > after_id - window)
+        .order_by(OutboxEvent.id)
+        .limit(window + limit)
+    )
+    if user_id is not None:
+        stmt = stmt.join(Transaction, Transaction.id == OutboxEvent.aggregate_id).where(Transaction.user_id == user_id)
+    events = []
+    for id, payload, created_at in (await db.execute(stmt)).all():
+        # SQLite hands back naive UTC timestamps
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if id > after_id or created_at >= cutoff:
+            events.append(StatusEvent(id, payload))
+    return events[:limit]
+
+
+class StatusHub:
+    """
+    Fans status events out to the streams connected to this worker. Each
+    stream has a bounded queue; one that falls behind is dropped rather
+    than buffered without limit, and its client resumes from the table.
+    """
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.subscriptions: Set[Subscription] = set()
+        # Highest event id seen; the listener catches up from here
+        self.last_id: Optional[int] = None
+        # Ids published within STATUS_STREAM_REORDER_WINDOW of last_id, so
+        # events arriving by both NOTIFY and catch-up go out once
+        self.recent: Set[int] = set()
+
+    def subscribe(self, user_id: Optional[int]) -> Subscription:
+        subscription = Subscription(user_id, asyncio.Queue(self.queue_size))
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    def publish(self, event: StatusEvent) -> None:
+        if event.id in self.recent:
+            return
+        self.last_id = max(self.last_id or 0, event.id)
+        self.recent.add(event.id)
+        window = settings.STATUS_STREAM_REORDER_WINDOW
+        if len(self.recent) > 2 * window:
+            self.recent = {i for i in self.recent if i > self.last_id - window}
+        for subscription in list(self.subscriptions):
+            if not subscription.wants(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.dropped = True
+                self.unsubscribe(subscription)
+                metrics.status_stream_dropped.inc()
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        data = json.loads(payload)
+        self.publish(StatusEvent(data["id"], data["payload"]))
+
+    async def _catch_up(self) -> None:
+        # Publish what was committed while no listener was connected; on
+        # first start there is nothing to catch up on
+        async with AsyncSessionLocal() as db:
+            if self.last_id is None:
+                self.last_id = (await db.execute(select(func.max(OutboxEvent.id)))).scalar() or 0
+                return
+            while True:
+                start = self.last_id
+                events = await replay(db, start, None, settings.STATUS_STREAM_REPLAY_MAX)
+                for event in events:
+                    self.publish(event)
+                if len(events) < settings.STATUS_STREAM_REPLAY_MAX or self.last_id == start:
+                    return
+
+    async def listen(self, url: str) -> None:
+        """
+        Hold one LISTEN connection, outside the pool, and publish each
+        notification; reconnect and catch up after the connection drops.
+        """
+        import asyncpg
+
+        dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+            except Exception as exc:
+                logger.warning("Status listener could not connect: %s", exc)
+                await asyncio.sleep(RETRY_MS / 1000)
+                continue
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda c: lost.set())
+            try:
+                await conn.add_listener(STATUS_CHANNEL, self._on_notify)
+                await self._catch_up()
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), settings.STATUS_STREAM_HEARTBEAT_SECONDS)
+                    except asyncio.TimeoutError:
+                        # Surfaces a connection that died without closing
+                        await conn.execute("SELECT 1")
+            except Exception as exc:
+                logger.warning("Status listener connection lost: %s", exc)
+            finally:
+                conn.terminate()
+            await asyncio.sleep(RETRY_MS / 1000)
+
+    async def poll(self, interval: float) -> None:
+        # Stand-in for LISTEN/NOTIFY on SQLite (dev)
+        while True:
+            try:
+                await self._catch_up()
+            except Exception as exc:
+                logger.warning("Status poll failed: %s", exc)
+            await asyncio.sleep(interval)
+
+    async def run(self) -> None:
+        if async_engine.dialect.name == "postgresql":
+            await self.listen(settings.STATUS_STREAM_LISTEN_URL or settings.SQLALCHEMY_ASYNC_DATABASE_URI)
+        else:
+            await self.poll(settings.STATUS_STREAM_POLL_SECONDS)
+
+
+def format_event(event: StatusEvent) -> bytes:
+    return b"id: %d\nevent: status\ndata: %s\n\n" % (event.id, orjson.dumps(event.payload))
+
+
+async def stream(
+    hub: StatusHub, subscription: Subscription, backlog: List[StatusEvent], reset: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    SSE body: the replayed ``backlog``, then live events until the client
+    disconnects, falls behind or STATUS_STREAM_MAX_SECONDS pass. ``reset``
+    tells the client that more was missed than can be replayed and it
+    should reload its list.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.STATUS_STREAM_MAX_SECONDS
+    try:
+        yield b"retry: %d\n\n" % RETRY_MS
+        if reset:
+            yield b"event: reset\ndata: {}\n\n"
+        # The subscription predates the replay query, so events can arrive
+        # through both
+        replayed = {event.id for event in backlog}
+        for event in backlog:
+            yield format_event(event)
+        while not subscription.dropped:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), min(remaining, settings.STATUS_STREAM_HEARTBEAT_SECONDS)
+                )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event.id not in replayed:
+                yield format_event(event)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+hub = StatusHub(settings.STATUS_STREAM_QUEUE_SIZE)
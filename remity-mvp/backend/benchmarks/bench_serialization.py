@@ -0,0 +1,75 @@
+"""
+Compare the per-row cost of the old transaction list serialization
+(pydantic models + jsonable_encoder + json) with the projection + orjson path.
+
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+import argparse
+import datetime
+import json
+import time
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from app import models, schemas
+from app.api.projection import transaction_projection
+from app.api.responses import ORJSONResponse
+
+
+def build_rows(count: int):
+    now = datetime.datetime(2024, 1, 1)
+    user = models.User(id=1, email="user@example.com", full_name="Demo User", is_active=True, is_superuser=False)
+    recipient = models.Recipient(id=1, user_id=1, full_name="Alice Receiver", email="alice@example.com", country="ES")
+    rows = []
+    for i in range(count):
+        rows.append(models.Transaction(
+            id=i + 1, user_id=1, recipient_id=1, amount=Decimal("500.00"), currency_from="USD",
+            currency_to="EUR", exchange_rate=Decimal("0.9"), fee_amount=Decimal("2.5"),
+            total_amount=Decimal("502.5"), status="completed", payment_method="bank_transfer",
+            created_at=now, user=user, recipient=recipient,
+        ))
+    return rows
+
+
+def old_path(rows):
+    page = schemas.Page[schemas.TransactionWithRelations](
+        items=[schemas.TransactionWithRelations.model_validate(t) for t in rows], next_cursor=None
+    )
+    return json.dumps(jsonable_encoder(page)).encode()
+
+
+def new_path(rows, projection):
+    return ORJSONResponse({"items": [projection.serialize(t) for t in rows], "next_cursor": None}).body
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    cases = {
+        "old (pydantic + jsonable_encoder)": lambda: old_path(rows),
+        "new (expand=user,recipient)": lambda: new_path(rows, transaction_projection(None, "user,recipient")),
+        "new (dashboard fields)": lambda: new_path(
+            rows, transaction_projection("amount,status,created_at,recipient.full_name,recipient.email", None)
+        ),
+    }
+    for name, fn in cases.items():
+        seconds, size = timed(fn, args.repeat)
+        print(f"{name:40s} {seconds / args.rows * 1e6:8.2f} us/row {size / args.rows:8.1f} B/row")
+
+
+if __name__ == "__main__":
+    main()
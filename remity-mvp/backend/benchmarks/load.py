@@ -0,0 +1,252 @@
+"""
+Drive the key API endpoints at a fixed concurrency against a running stack
+loaded by app.jobs.generate_data, and record latency percentiles and
+throughput per scenario as a JSON baseline.
+
+    python -m app.jobs.generate_data --users 1000 --transactions 1000000
+    python -m benchmarks.load --concurrency 32 --requests 2000 --out baseline.json
+    python -m benchmarks.load --concurrency 32 --requests 2000 --compare baseline.json
+
+Each scenario runs a fixed number of requests (after --warmup unrecorded
+ones), so runs are comparable between commits. With --compare, a p95
+latency or throughput regression beyond --max-regression exits non-zero.
+"""
+import argparse
+import asyncio
+import json
+import math
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.jobs.generate_data import DEFAULT_PASSWORD, DEFAULT_PREFIX, admin_email, user_email
+
+SCENARIOS = ("login", "list", "admin_list", "create", "status_patch")
+
+
+class Actor:
+    """
+    One concurrent client, logged in as its own generated user.
+    """
+    def __init__(self, email: str, headers: Dict[str, str], recipient_ids: List[int]):
+        self.email = email
+        self.headers = headers
+        self.recipient_ids = recipient_ids
+        self.pending: List[int] = []
+        self.sent = 0
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    # Nearest-rank on sorted samples
+    if not samples:
+        return 0.0
+    return samples[max(0, math.ceil(pct / 100 * len(samples)) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    samples = sorted(latencies)
+    return {
+        "requests": len(samples) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 2) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+
+def shares(total: int, actors: int) -> List[int]:
+    # Requests per actor; each actor runs its own share back to back
+    return [total // actors + (i < total % actors) for i in range(actors)]
+
+
+def _transaction(recipient_id: int) -> Dict[str, Any]:
+    return {
+        "recipient_id": recipient_id,
+        "amount": 150,
+        "currency_from": "USD",
+        "currency_to": "MXN",
+        "exchange_rate": 17.03,
+        "fee_amount": 1.75,
+        "total_amount": 151.75,
+        "payment_method": "bank_transfer",
+    }
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> Dict[str, str]:
+    response = await client.post(
+        "/api/v1/auth/login/access-token", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def setup(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict[str, Any]:
+    actors = []
+    for n in range(1, args.concurrency + 1):
+        email = user_email(args.prefix, n)
+        headers = await login(client, email, args.password)
+        response = await client.get("/api/v1/recipients/", headers=headers, params={"limit": 10})
+        response.raise_for_status()
+        actors.append(Actor(email, headers, [r["id"] for r in response.json()["items"]]))
+    if "status_patch" in args.scenarios:
+        # One fresh pending transaction per patch, created up front
+        needed = [a + b for a, b in zip(shares(args.requests, len(actors)), shares(args.warmup, len(actors)))]
+        for actor, per_actor in zip(actors, needed):
+            for start in range(0, per_actor, 1000):
+                items = [_transaction(actor.recipient_ids[0])] * min(1000, per_actor - start)
+                response = await client.post("/api/v1/transactions/bulk", headers=actor.headers, json={"items": items})
+                response.raise_for_status()
+                actor.pending.extend(r["id"] for r in response.json()["results"] if r["id"] is not None)
+    admin = await login(client, admin_email(args.prefix), args.password)
+    return {"actors": actors, "admin": admin}
+
+
+def scenario_request(
+    name: str, client: httpx.AsyncClient, args: argparse.Namespace, state: Dict[str, Any]
+) -> Callable[[Actor], Awaitable[httpx.Response]]:
+    if name == "login":
+        return lambda actor: client.post(
+            "/api/v1/auth/login/access-token", data={"username": actor.email, "password": args.password}
+        )
+    if name == "list":
+        return lambda actor: client.get(
+            "/api/v1/transactions/", headers=actor.headers, params={"limit": args.page_size, "expand": "recipient"}
+        )
+    if name == "admin_list":
+        return lambda actor: client.get(
+            "/api/v1/transactions/admin", headers=state["admin"], params={"limit": args.page_size}
+        )
+    if name == "create":
+        return lambda actor: client.post(
+            "/api/v1/transactions/",
+            headers=actor.headers,
+            json=_transaction(actor.recipient_ids[actor.sent % len(actor.recipient_ids)]),
+        )
+    if name == "status_patch":
+        return lambda actor: client.patch(
+            f"/api/v1/transactions/{actor.pending.pop()}", headers=actor.headers, json={"status": "cancelled"}
+        )
+    raise ValueError(f"unknown scenario: {name}")
+
+
+async def run_scenario(
+    send: Callable[[Actor], Awaitable[httpx.Response]], actors: List[Actor], total: int
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(actor: Actor, count: int) -> None:
+        nonlocal errors
+        for _ in range(count):
+            actor.sent += 1
+            start = time.perf_counter()
+            try:
+                response = await send(actor)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(actor, count) for actor, count in zip(actors, shares(total, len(actors)))))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> bool:
+    """
+    Print per-scenario deltas against ``baseline``; False if any scenario's
+    p95 or throughput regressed by more than ``max_regression``.
+    """
+    ok = True
+    print(f"\nvs baseline {baseline['meta'].get('commit') or '?'} ({baseline['meta']['timestamp']})")
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if not base:
+            print(f"{name:14s} (not in baseline)")
+            continue
+        p95 = result["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        rps = result["throughput_rps"] / base["throughput_rps"] - 1 if base["throughput_rps"] else 0.0
+        regressed = p95 > max_regression or rps < -max_regression
+        ok = ok and not regressed
+        print(f"{name:14s} p95 {p95:+7.1%}  throughput {rps:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        state = await setup(client, args)
+        results = {}
+        for name in args.scenarios:
+            send = scenario_request(name, client, args, state)
+            if args.warmup:
+                await run_scenario(send, state["actors"], args.warmup)
+            results[name] = await run_scenario(send, state["actors"], args.requests)
+            r = results[name]
+            print(
+                f"{name:14s} {r['throughput_rps']:9.1f} req/s  p50 {r['p50_ms']:8.2f} ms  "
+                f"p95 {r['p95_ms']:8.2f} ms  p99 {r['p99_ms']:8.2f} ms  errors {r['errors']}"
+            )
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "page_size": args.page_size,
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients, one generated user each")
+    parser.add_argument("--requests", type=int, default=1000, help="recorded requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="unrecorded requests per scenario")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), default=list(SCENARIOS),
+                        help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX, help="generate_data --prefix")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="generate_data --password")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="allowed p95/throughput regression")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    current = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(current, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 #!/bin/sh
 
-# Run database migrations
-alembic upgrade head
+# Run database migrations (disabled where a separate migration job runs them)
+if [ "${RUN_MIGRATIONS:-true}" = "true" ]; then
+    alembic upgrade head
+fi
 
 # Start Uvicorn server
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000
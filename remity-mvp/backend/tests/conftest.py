@@ -0,0 +1,211 @@
+"""
+Test harness: the app runs against TEST_DATABASE_URL (async URL) or, by
+default, a throwaway SQLite file. Each test runs inside one outer database
+transaction that is rolled back afterwards; the app's commits become
+savepoint releases, so nothing leaks between tests.
+"""
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+_tmpdir = tempfile.mkdtemp(prefix="remity-tests-")
+_async_url = os.environ.get("TEST_DATABASE_URL", f"sqlite+aiosqlite:///{_tmpdir}/test.db")
+_sync_url = re.sub(r"\+(aiosqlite|asyncpg)", lambda m: "" if m.group(1) == "aiosqlite" else "+psycopg2", _async_url)
+
+# Settings are read at import time, so configure them before importing app
+os.environ.update(
+    SQLALCHEMY_DATABASE_URI=_sync_url,
+    SQLALCHEMY_ASYNC_DATABASE_URI=_async_url,
+    SQLALCHEMY_REPLICA_URIS="",
+    DB_STARTUP_DDL="none",
+    ENABLE_SEED="false",
+    PASSWORD_HASH_WORKERS="0",
+    PASSWORD_BCRYPT_ROUNDS="4",
+    AUTH_CACHE_URL="",
+)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession  # noqa: E402
+
+from app import models  # noqa: E402
+from app.api import dependencies  # noqa: E402
+from app.core.cache import MemoryCache, principal_cache  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import TrackedAsyncSession, async_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.quotes import quote_engine  # noqa: E402
+
+if async_engine.dialect.name == "sqlite":
+    # pysqlite's implicit transaction handling breaks SAVEPOINT; take over
+    # BEGIN so the rollback-per-test pattern works
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _sqlite_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(async_engine.sync_engine, "begin")
+    def _sqlite_begin(conn: Any) -> None:
+        conn.exec_driver_sql("BEGIN")
+
+
+# Transaction control, not application queries
+_CONTROL = re.compile(r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE)
+
+
+class QueryCounter:
+    """
+    Counts application SQL statements executed on the async engine.
+    """
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+        self.active = False
+
+    def __call__(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if self.active and not _CONTROL.match(statement):
+            self.statements.append(statement)
+
+    @contextmanager
+    def count(self) -> Iterator["QueryCounter"]:
+        self.statements = []
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        return "\n".join(f"  {n}. {' '.join(s.split())[:200]}" for n, s in enumerate(self.statements, 1))
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def schema() -> AsyncIterator[None]:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    quote_engine.refresh()
+    yield
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def connection(schema: None) -> AsyncIterator[AsyncConnection]:
+    async with async_engine.connect() as conn:
+        outer = await conn.begin()
+        yield conn
+        await outer.rollback()
+
+
+@pytest.fixture
+async def db(connection: AsyncConnection) -> AsyncIterator[AsyncSession]:
+    session = TrackedAsyncSession(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    yield session
+    await session.close()
+
+
+@pytest.fixture
+async def client(db: AsyncSession) -> AsyncIterator[httpx.AsyncClient]:
+    async def override_get_db() -> AsyncIterator[AsyncSession]:
+        try:
+            yield db
+        except Exception:
+            # As closing the request's session would: drop uncommitted work
+            await db.rollback()
+            raise
+
+    app.dependency_overrides[dependencies.get_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def queries() -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_auth_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Ids repeat across rolled-back tests; never serve a previous test's user
+    monkeypatch.setattr(principal_cache, "backend", MemoryCache())
+
+
+PASSWORD = "Test12345!"
+
+
+async def seed(db: AsyncSession, rows: int) -> Dict[str, Any]:
+    """
+    A user and an admin, two recipients for the user and ``rows``
+    transactions spread over them, and one open screening hit. Returns ids
+    and auth headers.
+    """
+    hashed = get_password_hash(PASSWORD)
+    user = models.User(email="user@example.com", full_name="User", hashed_password=hashed)
+    admin = models.User(email="admin@example.com", full_name="Admin", hashed_password=hashed, is_superuser=True)
+    db.add_all([user, admin])
+    await db.flush()
+    recipients = [
+        models.Recipient(user_id=user.id, full_name=f"Recipient {i}", email=f"r{i}@example.com", country="ES")
+        for i in range(3)
+    ]
+    db.add_all(recipients)
+    await db.flush()
+    hit = models.ScreeningHit(
+        subject_type="recipient",
+        subject_id=recipients[2].id,
+        name=recipients[2].full_name,
+        list_version="seed",
+        entry_id="WL-0000",
+        entry_name="Recipient Two",
+        program="TEST",
+        score=0.9,
+    )
+    db.add(hit)
+    statuses = ["pending", "in_progress", "completed"]
+    db.add_all([
+        models.Transaction(
+            user_id=user.id,
+            recipient_id=recipients[i % 2].id,
+            amount=Decimal("100.00") + i,
+            currency_from="USD",
+            currency_to="EUR",
+            exchange_rate=Decimal("0.9"),
+            fee_amount=Decimal("2.50"),
+            total_amount=Decimal("102.50") + i,
+            status=statuses[i % 3],
+            payment_method="bank_transfer",
+        )
+        for i in range(rows)
+    ])
+    await db.commit()
+    tx_ids = list((await db.scalars(select(models.Transaction.id).order_by(models.Transaction.id))).all())
+    return {
+        "user": user,
+        "admin": admin,
+        "recipients": recipients,
+        "hits": [hit],
+        "tx_ids": tx_ids,
+        "user_headers": {"Authorization": f"Bearer {create_access_token(user.id)}"},
+        "admin_headers": {"Authorization": f"Bearer {create_access_token(admin.id)}"},
+    }
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+import pytest
+from app import models
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+async def _mixed_transactions(db, seeded) -> list:
+    rows = [
+        # status, created, corridor, amount, payment method, tracking number
+        ("pending", datetime(2026, 1, 10), "USD", "EUR", "50.00", "bank_transfer", "TRK_100%A"),
+        ("completed", datetime(2026, 2, 10), "USD", "MXN", "500.00", "card", "TRKX100ZA"),
+        ("failed", datetime(2026, 3, 10), "GBP", "EUR", "1500.00", "bank_transfer", "TRK-3"),
+    ]
+    txs = [
+        models.Transaction(
+            user_id=seeded["user"].id,
+            recipient_id=seeded["recipients"][n].id,
+            amount=Decimal(amount),
+            currency_from=cur_from,
+            currency_to=cur_to,
+            exchange_rate=Decimal("0.9"),
+            fee_amount=Decimal("2.50"),
+            total_amount=Decimal(amount) + Decimal("2.50"),
+            status=status,
+            payment_method=method,
+            tracking_number=tracking,
+            created_at=created.replace(tzinfo=timezone.utc),
+        )
+        for n, (status, created, cur_from, cur_to, amount, method, tracking) in enumerate(rows)
+    ]
+    db.add_all(txs)
+    await db.commit()
+    return [tx.id for tx in txs]
+
+
+async def test_transaction_filters_narrow_the_list(client, db) -> None:
+    seeded = await seed(db, 0)
+    first, second, third = await _mixed_transactions(db, seeded)
+
+    async def ids(**params) -> set:
+        r = await client.get("/api/v1/transactions/admin", params=params, headers=seeded["admin_headers"])
+        assert r.status_code == 200, r.text
+        return {item["id"] for item in r.json()["items"]}
+
+    assert await ids() == {first, second, third}
+    assert await ids(status="completed") == {second}
+    assert await ids(status="pending,failed") == {first, third}
+    assert await ids(start="2026-02-01T00:00:00Z", end="2026-03-01T00:00:00Z") == {second}
+    assert await ids(start="2026-02-10T00:00:00Z") == {second, third}
+    assert await ids(currency_from="gbp") == {third}
+    assert await ids(currency_to="EUR") == {first, third}
+    assert await ids(currency_from="USD", currency_to="EUR") == {first}
+    assert await ids(min_amount=100, max_amount=1000) == {second}
+    assert await ids(min_amount=500) == {second, third}
+    assert await ids(payment_method="card") == {second}
+    assert await ids(status="pending", payment_method="card") == set()
+    # q searches tracking number, recipient name and user email/name
+    assert await ids(q="100") == {first, second}
+    assert await ids(q="Recipient 2") == {third}
+    assert await ids(q="USER@example") == {first, second, third}
+    # % and _ are literals, not wildcards: "TRKX100ZA" does not match
+    assert await ids(q="_100%") == {first}
+    assert await ids(q="K_1") == {first}
+
+
+async def test_transaction_filters_reject_bad_ranges(client, db) -> None:
+    seeded = await seed(db, 0)
+    for params in (
+        {"status": "lost"},
+        {"start": "2026-02-01T00:00:00Z", "end": "2026-01-01T00:00:00Z"},
+        {"min_amount": 10, "max_amount": 5},
+    ):
+        r = await client.get("/api/v1/transactions/admin", params=params, headers=seeded["admin_headers"])
+        assert r.status_code == 400, (params, r.text)
+
+
+async def test_user_filters_narrow_the_list(client, db) -> None:
+    seeded = await seed(db, 0)
+    users = [
+        models.User(email="ann_smith@example.com", full_name="Ann Smith", hashed_password="x"),
+        models.User(email="annxsmith@example.com", full_name="Ann X", hashed_password="x", kyc_status="approved"),
+        models.User(email="gone@example.com", full_name="100% Gone", hashed_password="x", is_active=False),
+    ]
+    db.add_all(users)
+    await db.commit()
+    underscore, lookalike, inactive = (u.id for u in users)
+    user, admin = seeded["user"].id, seeded["admin"].id
+
+    async def ids(**params) -> set:
+        r = await client.get("/api/v1/users/", params=params, headers=seeded["admin_headers"])
+        assert r.status_code == 200, r.text
+        return {item["id"] for item in r.json()["items"]}
+
+    assert await ids() == {user, admin, underscore, lookalike, inactive}
+    assert await ids(is_active=False) == {inactive}
+    assert await ids(is_superuser=True) == {admin}
+    assert await ids(kyc_status="approved") == {lookalike}
+    assert await ids(q="ann") == {underscore, lookalike}
+    assert await ids(q="SMITH") == {underscore, lookalike}
+    assert await ids(q="ann", kyc_status="approved") == {lookalike}
+    # Escaped: as wildcards "n_s" would also match "annxsmith" and "n%s"
+    # every Ann
+    assert await ids(q="n_s") == {underscore}
+    assert await ids(q="n%s") == set()
+    assert await ids(q="00% g") == {inactive}
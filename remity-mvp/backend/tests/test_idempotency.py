@@ -0,0 +1,56 @@
+from sqlalchemy import func, select
+import pytest
+from app import models
+from app.services.idempotency import REPLAYED_HEADER
+from tests.conftest import seed
+from tests.test_query_budgets import _tx
+
+pytestmark = pytest.mark.anyio
+
+
+async def _count(db) -> int:
+    return await db.scalar(select(func.count(models.Transaction.id)))
+
+
+async def test_retry_replays_the_first_response(client, db, queries) -> None:
+    seeded = await seed(db, 10)
+    headers = {**seeded["user_headers"], "Idempotency-Key": "retry-1"}
+    body = _tx(recipient_id=seeded["recipients"][0].id)
+
+    first = await client.post("/api/v1/transactions/", headers=headers, json=body)
+    assert first.status_code == 200, first.text
+    with queries.count():
+        retry = await client.post("/api/v1/transactions/", headers=headers, json=body)
+
+    assert retry.status_code == 200
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert await _count(db) == 11
+    # Cached principal plus one key lookup: no ownership check, no insert
+    assert len(queries) == 1, queries.report()
+
+
+async def test_key_reused_for_another_request_is_rejected(client, db) -> None:
+    seeded = await seed(db, 10)
+    headers = {**seeded["user_headers"], "Idempotency-Key": "retry-2"}
+    first = await client.post("/api/v1/transactions/", headers=headers, json=_tx(recipient_id=seeded["recipients"][0].id))
+    assert first.status_code == 200, first.text
+
+    other = await client.post(
+        "/api/v1/transactions/", headers=headers, json=_tx(recipient_id=seeded["recipients"][0].id, amount=75)
+    )
+    assert other.status_code == 422
+    assert await _count(db) == 11
+
+
+async def test_failed_request_does_not_consume_the_key(client, db) -> None:
+    seeded = await seed(db, 10)
+    headers = {**seeded["user_headers"], "Idempotency-Key": "retry-3"}
+    recipient_id = seeded["recipients"][0].id
+
+    failed = await client.post("/api/v1/transactions/", headers=headers, json=_tx(recipient_id=10 ** 6))
+    assert failed.status_code == 400
+
+    retry = await client.post("/api/v1/transactions/", headers=headers, json=_tx(recipient_id=recipient_id))
+    assert retry.status_code == 200, retry.text
+    assert REPLAYED_HEADER not in retry.headers
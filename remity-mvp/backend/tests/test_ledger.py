@@ -0,0 +1,63 @@
+from decimal import Decimal
+import pytest
+from sqlalchemy import update
+from app import models
+from app.services import ledger
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+def _tx(recipient_id: int, total: float, currency: str = "USD") -> dict:
+    return {
+        "recipient_id": recipient_id,
+        "amount": total - 1,
+        "currency_from": currency,
+        "currency_to": "MXN",
+        "exchange_rate": 17,
+        "fee_amount": 1,
+        "total_amount": total,
+        "payment_method": "bank_transfer",
+    }
+
+
+async def test_balances_follow_transaction_status(client, db) -> None:
+    seeded = await seed(db, 0)
+    user, admin = seeded["user_headers"], seeded["admin_headers"]
+    recipient_id = seeded["recipients"][0].id
+    ids = []
+    for total in (100, 40):
+        response = await client.post("/api/v1/transactions/", headers=user, json=_tx(recipient_id, total))
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    response = await client.post("/api/v1/transactions/bulk", headers=user, json={"items": [_tx(recipient_id, 25, "EUR")]})
+    assert response.status_code == 200, response.text
+
+    for tx_id, status in ((ids[0], "in_progress"), (ids[0], "completed"), (ids[1], "cancelled")):
+        response = await client.patch(f"/api/v1/transactions/{tx_id}/admin", headers=admin, json={"status": status})
+        assert response.status_code == 200, response.text
+
+    response = await client.get("/api/v1/users/me/balances", headers=user)
+    assert response.status_code == 200, response.text
+    assert [(b["currency"], b["account"], b["balance"]) for b in response.json()] == [
+        ("EUR", "pending", 25.0),
+        ("USD", "pending", 0.0),
+        ("USD", "sent", 100.0),
+    ]
+    result = await db.run_sync(lambda session: ledger.reconcile(session, batch_size=2))
+    assert result == ledger.Reconciliation(3, [], [])
+
+
+async def test_reconcile_reports_and_repairs_drift(client, db) -> None:
+    seeded = await seed(db, 0)
+    recipient_id = seeded["recipients"][0].id
+    response = await client.post("/api/v1/transactions/", headers=seeded["user_headers"], json=_tx(recipient_id, 60))
+    assert response.status_code == 200, response.text
+    await db.execute(update(models.LedgerBalance).values(balance=models.LedgerBalance.balance + 5))
+    await db.commit()
+
+    result = await db.run_sync(ledger.reconcile)
+    key = (seeded["user"].id, ledger.PENDING, "USD")
+    assert result.mismatches == [ledger.Mismatch(key, Decimal("65.00"), Decimal("60.00"))]
+    assert await db.run_sync(lambda session: ledger.repair(session, key)) == Decimal("60.00")
+    assert (await db.run_sync(ledger.reconcile)).mismatches == []
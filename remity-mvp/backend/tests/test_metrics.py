@@ -0,0 +1,21 @@
+import pytest
+from app.core import metrics
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_requests_are_labelled_with_the_route_template(client, db) -> None:
+    seeded = await seed(db, 0)
+    recipient_id = seeded["recipients"][0].id
+    r = await client.patch(
+        f"/api/v1/recipients/{recipient_id}", json={"city": "Madrid"}, headers=seeded["user_headers"]
+    )
+    assert r.status_code == 200, r.text
+    r = await client.get("/api/v1/no-such-route")
+    assert r.status_code == 404
+
+    paths = {labels[1] for labels in metrics.http_request_duration._counts}
+    assert "/api/v1/recipients/{recipient_id}" in paths
+    assert "<unmatched>" in paths
+    assert not any(str(recipient_id) in p.split("/") for p in paths)
@@ -0,0 +1,61 @@
+import json
+from sqlalchemy import select
+import pytest
+from app import models
+from app.services import notifications, outbox
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sinks(tmp_path, monkeypatch):
+    monkeypatch.setattr(notifications, "mailer", notifications.FileMailer(str(tmp_path / "mail")))
+    monkeypatch.setattr(notifications.settings, "RECEIPTS_DIR", str(tmp_path / "receipts"))
+    return tmp_path
+
+
+async def _events(db):
+    return list((await db.scalars(select(models.OutboxEvent).order_by(models.OutboxEvent.id))).all())
+
+
+async def test_status_change_is_delivered_by_the_worker(client, db, sinks) -> None:
+    seeded = await seed(db, 10)
+    tx_id = seeded["tx_ids"][1]  # in_progress
+    response = await client.patch(
+        f"/api/v1/transactions/{tx_id}/admin", headers=seeded["admin_headers"], json={"status": "completed"}
+    )
+    assert response.status_code == 200, response.text
+
+    [event] = await _events(db)
+    assert (event.topic, event.status, event.aggregate_id) == (notifications.STATUS_CHANGED, "pending", tx_id)
+    assert event.payload["old_status"] == "in_progress"
+    assert event.payload["new_status"] == "completed"
+
+    assert await db.run_sync(lambda s: outbox.process_batch(s, 10)) == 1
+    await db.refresh(event)
+    assert event.status == "done"
+    [mail] = list((sinks / "mail").iterdir())
+    assert "To: user@example.com" in mail.read_text()
+    receipt = json.loads((sinks / "receipts" / f"transaction-{tx_id}.json").read_text())
+    assert receipt["total_amount"] == event.payload["total_amount"]
+
+
+async def test_failed_handler_is_retried_later(client, db, sinks, monkeypatch) -> None:
+    seeded = await seed(db, 10)
+
+    def broken(db, event):
+        raise ConnectionError("smtp down")
+
+    monkeypatch.setitem(outbox.handlers, notifications.STATUS_CHANGED, [broken])
+    response = await client.patch(
+        f"/api/v1/transactions/{seeded['tx_ids'][0]}", headers=seeded["user_headers"], json={"status": "cancelled"}
+    )
+    assert response.status_code == 200, response.text
+
+    assert await db.run_sync(lambda s: outbox.process_batch(s, 10)) == 1
+    [event] = await _events(db)
+    assert (event.status, event.attempts) == ("pending", 1)
+    assert "smtp down" in event.last_error
+    # Backed off: not due again straight away
+    assert await db.run_sync(lambda s: outbox.process_batch(s, 10)) == 0
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+import pytest
+from sqlalchemy import create_engine, insert, text
+from app import models
+from app.crud.base import encode_cursor
+from app.db import partitions
+from app.db.base import Base
+from app.db.session import engine
+from app.services import archive
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+def test_monthly_partition_bounds() -> None:
+    december = partitions.partition_for(datetime(2025, 12, 31, 23, 59, tzinfo=timezone.utc))
+    assert december == partitions.Partition(
+        "transactions_y2025m12",
+        datetime(2025, 12, 1, tzinfo=timezone.utc),
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    assert partitions.parse_name(december.name) == december
+    assert partitions.parse_name(partitions.DEFAULT_PARTITION) is None
+    assert partitions.add_months(december.start, -12) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+    names = [p.name for p in partitions.months_between(december.start, datetime(2026, 2, 15, tzinfo=timezone.utc))]
+    assert names == ["transactions_y2025m12", "transactions_y2026m01", "transactions_y2026m02"]
+
+
+async def test_pages_cover_every_row_once(client, db) -> None:
+    # Seeded in one statement, so created_at ties and id breaks them
+    seeded = await seed(db, 25)
+    seen, cursors = [], [None]
+    for _ in range(10):
+        params = {"limit": 10, **({"cursor": cursors[-1]} if cursors[-1] else {})}
+        response = await client.get("/api/v1/transactions/", headers=seeded["user_headers"], params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        seen += [(item["created_at"], item["id"]) for item in body["items"]]
+        if body["next_cursor"] is None:
+            break
+        assert body["next_cursor"] not in cursors
+        cursors.append(body["next_cursor"])
+    assert len(cursors) == 3
+    assert sorted(i for _, i in seen) == seeded["tx_ids"]
+    assert seen == sorted(seen, reverse=True)
+
+
+async def test_tampered_cursor_is_rejected(client, db) -> None:
+    seeded = await seed(db, 0)
+    # Pages are keyed on id
+    for values in (["abc"], [True], [1.5], [None], [1, 2]):
+        response = await client.get(
+            "/api/v1/transactions/", headers=seeded["user_headers"], params={"cursor": encode_cursor(values)}
+        )
+        assert response.status_code == 400, (values, response.text)
+    response = await client.get("/api/v1/users/", headers=seeded["admin_headers"], params={"cursor": encode_cursor(["abc"])})
+    assert response.status_code == 400, response.text
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="partitioning needs Postgres")
+def test_archive_detaches_exports_and_drops_a_month(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    # A partitioned copy of the schema, away from the per-test transaction
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA IF EXISTS archive_test CASCADE"))
+        conn.execute(text("CREATE SCHEMA archive_test"))
+    scratch = create_engine(engine.url, connect_args={"options": "-csearch_path=archive_test"})
+    try:
+        january, february = (datetime(2020, m, 1, tzinfo=timezone.utc) for m in (1, 2))
+        with scratch.begin() as conn:
+            Base.metadata.create_all(conn, tables=[models.User.__table__, models.Recipient.__table__, models.Transaction.__table__])
+            conn.execute(text("ALTER TABLE transactions RENAME TO transactions_plain"))
+            conn.execute(text("CREATE TABLE transactions (LIKE transactions_plain) PARTITION BY RANGE (created_at)"))
+            conn.execute(text(f"CREATE TABLE {partitions.DEFAULT_PARTITION} PARTITION OF transactions DEFAULT"))
+        with scratch.connect() as conn:
+            partitions.ensure(conn, january, partitions.add_months(february, 1))
+            conn.execute(insert(models.Transaction.__table__), [
+                dict(id=i, user_id=1, recipient_id=1, amount=Decimal("10.00"), currency_from="USD", currency_to="EUR",
+                     exchange_rate=Decimal("0.9"), fee_amount=Decimal("1.00"), total_amount=Decimal("11.00"),
+                     payment_method="bank_transfer", version=1, created_at=at)
+                for i, at in enumerate([january, january, january.replace(day=31), february], start=1)
+            ])
+            conn.commit()
+
+        assert archive.archive_partition(scratch, partitions.partition_for(january), str(tmp_path), 2) == 3
+        table = pq.read_table(tmp_path / "transactions_y2020m01.parquet")
+        assert sorted(table.column("id").to_pylist()) == [1, 2, 3]
+        with scratch.connect() as conn:
+            assert partitions.attached(conn) == [partitions.partition_for(february)]
+            assert partitions.detached(conn) == []
+            assert conn.execute(text("SELECT count(*) FROM transactions")).scalar() == 1
+    finally:
+        scratch.dispose()
+        with engine.begin() as conn:
+            conn.execute(text("DROP SCHEMA archive_test CASCADE"))
@@ -0,0 +1,157 @@
+"""
+Per-route SQL budgets. Every API route must appear in BUDGETS; each is
+requested against 10 and 1,000 seeded transactions and must stay within its
+budget at both sizes, so per-row (N+1) queries fail the build.
+
+Budgets are counted with a cold principal cache, i.e. they include the one
+user lookup authentication costs on a cache miss.
+"""
+from typing import Any, Callable, Dict, NamedTuple, Optional
+import pytest
+from tests.conftest import PASSWORD, seed
+
+pytestmark = pytest.mark.anyio
+
+
+class Budget(NamedTuple):
+    queries: int
+    role: Optional[str]  # "user", "admin" or None (anonymous)
+    # Builds the request kwargs (path params, json, data) from the seed
+    request: Callable[[Dict[str, Any]], Dict[str, Any]] = lambda s: {}
+    # Budget on the SQLite stand-in, where it differs from Postgres
+    sqlite: Optional[int] = None
+
+
+def _tx(**overrides: Any) -> Dict[str, Any]:
+    return {
+        "amount": 50,
+        "currency_from": "USD",
+        "currency_to": "EUR",
+        "exchange_rate": 0.9,
+        "fee_amount": 1.5,
+        "total_amount": 51.5,
+        "payment_method": "bank_transfer",
+        **overrides,
+    }
+
+
+def _recipient(i: int = 0) -> Dict[str, Any]:
+    return {"full_name": f"New {i}", "email": f"new{i}@example.com", "country": "MX"}
+
+
+BUDGETS: Dict[str, Budget] = {
+    # Auth and users
+    "POST /api/v1/auth/login/access-token": Budget(
+        1, None, lambda s: {"data": {"username": "user@example.com", "password": PASSWORD}}
+    ),
+    "POST /api/v1/users/": Budget(
+        2, None, lambda s: {"json": {"email": "new@example.com", "password": "Secret123!", "full_name": "New"}}
+    ),
+    "GET /api/v1/users/": Budget(2, "admin", lambda s: {"params": {"q": "example", "is_active": True}}),
+    "GET /api/v1/users/me": Budget(1, "user"),
+    "GET /api/v1/users/me/balances": Budget(2, "user"),
+    "GET /api/v1/users/{user_id}": Budget(2, "admin", lambda s: {"path": {"user_id": s["user"].id}}),
+    "POST /api/v1/users/{user_id}/deactivate": Budget(3, "admin", lambda s: {"path": {"user_id": s["user"].id}}),
+    # Recipients
+    "GET /api/v1/recipients/": Budget(3, "user"),
+    "POST /api/v1/recipients/": Budget(2, "user", lambda s: {"json": _recipient()}),
+    # SQLite cannot batch an ordered INSERT .. RETURNING without a sentinel
+    # column, so the stand-in runs one INSERT per item; Postgres runs one
+    "POST /api/v1/recipients/bulk": Budget(
+        2, "user", lambda s: {"json": {"items": [_recipient(i) for i in range(10)]}}, sqlite=10
+    ),
+    "PATCH /api/v1/recipients/{recipient_id}": Budget(
+        3, "user", lambda s: {"path": {"recipient_id": s["recipients"][0].id}, "json": {"city": "Madrid"}}
+    ),
+    "DELETE /api/v1/recipients/{recipient_id}": Budget(
+        2, "user", lambda s: {"path": {"recipient_id": s["recipients"][2].id}}
+    ),
+    # Transactions
+    "GET /api/v1/transactions/": Budget(3, "user", lambda s: {"params": {"expand": "user,recipient"}}),
+    # Filtered and searched: the search subqueries stay inside the one SELECT
+    "GET /api/v1/transactions/admin": Budget(3, "admin", lambda s: {"params": {
+        "expand": "user,recipient",
+        "status": "pending,completed",
+        "currency_from": "usd",
+        "min_amount": 100,
+        "start": "2000-01-01T00:00:00",
+        "q": "user@",
+    }}),
+    # Transaction writes that move money add the ledger entries INSERT and
+    # the balances upsert
+    "POST /api/v1/transactions/": Budget(
+        7, "user", lambda s: {"json": _tx(recipient_id=s["recipients"][0].id)}
+    ),
+    "POST /api/v1/transactions/bulk": Budget(
+        7,
+        "user",
+        lambda s: {"json": {"items": [_tx(recipient_id=s["recipients"][i % 2].id) for i in range(10)]}},
+        sqlite=15,
+    ),
+    # SQLite reads the prior status first; Postgres returns it from the
+    # UPDATE itself and needs one query less. Includes the outbox INSERT.
+    "PATCH /api/v1/transactions/{tx_id}": Budget(
+        8, "user", lambda s: {"path": {"tx_id": s["tx_ids"][0]}, "json": {"status": "cancelled"}}
+    ),
+    "PATCH /api/v1/transactions/{tx_id}/admin": Budget(
+        6, "admin", lambda s: {"path": {"tx_id": s["tx_ids"][0]}, "json": {"status": "in_progress"}}
+    ),
+    # Quotes are priced in memory; batches need a signed-in user
+    "POST /api/v1/quotes/": Budget(
+        0, None, lambda s: {"json": {"amount": 100, "currency_from": "USD", "currency_to": "EUR"}}
+    ),
+    "POST /api/v1/quotes/batch": Budget(
+        1, "user", lambda s: {"json": {"items": [{"amount": 100, "currency_from": "USD", "currency_to": "EUR"}] * 10}}
+    ),
+    # Admin and internal
+    "GET /api/v1/admin/stats": Budget(3, "admin"),
+    "GET /api/v1/admin/screening/hits": Budget(2, "admin"),
+    # Reviewed in one UPDATE ... RETURNING
+    "PATCH /api/v1/admin/screening/hits/{hit_id}": Budget(
+        2, "admin", lambda s: {"path": {"hit_id": s["hits"][0].id}, "json": {"status": "cleared"}}
+    ),
+    "GET /api/v1/internal/auth-cache": Budget(1, "admin"),
+    "GET /api/v1/internal/replicas": Budget(1, "admin"),
+    "GET /api/v1/internal/pool": Budget(1, "admin"),
+    "GET /api/v1/internal/outbox": Budget(2, "admin"),
+}
+
+# Routes deliberately outside the harness, with the reason
+EXEMPT = {
+    # Streams from its own session after the endpoint returns, so it does not
+    # see the per-test transaction; it reads in fixed-size batches
+    "GET /api/v1/transactions/admin/export",
+    # Long-lived event stream; its replay query is tested in
+    # tests/test_status_stream.py
+    "GET /api/v1/transactions/events",
+}
+
+
+def test_every_route_has_a_budget() -> None:
+    from app.main import app
+
+    routes = {
+        f"{method.upper()} {path}"
+        for path, item in app.openapi()["paths"].items()
+        for method in item
+    }
+    assert routes - EXEMPT - set(BUDGETS) == set(), "declare a query budget for new routes"
+    assert set(BUDGETS) - routes == set(), "budget declared for a route that no longer exists"
+
+
+@pytest.mark.parametrize("rows", [10, 1000])
+@pytest.mark.parametrize("route", sorted(BUDGETS))
+async def test_query_budget(route: str, rows: int, client, db, queries) -> None:
+    seeded = await seed(db, rows)
+    budget = BUDGETS[route]
+    limit = budget.sqlite if budget.sqlite is not None and db.bind.dialect.name == "sqlite" else budget.queries
+    method, path = route.split(" ", 1)
+    kwargs = budget.request(seeded)
+    path = path.format(**kwargs.pop("path", {}))
+    headers = seeded[f"{budget.role}_headers"] if budget.role else {}
+    with queries.count():
+        response = await client.request(method, path, headers=headers, **kwargs)
+    assert response.status_code < 300, response.text
+    assert len(queries) <= limit, (
+        f"{route} ran {len(queries)} queries with {rows} rows (budget {limit}):\n{queries.report()}"
+    )
@@ -0,0 +1,84 @@
+import pytest
+from app.services.quotes import quote_engine
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+QUOTE = {"amount": 100, "currency_from": "USD", "currency_to": "EUR"}
+
+
+async def test_only_signed_in_users_get_locked_quotes(client, db) -> None:
+    seeded = await seed(db, 0)
+    before = quote_engine.store.size()
+
+    r = await client.post("/api/v1/quotes/", json=QUOTE)
+    assert r.status_code == 200, r.text
+    assert r.json()["quote_id"] is None and r.json()["expires_at"] is None
+    assert r.json()["total_amount"] > 0
+    assert quote_engine.store.size() == before
+
+    r = await client.post("/api/v1/quotes/", json=QUOTE, headers=seeded["user_headers"])
+    assert r.status_code == 200, r.text
+    assert r.json()["quote_id"] and r.json()["expires_at"]
+    assert quote_engine.store.size() == before + 1
+
+
+def _tx(recipient_id: int, quote_id: str, amount: float = 100) -> dict:
+    return {
+        "recipient_id": recipient_id,
+        "amount": amount,
+        "currency_from": "USD",
+        "currency_to": "EUR",
+        "exchange_rate": 0.9,
+        "fee_amount": 1.5,
+        "total_amount": amount + 1.5,
+        "payment_method": "bank_transfer",
+        "quote_id": quote_id,
+    }
+
+
+async def _locked_quote(client, headers) -> dict:
+    r = await client.post("/api/v1/quotes/", json=QUOTE, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+async def test_mismatched_quote_is_not_consumed(client, db) -> None:
+    seeded = await seed(db, 0)
+    headers, recipient_id = seeded["user_headers"], seeded["recipients"][0].id
+    quote = await _locked_quote(client, headers)
+
+    r = await client.post("/api/v1/transactions/", json=_tx(recipient_id, quote["quote_id"], amount=99), headers=headers)
+    assert r.status_code == 400 and r.json()["detail"] == "Quote does not match the transaction"
+
+    r = await client.post("/api/v1/transactions/", json=_tx(recipient_id, quote["quote_id"]), headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["total_amount"] == quote["total_amount"]
+    # Consumed exactly once
+    r = await client.post("/api/v1/transactions/", json=_tx(recipient_id, quote["quote_id"]), headers=headers)
+    assert r.status_code == 400 and r.json()["detail"] == "Quote expired or not found"
+
+
+async def test_rejected_batch_keeps_its_quotes(client, db) -> None:
+    seeded = await seed(db, 0)
+    headers, recipient_id = seeded["user_headers"], seeded["recipients"][0].id
+    first, second = await _locked_quote(client, headers), await _locked_quote(client, headers)
+
+    # Invalid item: rejected before any quote is consumed
+    items = [_tx(recipient_id, first["quote_id"]), _tx(recipient_id, second["quote_id"], amount=99)]
+    r = await client.post("/api/v1/transactions/bulk", json={"items": items}, params={"all_or_nothing": True}, headers=headers)
+    assert r.status_code == 422 and r.json()["created"] == 0, r.text
+    assert await quote_engine.peek(first["quote_id"]) is not None
+
+    # The same quote twice: the second consume fails after the first
+    # succeeded, and the first is put back when the batch is rejected
+    items = [_tx(recipient_id, first["quote_id"]), _tx(recipient_id, first["quote_id"])]
+    r = await client.post("/api/v1/transactions/bulk", json={"items": items}, params={"all_or_nothing": True}, headers=headers)
+    assert r.status_code == 422 and r.json()["created"] == 0, r.text
+    assert await quote_engine.peek(first["quote_id"]) is not None
+
+    items = [_tx(recipient_id, first["quote_id"]), _tx(recipient_id, second["quote_id"])]
+    r = await client.post("/api/v1/transactions/bulk", json={"items": items}, params={"all_or_nothing": True}, headers=headers)
+    assert r.status_code == 200 and r.json()["created"] == 2, r.text
+    assert await quote_engine.peek(first["quote_id"]) is None
+    assert await quote_engine.peek(second["quote_id"]) is None
@@ -0,0 +1,66 @@
+import pytest
+from app.core.cache import MemoryCache
+from app.db.routing import ReadRouter, ReplicaSet, read_router
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replicas(tmp_path):
+    replica_set = ReplicaSet([f"sqlite+aiosqlite:///{tmp_path}/replica-{i}.db" for i in range(3)], max_lag=5.0)
+    yield replica_set
+    await replica_set.dispose()
+
+
+async def test_recent_writers_read_from_the_primary(replicas) -> None:
+    router = ReadRouter(replicas, MemoryCache(100), window=5)
+    assert await router.engine_for(1) in replicas.engines
+
+    await router.note_write(1)
+    assert await router.engine_for(1) is None
+    # Other users and anonymous reads still go to a replica
+    assert await router.engine_for(2) in replicas.engines
+    assert await router.engine_for(None) in replicas.engines
+
+
+async def test_primary_when_no_replica_is_healthy(replicas, monkeypatch) -> None:
+    async def down(index):
+        return None
+
+    monkeypatch.setattr(replicas, "_probe", down)
+    await replicas.check()
+    assert replicas.healthy == []
+    assert await ReadRouter(replicas, MemoryCache(100), window=5).engine_for(1) is None
+
+
+async def test_lagging_replicas_leave_the_rotation(replicas, monkeypatch) -> None:
+    lags = {0: 0.5, 1: 12.0, 2: 5.0}
+
+    async def probe(index):
+        return lags[index]
+
+    monkeypatch.setattr(replicas, "_probe", probe)
+    await replicas.check()
+    assert replicas.healthy == [0, 2]
+    assert {replicas.pick() for _ in range(4)} == {replicas.engines[0], replicas.engines[2]}
+
+    # Back within the cutoff: back in rotation
+    lags[1] = 1.0
+    await replicas.check()
+    assert replicas.healthy == [0, 1, 2]
+
+
+async def test_write_is_marked_before_the_response(client, db, replicas, monkeypatch) -> None:
+    seeded = await seed(db, 0)
+    monkeypatch.setattr(read_router, "replicas", replicas)
+    monkeypatch.setattr(read_router, "marks", MemoryCache(100))
+
+    assert await read_router.marks.get(f"wrote:{seeded['user'].id}") is None
+    r = await client.patch(
+        f"/api/v1/recipients/{seeded['recipients'][0].id}",
+        json={"city": "Madrid"},
+        headers=seeded["user_headers"],
+    )
+    assert r.status_code == 200
+    assert await read_router.marks.get(f"wrote:{seeded['user'].id}") is not None
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import pytest
+from sqlalchemy import select
+from app import models
+from app.services import screening
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+ENTRIES = [
+    {"id": "X-1", "name": "Viktor Drazhenko", "aliases": ["Victor Drazenko"], "program": "TEST"},
+    {"id": "X-2", "name": "Mohammed Al-Rashidi", "program": "TEST"},
+    {"id": "X-3", "name": "Tarek Saleh", "program": "TEST"},
+]
+
+
+def test_index_matches_spelling_and_sound_variants() -> None:
+    index = screening.WatchlistIndex(ENTRIES, "v1")
+
+    def matched(name):
+        return [(m.entry.id, m.matched) for m in index.screen(name, 0.85)]
+
+    assert matched("Drazhenko, Viktor") == [("X-1", "Viktor Drazhenko")]
+    assert matched("Vïktor Dražénko") == [("X-1", "Viktor Drazhenko")]
+    assert matched("Victor Drazenko") == [("X-1", "Victor Drazenko")]
+    # Alike in sound, not in spelling
+    assert matched("Muhamad Al Rashidy") == [("X-2", "Mohammed Al-Rashidi")]
+    # Same Soundex codes, too little spelling in common
+    assert matched("Tracy Sally") == []
+    assert matched("Maria Lopez") == []
+    assert index.screen("", 0.85) == []
+
+
+async def test_watchlist_is_rebuilt_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "watchlist.json"
+    path.write_text(json.dumps({"entries": ENTRIES[:1]}))
+    screener = screening.Screener(str(path), threshold=0.85, reload_seconds=0)
+    loop_thread = threading.get_ident()
+    built_on = []
+    from_file = screening.WatchlistIndex.from_file
+
+    def tracked(p):
+        built_on.append(threading.get_ident())
+        return from_file(p)
+
+    monkeypatch.setattr(screening.WatchlistIndex, "from_file", tracked)
+    first = await screener.current()
+    assert [e.id for e in first.entries] == ["X-1"]
+
+    path.write_text(json.dumps({"entries": ENTRIES}))
+    os.utime(path, (0, os.stat(path).st_mtime + 10))
+    # The rebuild starts in the background; the old index keeps serving
+    assert await screener.current() is first
+    await screener._reloading
+    second = await screener.current()
+    assert [e.id for e in second.entries] == ["X-1", "X-2", "X-3"]
+    assert len(built_on) == 2 and loop_thread not in built_on
+
+    # A broken file keeps the last good index
+    path.write_text("{")
+    os.utime(path, (0, os.stat(path).st_mtime + 20))
+    await screener.current()
+    await screener._reloading
+    assert await screener.current() is second
+    await screener._reloading
+
+
+async def test_hits_are_queued_and_reviewed(client, db) -> None:
+    seeded = await seed(db, 0)
+    user, admin = seeded["user_headers"], seeded["admin_headers"]
+    recipient = {"full_name": "Esperanza Vilalobos Quintero", "country": "MX"}
+    response = await client.post("/api/v1/recipients/", headers=user, json=recipient)
+    assert response.status_code == 200, response.text
+    recipient_id = response.json()["id"]
+    response = await client.post("/api/v1/transactions/", headers=user, json={
+        "recipient_id": recipient_id,
+        "amount": 100,
+        "currency_from": "USD",
+        "currency_to": "MXN",
+        "exchange_rate": 17,
+        "fee_amount": 1,
+        "total_amount": 101,
+        "payment_method": "bank_transfer",
+    })
+    assert response.status_code == 200, response.text
+    # Renaming to a clean name queues nothing further
+    response = await client.patch(f"/api/v1/recipients/{recipient_id}", headers=user, json={"full_name": "Ana Ruiz"})
+    assert response.status_code == 200, response.text
+
+    response = await client.get("/api/v1/admin/screening/hits", headers=admin)
+    assert response.status_code == 200, response.text
+    hits = [h for h in response.json()["items"] if h["entry_id"] == "WL-0003"]
+    assert [(h["subject_type"], h["name"]) for h in hits] == [
+        ("transaction", "Esperanza Vilalobos Quintero"),
+        ("recipient", "Esperanza Vilalobos Quintero"),
+    ]
+    assert hits[1]["subject_id"] == recipient_id and hits[0]["score"] >= 0.85
+
+    response = await client.patch(f"/api/v1/admin/screening/hits/{hits[1]['id']}", headers=admin, json={"status": "cleared"})
+    assert response.status_code == 200, response.text
+    assert response.json()["reviewed_by"] == seeded["admin"].id
+    response = await client.patch(f"/api/v1/admin/screening/hits/{hits[1]['id']}", headers=admin, json={"status": "confirmed"})
+    assert response.status_code == 409
+    response = await client.get("/api/v1/admin/screening/hits", headers=admin, params={"status": "cleared"})
+    assert [h["id"] for h in response.json()["items"]] == [hits[1]["id"]]
+
+    # Re-screening leaves the reviewed hit alone
+    await db.run_sync(lambda session: screening.record_sync(session, "recipient", [(recipient_id, recipient["full_name"])]))
+    await db.commit()
+    statuses = (await db.scalars(
+        select(models.ScreeningHit.status).where(models.ScreeningHit.subject_type == "recipient", models.ScreeningHit.subject_id == recipient_id)
+    )).all()
+    assert statuses == ["cleared"]
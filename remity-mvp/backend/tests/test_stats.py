@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+def _tx(recipient_id: int) -> dict:
+    return {
+        "recipient_id": recipient_id,
+        "amount": 50,
+        "currency_from": "USD",
+        "currency_to": "EUR",
+        "exchange_rate": 0.9,
+        "fee_amount": 1.5,
+        "total_amount": 51.5,
+        "payment_method": "bank_transfer",
+    }
+
+
+async def test_stats_by_day_and_by_hour(client, db) -> None:
+    seeded = await seed(db, 0)
+    for _ in range(3):
+        r = await client.post("/api/v1/transactions/", json=_tx(seeded["recipients"][0].id), headers=seeded["user_headers"])
+        assert r.status_code == 200, r.text
+
+    r = await client.get("/api/v1/admin/stats", headers=seeded["admin_headers"])
+    assert r.status_code == 200, r.text
+    daily = r.json()
+    assert daily["totals_by_status"] == [{"status": "pending", "count": 3}]
+    assert daily["hourly"] is None
+
+    r = await client.get("/api/v1/admin/stats", params={"granularity": "hour"}, headers=seeded["admin_headers"])
+    assert r.status_code == 200, r.text
+    hourly = r.json()
+    # Same totals, read from the hourly rollups
+    for key in ("totals_by_status", "corridors", "daily", "users_total", "users_active"):
+        assert hourly[key] == daily[key]
+    now = datetime.now(timezone.utc)
+    assert sum(h["count"] for h in hourly["hourly"]) == 3
+    for h in hourly["hourly"]:
+        hour = datetime.fromisoformat(h["hour"]).replace(tzinfo=timezone.utc)
+        assert now - timedelta(hours=1) <= hour <= now
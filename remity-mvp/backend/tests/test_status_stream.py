@@ -0,0 +1,110 @@
+import asyncio
+import re
+from decimal import Decimal
+import pytest
+from app import models
+from app.core.security import create_access_token
+from app.services import status_stream
+from app.services.status_stream import StatusEvent
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+def _event_ids(body: str) -> list:
+    return [int(n) for n in re.findall(r"^id: (\d+)$", body, re.MULTILINE)]
+
+
+async def _other_users_transaction(db) -> models.Transaction:
+    other = models.User(email="other@example.com", full_name="Other", hashed_password="x")
+    db.add(other)
+    await db.flush()
+    recipient = models.Recipient(user_id=other.id, full_name="Their Recipient", country="MX")
+    db.add(recipient)
+    await db.flush()
+    tx = models.Transaction(
+        user_id=other.id,
+        recipient_id=recipient.id,
+        amount=Decimal("10"),
+        currency_from="USD",
+        currency_to="MXN",
+        exchange_rate=Decimal("17"),
+        fee_amount=Decimal("1"),
+        total_amount=Decimal("11"),
+        status="pending",
+        payment_method="bank_transfer",
+    )
+    db.add(tx)
+    await db.commit()
+    return tx
+
+
+async def test_reconnect_replays_missed_events(client, db, monkeypatch) -> None:
+    seeded = await seed(db, 10)
+    theirs = await _other_users_transaction(db)
+    admin = seeded["admin_headers"]
+    for tx_id, new_status in ((seeded["tx_ids"][0], "cancelled"), (theirs.id, "in_progress"), (seeded["tx_ids"][1], "completed")):
+        response = await client.patch(f"/api/v1/transactions/{tx_id}/admin", headers=admin, json={"status": new_status})
+        assert response.status_code == 200, response.text
+    events = await status_stream.replay(db, 0, None, 10)
+    assert [e.payload["transaction_id"] for e in events] == [seeded["tx_ids"][0], theirs.id, seeded["tx_ids"][1]]
+    monkeypatch.setattr(status_stream.settings, "STATUS_STREAM_MAX_SECONDS", 0)
+
+    # Ids below the cursor may commit after it: recent ones are sent again
+    assert [e.id for e in await status_stream.replay(db, events[1].id, None, 10)] == [e.id for e in events]
+    assert await status_stream.replay(db, events[1].id, seeded["user"].id, 1) == [events[0]]
+    monkeypatch.setattr(status_stream.settings, "STATUS_STREAM_REORDER_WINDOW", 0)
+
+    # The owner only sees their own transactions, after the given event
+    response = await client.get(
+        "/api/v1/transactions/events", headers={**seeded["user_headers"], "Last-Event-ID": str(events[0].id)}
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert _event_ids(response.text) == [events[2].id]
+    assert '"new_status":"completed"' in response.text
+
+    response = await client.get(
+        "/api/v1/transactions/events", headers={**admin, "Last-Event-ID": str(events[0].id)}
+    )
+    assert _event_ids(response.text) == [events[1].id, events[2].id]
+
+    # More missed than can be replayed: the client is told to reload
+    monkeypatch.setattr(status_stream.settings, "STATUS_STREAM_REPLAY_MAX", 1)
+    response = await client.get("/api/v1/transactions/events", headers={**admin, "Last-Event-ID": "0"})
+    assert "event: reset" in response.text
+    assert _event_ids(response.text) == []
+
+
+async def test_live_events_are_pushed_to_matching_streams(client, db, monkeypatch) -> None:
+    seeded = await seed(db, 10)
+    user_id = seeded["user"].id
+    monkeypatch.setattr(status_stream.settings, "STATUS_STREAM_MAX_SECONDS", 1)
+    hub = status_stream.hub
+    before = set(hub.subscriptions)
+
+    # EventSource cannot set headers, so the token may come as a parameter
+    request = asyncio.create_task(client.get(
+        "/api/v1/transactions/events", params={"access_token": create_access_token(user_id)}
+    ))
+    for _ in range(100):
+        if hub.subscriptions - before:
+            break
+        await asyncio.sleep(0.01)
+    hub.publish(StatusEvent(1001, {"transaction_id": 1, "user_id": user_id + 1000, "new_status": "completed"}))
+    hub.publish(StatusEvent(1002, {"transaction_id": 2, "user_id": user_id, "new_status": "completed"}))
+    response = await request
+
+    assert response.status_code == 200, response.text
+    assert _event_ids(response.text) == [1002]
+    assert hub.subscriptions == before
+
+
+def test_hub_publishes_each_event_once() -> None:
+    hub = status_stream.StatusHub(10)
+    subscription = hub.subscribe(None)
+    # The same event arriving by NOTIFY and again by catch-up
+    for event_id in (7, 5, 7, 5):
+        hub.publish(StatusEvent(event_id, {"transaction_id": 1, "user_id": 1}))
+    assert [subscription.queue.get_nowait().id for _ in range(subscription.queue.qsize())] == [7, 5]
+    assert hub.last_id == 7
@@ -0,0 +1,40 @@
+import pytest
+from app import crud, models
+from app.core.cache import principal_cache
+from tests.conftest import seed
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_update_invalidates_cached_principal_after_commit(db, monkeypatch) -> None:
+    seeded = await seed(db, 0)
+    user = seeded["user"]
+    user_id = user.id
+    await principal_cache.put(user_id, {"id": user_id, "full_name": "User"})
+
+    def blocking(user_id):
+        raise AssertionError("blocking invalidation on the event loop")
+
+    # Rolled back: the cached principal is still current
+    monkeypatch.setattr(principal_cache, "invalidate_sync", blocking)
+    await crud.async_user.update(db, db_obj=user, obj_in={"full_name": "Discarded"}, commit=False)
+    await db.rollback()
+    await db.commit()
+    assert await principal_cache.get(user_id) is not None
+
+    user = await db.get(models.User, user_id)
+
+    await crud.async_user.update(db, db_obj=user, obj_in={"full_name": "Renamed"}, commit=False)
+    # Not committed yet: other requests still read the old row
+    assert await principal_cache.get(user.id) is not None
+    await db.commit()
+    assert await principal_cache.get(user.id) is None
+    monkeypatch.undo()
+
+    # The sync CRUD (jobs) invalidates too
+    def rename(session):
+        crud.user.update(session, db_obj=session.get(models.User, user.id), obj_in={"full_name": "Again"})
+
+    await principal_cache.put(user.id, {"id": user.id, "full_name": "Renamed"})
+    await db.run_sync(rename)
+    assert await principal_cache.get(user.id) is None
@@ -13,6 +13,7 @@ interface Transaction {
   fee_amount: number;
   total_amount: number;
   status: string;
+  version: number;
   created_at: string;
   user: {
     full_name: string;
@@ -36,6 +37,9 @@ const AdminDashboard: React.FC = () => {
   const { user, logout } = useAuth();
   const [transactions, setTransactions] = useState<Transaction[]>([]);
   const [users, setUsers] = useState<User[]>([]);
+  const [transactionsCursor, setTransactionsCursor] = useState<string | null>(null);
+  const [usersCursor, setUsersCursor] = useState<string | null>(null);
+  const [stats, setStats] = useState<api.AdminStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState('overview');
   const [selectedTransaction, setSelectedTransaction] = useState<Transaction | null>(null);
@@ -43,16 +47,26 @@ const AdminDashboard: React.FC = () => {
 
   useEffect(() => {
     fetchData();
+    return api.subscribeTransactionEvents(
+      (event) => setTransactions((txs) => txs.map((tx) =>
+        tx.id === event.transaction_id ? { ...tx, status: event.new_status, version: event.version } : tx
+      )),
+      () => fetchData(),
+    );
   }, []);
 
   const fetchData = async () => {
     try {
-      const [transactionsRes, usersRes] = await Promise.all([
+      const [transactionsRes, usersRes, statsRes] = await Promise.all([
         api.adminListTransactions(),
-        api.getUsers()
+        api.getUsers(),
+        api.getAdminStats()
       ]);
       setTransactions(transactionsRes.data);
+      setTransactionsCursor(transactionsRes.nextCursor);
       setUsers(usersRes.data);
+      setUsersCursor(usersRes.nextCursor);
+      setStats(statsRes.data);
     } catch (error) {
       console.error('Error fetching data:', error);
     } finally {
@@ -60,9 +74,36 @@ const AdminDashboard: React.FC = () => {
     }
   };
 
-  const handleTransactionAction = async (transactionId: number, action: 'approve' | 'reject') => {
+  const loadMoreTransactions = async () => {
+    if (!transactionsCursor) return;
+    try {
+      const res = await api.adminListTransactions(transactionsCursor);
+      setTransactions((txs) => [...txs, ...res.data]);
+      setTransactionsCursor(res.nextCursor);
+    } catch (error) {
+      console.error('Error fetching transactions:', error);
+    }
+  };
+
+  const loadMoreUsers = async () => {
+    if (!usersCursor) return;
+    try {
+      const res = await api.getUsers(usersCursor);
+      setUsers((us) => [...us, ...res.data]);
+      setUsersCursor(res.nextCursor);
+    } catch (error) {
+      console.error('Error fetching users:', error);
+    }
+  };
+
+  const handleTransactionAction = async (transaction: Transaction, action: 'approve' | 'reject') => {
+    // pending -> in_progress -> completed; the version guards against concurrent edits
+    const nextStatus = transaction.status === 'pending' ? 'in_progress' : 'completed';
     try {
-      await api.adminUpdateTransaction(transactionId, { status: action === 'approve' ? 'completed' : 'failed' });
+      await api.adminUpdateTransaction(transaction.id, {
+        status: action === 'approve' ? nextStatus : 'failed',
+        version: transaction.version,
+      });
       fetchData();
       setShowTransactionModal(false);
     } catch (error) {
@@ -100,9 +141,13 @@ const AdminDashboard: React.FC = () => {
     });
   };
 
-  const pendingTransactions = transactions.filter(t => t.status === 'pending');
-  const completedTransactions = transactions.filter(t => t.status === 'completed');
-  const totalVolume = transactions.reduce((sum, t) => sum + t.total_amount, 0);
+  // Over the stats window (the last 30 days), not just the rows loaded so far
+  const countByStatus = (status: string) =>
+    stats?.totals_by_status.find(t => t.status === status)?.count ?? 0;
+  const totalCount = stats?.totals_by_status.reduce((sum, t) => sum + t.count, 0) ?? 0;
+  const totalVolume = stats?.corridors
+    .filter(c => c.currency_from === 'USD')
+    .reduce((sum, c) => sum + c.amount + c.fees, 0) ?? 0;
 
   if (loading) {
     return (
@@ -160,23 +205,23 @@ const AdminDashboard: React.FC = () => {
                 <div className="stat-card">
                   <h3>Total Volume</h3>
                   <p className="stat-value">{formatCurrency(totalVolume, 'USD')}</p>
-                  <p className="stat-change positive">+15.3% this month</p>
+                  <p className="stat-change">Sent from USD, last 30 days</p>
                 </div>
                 <div className="stat-card">
                   <h3>Pending Approvals</h3>
-                  <p className="stat-value">{pendingTransactions.length}</p>
+                  <p className="stat-value">{countByStatus('pending')}</p>
                   <p className="stat-change">Requires attention</p>
                 </div>
                 <div className="stat-card">
                   <h3>Active Users</h3>
-                  <p className="stat-value">{users.filter(u => u.is_active).length}</p>
-                  <p className="stat-change">Total: {users.length}</p>
+                  <p className="stat-value">{stats?.users_active ?? 0}</p>
+                  <p className="stat-change">Total: {stats?.users_total ?? 0}</p>
                 </div>
                 <div className="stat-card">
                   <h3>Success Rate</h3>
                   <p className="stat-value">
-                    {transactions.length > 0
-                      ? Math.round((completedTransactions.length / transactions.length) * 100)
+                    {totalCount > 0
+                      ? Math.round((countByStatus('completed') / totalCount) * 100)
                       : 0}%
                   </p>
                   <p className="stat-change positive">High performance</p>
@@ -277,7 +322,7 @@ const AdminDashboard: React.FC = () => {
                         </td>
                         <td>{formatDate(transaction.created_at)}</td>
                         <td>
-                          {transaction.status === 'pending' && (
+                          {(transaction.status === 'pending' || transaction.status === 'in_progress') && (
                             <div className="action-buttons-small">
                               <button
                                 className="approve-btn"
@@ -290,7 +335,7 @@ const AdminDashboard: React.FC = () => {
                               </button>
                             </div>
                           )}
-                          {transaction.status !== 'pending' && (
+                          {transaction.status !== 'pending' && transaction.status !== 'in_progress' && (
                             <button className="view-btn">View</button>
                           )}
                         </td>
@@ -298,6 +343,9 @@ const AdminDashboard: React.FC = () => {
                     ))}
                   </tbody>
                 </table>
+                {transactionsCursor && (
+                  <button className="load-more-btn" onClick={loadMoreTransactions}>Load more</button>
+                )}
               </div>
             </div>
           )}
@@ -343,6 +391,9 @@ const AdminDashboard: React.FC = () => {
                     ))}
                   </tbody>
                 </table>
+                {usersCursor && (
+                  <button className="load-more-btn" onClick={loadMoreUsers}>Load more</button>
+                )}
               </div>
             </div>
           )}
@@ -415,6 +466,7 @@ const AdminDashboard: React.FC = () => {
                   <option value="in_progress">in_progress</option>
                   <option value="completed">completed</option>
                   <option value="failed">failed</option>
+                  <option value="cancelled">cancelled</option>
                 </select>
               </div>
               <div className="form-row">
@@ -427,9 +479,9 @@ const AdminDashboard: React.FC = () => {
               </div>
             </div>
             <div className="modal-actions">
-              <button className="reject-btn" onClick={() => handleTransactionAction(selectedTransaction.id, 'reject')}>Reject</button>
-              <button className="approve-btn" onClick={() => handleTransactionAction(selectedTransaction.id, 'approve')}>Approve</button>
-              <button className="save-btn" onClick={async () => { await api.adminUpdateTransaction(selectedTransaction.id, { status: editStatus, compliance_notes: editNotes, proof_of_payment_url: editProof }); setShowTransactionModal(false); fetchData(); }}>Save</button>
+              <button className="reject-btn" onClick={() => handleTransactionAction(selectedTransaction, 'reject')}>Reject</button>
+              <button className="approve-btn" onClick={() => handleTransactionAction(selectedTransaction, 'approve')}>Approve</button>
+              <button className="save-btn" onClick={async () => { await api.adminUpdateTransaction(selectedTransaction.id, { status: editStatus, compliance_notes: editNotes, proof_of_payment_url: editProof, version: selectedTransaction.version }); setShowTransactionModal(false); fetchData(); }}>Save</button>
             </div>
           </div>
         </div>
@@ -29,6 +29,7 @@ interface User {
 const UserDashboard: React.FC = () => {
   const { user, logout } = useAuth();
   const [transactions, setTransactions] = useState<Transaction[]>([]);
+  const [balances, setBalances] = useState<api.Balance[]>([]);
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState('overview');
   const [showNewTransfer, setShowNewTransfer] = useState(false);
@@ -45,8 +46,30 @@ const UserDashboard: React.FC = () => {
 
   useEffect(() => {
     fetchTransactions();
+    fetchBalances();
+    // Status changes are pushed; no need to poll the list
+    return api.subscribeTransactionEvents(
+      (event) => {
+        setTransactions((txs) => txs.map((tx) =>
+          tx.id === event.transaction_id ? { ...tx, status: event.new_status } : tx
+        ));
+        fetchBalances();
+      },
+      () => fetchTransactions(),
+    );
   }, []);
 
+  const fetchBalances = async () => {
+    try {
+      const response = await api.getBalances();
+      setBalances(response.data);
+    } catch (error) {
+      console.error('Error fetching balances:', error);
+    }
+  };
+
+  const balancesIn = (account: string) => balances.filter((b) => b.account === account && b.balance);
+
   const fetchTransactions = async () => {
     try {
       const response = await api.getTransactions();
@@ -99,6 +122,7 @@ const UserDashboard: React.FC = () => {
         recipient_account: ''
       });
       fetchTransactions();
+      fetchBalances();
     } catch (error) {
       console.error('Error creating transaction:', error);
       alert('Failed to create transfer. Please try again.');
@@ -187,8 +211,12 @@ const UserDashboard: React.FC = () => {
               <div className="stats-grid">
                 <div className="stat-card">
                   <h3>Total Sent</h3>
-                  <p className="stat-value">$2,450.00</p>
-                  <p className="stat-change positive">+12.5% this month</p>
+                  <p className="stat-value">
+                    {balancesIn('sent').map((b) => formatCurrency(b.balance, b.currency)).join(' + ') || '-'}
+                  </p>
+                  <p className="stat-change">
+                    {balancesIn('pending').map((b) => formatCurrency(b.balance, b.currency)).join(' + ') || 'Nothing'} in flight
+                  </p>
                 </div>
                 <div className="stat-card">
                   <h3>Active Transfers</h3>
@@ -18,6 +18,9 @@ const apiClient = axios.create({
     },
 });
 
+// List endpoints return a cursor page ({ items, next_cursor }); unwrap the items
+const unwrapPage = (res: any) => ({ ...res, data: res.data.items, nextCursor: res.data.next_cursor });
+
 // Attach Authorization header from localStorage if present
 apiClient.interceptors.request.use((config) => {
     const token = localStorage.getItem('token');
@@ -46,20 +49,66 @@ export const register = (fullName: string, email: string, password: string) => {
     });
 };
 
-export const getTransactions = () => {
-    return apiClient.get('/transactions/');
+export const getTransactions = (cursor?: string) => {
+    return apiClient
+        .get('/transactions/', { params: { cursor, fields: 'recipient.full_name,recipient.email' } })
+        .then(unwrapPage);
 };
 
 export const createTransaction = (payload: any) => {
     return apiClient.post('/transactions/', payload);
 };
 
+export const createTransactionsBulk = (items: any[], allOrNothing = false) =>
+    apiClient.post('/transactions/bulk', { items }, { params: { all_or_nothing: allOrNothing } });
+
 export const getCurrentUser = () => {
     return apiClient.get('/users/me');
 };
 
-export const getUsers = () => {
-    return apiClient.get('/users/');
+export interface Balance {
+    account: string; // "pending" (transfers in flight) or "sent"
+    currency: string;
+    balance: number;
+}
+
+export const getBalances = () => apiClient.get<Balance[]>('/users/me/balances');
+
+export const getUsers = (cursor?: string) => {
+    return apiClient.get('/users/', { params: { cursor } }).then(unwrapPage);
+};
+
+export interface TransactionStatusEvent {
+    transaction_id: number;
+    user_id: number;
+    old_status: string;
+    new_status: string;
+    version: number;
+}
+
+// Status changes pushed over Server-Sent Events (own transactions, or all for
+// admins). EventSource reconnects with Last-Event-ID by itself; onReset means
+// too much was missed while disconnected and the list should be reloaded.
+// Reconnects re-send recent events, so ids already seen are skipped.
+export const subscribeTransactionEvents = (
+    onEvent: (event: TransactionStatusEvent) => void,
+    onReset: () => void,
+) => {
+    const token = localStorage.getItem('token') || '';
+    const source = new EventSource(
+        `${apiBaseURL}/transactions/events?access_token=${encodeURIComponent(token)}`,
+    );
+    const seen = new Set<string>();
+    source.addEventListener('status', (e) => {
+        const message = e as MessageEvent;
+        if (seen.has(message.lastEventId)) return;
+        seen.add(message.lastEventId);
+        // Sets iterate in insertion order: forget the oldest
+        if (seen.size > 2000) seen.delete(seen.values().next().value as string);
+        onEvent(JSON.parse(message.data));
+    });
+    source.addEventListener('reset', () => onReset());
+    return () => source.close();
 };
 
 export const updateTransaction = (transactionId: number, data: any) => {
@@ -67,9 +116,30 @@ export const updateTransaction = (transactionId: number, data: any) => {
 };
 
 // Recipients
-export const listRecipients = () => apiClient.get('/recipients/');
+export const listRecipients = (cursor?: string) => apiClient.get('/recipients/', { params: { cursor } }).then(unwrapPage);
 export const createRecipient = (recipient: any) => apiClient.post('/recipients/', recipient);
+export const createRecipientsBulk = (items: any[], allOrNothing = false) =>
+    apiClient.post('/recipients/bulk', { items }, { params: { all_or_nothing: allOrNothing } });
 
 // Admin endpoints
-export const adminListTransactions = () => apiClient.get('/transactions/admin');
+export const adminListTransactions = (cursor?: string) =>
+    apiClient
+        .get('/transactions/admin', {
+            params: { cursor, fields: 'user.full_name,user.email,recipient.full_name,recipient.email' },
+        })
+        .then(unwrapPage);
+
+export interface AdminStats {
+    start: string;
+    end: string;
+    totals_by_status: { status: string; count: number }[];
+    corridors: { currency_from: string; currency_to: string; count: number; amount: number; fees: number }[];
+    daily: { day: string; count: number }[];
+    hourly: { hour: string; count: number }[] | null; // granularity=hour only
+    users_total: number;
+    users_active: number;
+}
+
+// Totals come from the server's rollups: the list endpoints are paged
+export const getAdminStats = () => apiClient.get<AdminStats>('/admin/stats');
 export const adminUpdateTransaction = (id: number, data: any) => apiClient.patch(`/transactions/${id}/admin`, data);